@@ -0,0 +1,60 @@
+'''
+Compares solving a batch of beam variants one at a time with solve_beam
+against the batched solve_beams entry point.
+
+Run from the repository root:
+    python -m benchmarks.beam_batch_benchmark
+'''
+import time
+import numpy as np
+from calculators.beam_calculator import solve_beam, solve_beams
+
+
+def random_beam_configs(num_beams, seed=0):
+    rng = np.random.default_rng(seed)
+    configs = []
+    for i in range(num_beams):
+        length = rng.uniform(0.5, 5.0)
+        support_type = i % 3
+        if support_type == 0:
+            fixtures = [['Pinned/Roller', 0.0], ['Pinned/Roller', length]]
+        elif support_type == 1:
+            fixtures = [['Fixed', 0.0]]
+        else:
+            fixtures = [['Fixed', 0.0], ['Pinned/Roller', rng.uniform(0.5, 1.0) * length]]
+        loads_moments = [
+            ['Concentrated Force', rng.uniform(0, length), None, rng.uniform(-2000, 0)],
+            ['Constant Distributed Load', 0.0, length, rng.uniform(-500, 0)],
+        ]
+        configs.append({
+            'loads_moments': loads_moments,
+            'fixtures': fixtures,
+            'overall_length': length,
+            'moment_of_inertia': rng.uniform(1e-7, 1e-5),
+            'youngs_modulus': 200e9,
+        })
+    return configs
+
+
+def main(num_beams=10000, num_points=250):
+    configs = random_beam_configs(num_beams)
+
+    start = time.perf_counter()
+    # dict() reads every key, solve_beam samples the diagrams on first access
+    looped = [dict(solve_beam(config['loads_moments'], config['fixtures'], config['overall_length'],
+                              config['moment_of_inertia'], config['youngs_modulus'], num_points, 'm', 'N')) for config in configs]
+    looped_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = solve_beams(configs, num_points)
+    batched_time = time.perf_counter() - start
+
+    max_difference = max(np.max(np.abs(a['y_deflection_plot'] - b['y_deflection_plot'])) for a, b in zip(looped, batched))
+    print(f"{num_beams} beams, {num_points} intervals each")
+    print(f"solve_beam loop: {looped_time:.2f} s ({num_beams / looped_time:.0f} beams/s)")
+    print(f"solve_beams:     {batched_time:.2f} s ({num_beams / batched_time:.0f} beams/s)")
+    print(f"speedup: {looped_time / batched_time:.1f}x, max deflection difference: {max_difference:.2e} m")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+'''
+Times generate_beam_plot on a beam with many loads and supports and reports the number of
+traces and the size of the figure JSON sent to the browser, compares that with patching the
+cached figure skeleton through beam_plot_update, then shows the JSON size with and without
+downsample_results as the number of sample points grows.
+
+Run from the repository root:
+    python -m benchmarks.beam_plot_benchmark
+'''
+import json
+import time
+import numpy as np
+from calculators.beam_calculator import solve_beam, generate_beam_plot, beam_plot_figure, beam_plot_update
+from calculators.plot_downsampling import downsample_results
+from calculators.result_units import ResultView
+
+OVERALL_LENGTH = 10.0
+
+
+def stress_beam(num_loads=20, num_supports=10, seed=0):
+    '''Loads and fixtures of a continuous beam with many point loads, moments and distributed loads.'''
+    rng = np.random.default_rng(seed)
+    fixtures = [["Fixed", 0.0]] + [["Pinned/Roller", float(x)] for x in np.linspace(OVERALL_LENGTH / num_supports, OVERALL_LENGTH, num_supports - 1)]
+    loads_moments = []
+    for i in range(num_loads):
+        position = float(rng.uniform(0, OVERALL_LENGTH))
+        if i % 4 == 0:
+            loads_moments.append(["Concentrated Moment", position, None, float(rng.normal() * 500)])
+        elif i % 4 == 1:
+            start, end = np.sort(rng.uniform(0, OVERALL_LENGTH, 2))
+            loads_moments.append(["Constant Distributed Load", float(start), float(end), -float(rng.uniform(100, 1000))])
+        else:
+            loads_moments.append(["Concentrated Force", position, None, float(rng.normal() * 1000)])
+    return loads_moments, fixtures
+
+
+def main(repeats=10):
+    loads_moments, fixtures = stress_beam()
+    results = solve_beam(loads_moments, fixtures, OVERALL_LENGTH, 8e-6, 2e11, 250, 'm', 'N', adaptive_tolerance=1e-3)
+    results['y_deflection_plot']  # sample the diagrams before timing the figure
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fig = generate_beam_plot(results)
+        best = min(best, time.perf_counter() - start)
+    start = time.perf_counter()
+    figure_json = fig.to_json()
+    to_json = time.perf_counter() - start
+    print(f"{len(loads_moments)} loads, {len(fixtures)} supports, {len(results['beam_x_values'])} points")
+    print(f"  traces:       {len(fig.data)}")
+    print(f"  build time:   {best * 1e3:.1f} ms")
+    print(f"  to_json time: {to_json * 1e3:.1f} ms")
+    print(f"  JSON size:    {len(figure_json) / 1024:.1f} kB")
+    start = time.perf_counter()
+    figure = beam_plot_figure(results)
+    print(f"  figure dict from the cached skeleton: {(time.perf_counter() - start) * 1e3:.1f} ms, {len(json.dumps(figure)) / 1024:.1f} kB")
+    start = time.perf_counter()
+    view = ResultView(results, 'mm', 'kN')
+    data, layout = beam_plot_update(view, view.length_unit, view.force_unit)
+    print(f"  unit change patch (ResultView + beam_plot_update): {(time.perf_counter() - start) * 1e3:.1f} ms, {len(json.dumps([data, layout])) / 1024:.1f} kB")
+    print()
+    downsampled_sizes(loads_moments, fixtures)
+
+
+def downsampled_sizes(loads_moments, fixtures, point_counts=(250, 2500, 25000, 250000)):
+    '''Figure JSON size of the full diagrams against the downsampled ones, which keep every peak.'''
+    print(f"{'points':>7} | {'full JSON':>10} | {'downsampled':>11} | {'zoomed 10%':>10} | {'downsample':>10} | peaks kept")
+    for num_points in point_counts:
+        results = solve_beam(loads_moments, fixtures, OVERALL_LENGTH, 8e-6, 2e11, num_points, 'm', 'N')
+        full = len(generate_beam_plot(results).to_json())
+        start = time.perf_counter()
+        downsampled = downsample_results(results)
+        elapsed = time.perf_counter() - start
+        zoomed = downsample_results(results, x_range=(4.0, 5.0))
+        peaks_kept = all(np.max(results[key]) == np.max(downsampled[key]) and np.min(results[key]) == np.min(downsampled[key])
+                         for key in ['y_shear_plot', 'y_moment_plot', 'y_angle_plot', 'y_deflection_plot'])
+        print(f"{num_points:>7} | {full / 1024:>7.0f} kB | {len(generate_beam_plot(downsampled).to_json()) / 1024:>8.0f} kB | "
+              f"{len(generate_beam_plot(zoomed).to_json()) / 1024:>7.0f} kB | {elapsed * 1e3:>7.1f} ms | {peaks_kept}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''
+Compares the dense and banded solvers on continuous beams with many supports.
+
+Run from the repository root:
+    python -m benchmarks.continuous_beam_benchmark
+'''
+import time
+import numpy as np
+from calculators.beam_calculator import BeamModel, evaluate_pieces, evaluate_term_arrays, solve_beam
+
+
+def continuous_beam_config(num_supports, span=6.0):
+    '''Equal spans on pinned supports with a full length distributed load and a point load in every span.'''
+    overall_length = span * (num_supports - 1)
+    fixtures = [["Pinned/Roller", i * span] for i in range(num_supports)]
+    loads_moments = [["Constant Distributed Load", 0.0, overall_length, -2000.0]]
+    loads_moments += [["Concentrated Force", i * span + 2.0, i * span + 2.0, -5000.0] for i in range(num_supports - 1)]
+    return loads_moments, fixtures, overall_length, 8e-5, 2e11
+
+
+def fastest(function, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(support_counts=(10, 100, 1000), num_points=2000):
+    print(f"{'supports':>8} | {'dense solve':>11} {'banded solve':>12} | {'dense solve_beam':>16} {'banded solve_beam':>17} | support |u| / max |u| (dense, banded)")
+    for num_supports in support_counts:
+        loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus = continuous_beam_config(num_supports)
+        repeats = 1 if num_supports >= 1000 else 5
+
+        def build():
+            return BeamModel(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus)
+        dense_solve = fastest(lambda: build().solve(), repeats)
+        banded_solve = fastest(lambda: build().solve_banded(), repeats)
+        results = {}
+        times = {}
+        for solver in ('dense', 'banded'):
+            start = time.perf_counter()
+            results[solver] = dict(solve_beam(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus, num_points, 'm', 'N', solver=solver))  # dict() reads every key
+            times[solver] = time.perf_counter() - start
+
+        # every support should have zero deflection, what is left is numerical error
+        support_locations = [fixture[1] for fixture in fixtures]
+        dense_model = build()
+        dense_deflection = evaluate_term_arrays(*dense_model.solved_arrays(dense_model.solve()), support_locations)[4]
+        banded_model = build()
+        banded_deflection = evaluate_pieces(*banded_model.solved_pieces(banded_model.solve_banded()), support_locations)[4]
+        drift = {'dense': np.max(np.abs(dense_deflection)) / abs(results['dense']['max_deflection']),
+                 'banded': np.max(np.abs(banded_deflection)) / abs(results['banded']['max_deflection'])}
+        print(f"{num_supports:>8} | {dense_solve * 1e3:>8.2f} ms {banded_solve * 1e3:>9.2f} ms | {times['dense'] * 1e3:>13.1f} ms {times['banded'] * 1e3:>14.1f} ms | "
+              f"{drift['dense']:.1e}, {drift['banded']:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+'''
+Times solve_frame on rectangular grid frames (fixed along the bottom, pushed sideways along
+the top) of growing size and checks a one-bay portal frame against slope deflection.
+
+Run from the repository root:
+    python -m benchmarks.frame_solver_benchmark
+'''
+import time
+import numpy as np
+from calculators.frame_solver import solve_frame
+
+YOUNGS_MODULUS = 2e11
+AREA = 5e-3
+MOMENT_OF_INERTIA = 8e-6
+
+
+def grid_frame(bays, stories, bay_width=1.0, story_height=1.0):
+    '''Nodes, members, supports and loads of a grid frame.'''
+    x, y = np.meshgrid(np.arange(bays + 1) * bay_width, np.arange(stories + 1) * story_height)
+    nodes = np.column_stack([x.ravel(), y.ravel()]).tolist()
+    index = np.arange(x.size).reshape(x.shape)
+    pairs = list(zip(index[:, :-1].ravel(), index[:, 1:].ravel())) + list(zip(index[:-1].ravel(), index[1:].ravel()))
+    members = [['Frame', int(a), int(b), YOUNGS_MODULUS, AREA, MOMENT_OF_INERTIA] for a, b in pairs]
+    supports = [['Fixed', int(node)] for node in index[0]]
+    loads = [['Nodal Load', int(node), 1000.0, -500.0, 0.0] for node in index[-1]]
+    return nodes, members, supports, loads
+
+
+def portal_check(height=3.0, width=4.0, load=10e3):
+    '''Relative error of the sway of a fixed base portal frame (with stiff axial members).'''
+    nodes = [[0, 0], [0, height], [width, height], [width, 0]]
+    members = [['Frame', a, b, YOUNGS_MODULUS, 10.0, MOMENT_OF_INERTIA] for a, b in [(0, 1), (1, 2), (2, 3)]]
+    results = solve_frame(nodes, members, [['Fixed', 0], ['Fixed', 3]], [['Nodal Load', 1, load, 0, 0]])
+    k = height / width  # beam to column stiffness ratio with equal I
+    exact = load * height**3 / (2 * YOUNGS_MODULUS * MOMENT_OF_INERTIA * (12 - 36 / (4 + 6 * k)))
+    return abs(results['displacements'][1, 0] / exact - 1)
+
+
+def main(grid_sizes=(10, 20, 40, 60, 80)):
+    print(f"portal frame sway relative error: {portal_check():.1e}")
+    print(f"{'members':>8} | {'DOFs':>6} | {'band':>5} | {'time':>9}")
+    for size in grid_sizes:
+        nodes, members, supports, loads = grid_frame(size, size)
+        start = time.perf_counter()
+        results = solve_frame(nodes, members, supports, loads)
+        elapsed = time.perf_counter() - start
+        print(f"{len(members):>8} | {3 * len(nodes):>6} | {results['bandwidth']:>5} | {elapsed * 1e3:>6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
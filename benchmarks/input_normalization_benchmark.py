@@ -0,0 +1,78 @@
+'''
+Times normalize_beam_inputs against converting every field with its own pint Quantity
+(the way the beam page used to) and checks that both give the same loads.
+
+Run from the repository root:
+    python -m benchmarks.input_normalization_benchmark
+'''
+import time
+import numpy as np
+from calculators.unit_conversion import Q
+from calculators.beam_inputs import normalize_beam_inputs, distributed_load_terms
+
+FIXTURE_ROWS = [['Pinned/Roller', 0.0, 'in'], ['Pinned/Roller', 10.0, 'ft']]
+
+
+def load_rows(num_loads, seed=0):
+    rng = np.random.default_rng(seed)
+    position_units = ['mm', 'in', 'ft', 'm']
+    point_rows = [['Concentrated Force' if i % 3 else 'Concentrated Moment', float(rng.uniform(0, 100)), 'in', float(rng.normal() * 100),
+                   'lbf' if i % 3 else 'lbf * in', 'D'] for i in range(num_loads)]
+    distributed_rows = []
+    for i in range(num_loads):
+        start, end = np.sort(rng.uniform(0, 3, 2))
+        distributed_rows.append([float(start), float(end), position_units[i % 2 + 2], -float(rng.uniform(1, 5)), -float(rng.uniform(1, 5)), 'lbf/in', 'L'])
+    return point_rows, distributed_rows
+
+
+def pint_inputs(point_rows, distributed_rows):
+    '''One Quantity per field, converted and compared as Quantities.'''
+    beam_length = Q(10.0, 'ft').to('m')
+    fixtures = []
+    for fixture_type, position, unit in FIXTURE_ROWS:
+        position = Q(position, unit).to('m')
+        if position > beam_length:
+            raise ValueError('Fixture position not on beam.')
+        fixtures.append([fixture_type, position.magnitude])
+    loads_moments = []
+    for start, end, position_unit, start_value, end_value, load_unit, _ in distributed_rows:
+        start, end = Q(start, position_unit).to('m'), Q(end, position_unit).to('m')
+        start_value, end_value = Q(start_value, load_unit).to('N/m'), Q(end_value, load_unit).to('N/m')
+        if start > beam_length or end > beam_length or start > end:
+            raise ValueError('Distributed load not on beam.')
+        loads_moments += distributed_load_terms(start.magnitude, end.magnitude, start_value.magnitude, end_value.magnitude)
+    for load_type, position, position_unit, value, value_unit, _ in point_rows:
+        position = Q(position, position_unit).to('m')
+        if position > beam_length:
+            raise ValueError('Point load position not on beam.')
+        loads_moments.append([load_type, position.magnitude, None, Q(value, value_unit).to('N' if load_type == 'Concentrated Force' else 'N*m').magnitude])
+    return fixtures, loads_moments
+
+
+def best_time(function, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(load_counts=(1, 10, 100, 1000)):
+    print(f"{'loads':>6} | {'pint':>10} | {'cached scales':>13} | largest difference")
+    for num_loads in load_counts:
+        point_rows, distributed_rows = load_rows(num_loads)
+
+        def fast():
+            return normalize_beam_inputs(10.0, 'ft', 20.0, 'in⁴', 29000, 'ksi', FIXTURE_ROWS, point_rows, distributed_rows)
+
+        beam = fast()
+        _, loads_moments = pint_inputs(point_rows, distributed_rows)
+        difference = max(abs(a[k] - b[k]) / max(abs(b[k]), 1e-300) for a, b in zip(beam['loads_moments'], loads_moments) for k in (1, 3))
+        pint_time = best_time(lambda: pint_inputs(point_rows, distributed_rows))
+        fast_time = best_time(fast)
+        print(f"{2 * num_loads:>6} | {pint_time * 1e3:>7.2f} ms | {fast_time * 1e3:>10.3f} ms | {difference:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+'''
+Times solving a beam again for every material against rescaling one solution
+(BeamResults.with_rigidity and compare_materials).
+
+Run from the repository root:
+    python -m benchmarks.material_swap_benchmark
+'''
+import time
+from calculators.beam_calculator import solve_beam, compare_materials, materials
+
+LOADS_MOMENTS = [["Constant Distributed Load", 0.0, 10.0, -2000.0], ["Concentrated Force", 3.0, None, -5000.0]]
+FIXTURES = [["Fixed", 0.0], ["Pinned/Roller", 6.0], ["Pinned/Roller", 10.0]]
+MOMENT_OF_INERTIA = 8e-6
+SECTION_Y = 0.05
+
+
+def best_time(function, repeats=20):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(num_points=250):
+    moduli = [material.modulus.to('Pa').magnitude for material in materials.values()]
+    base = solve_beam(LOADS_MOMENTS, FIXTURES, 10.0, MOMENT_OF_INERTIA, moduli[0], num_points, 'm', 'N', adaptive_tolerance=1e-3)
+    dict(base)  # compute every key once, like the beam page does
+
+    def solve_each():
+        for modulus in moduli:
+            dict(solve_beam(LOADS_MOMENTS, FIXTURES, 10.0, MOMENT_OF_INERTIA, modulus, num_points, 'm', 'N', adaptive_tolerance=1e-3))
+
+    def rescale_each():
+        for modulus in moduli:
+            dict(base.with_rigidity(modulus, MOMENT_OF_INERTIA))
+
+    print(f"{len(moduli)} materials, full results")
+    print(f"  solve each:          {best_time(solve_each) * 1e3:8.2f} ms")
+    print(f"  rescale one solve:   {best_time(rescale_each) * 1e3:8.2f} ms")
+    print(f"  compare_materials:   {best_time(lambda: compare_materials(base, section_y=SECTION_Y)) * 1e3:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+'''
+Times modal_analysis on finer and finer meshes and checks the first frequencies of a
+simply supported beam against f_n = (n pi / L)^2 sqrt(E I / m) / (2 pi).
+
+Run from the repository root:
+    python -m benchmarks.modal_analysis_benchmark
+'''
+import time
+import numpy as np
+from calculators.modal_analysis import modal_analysis
+
+OVERALL_LENGTH = 5.0
+MOMENT_OF_INERTIA = 8e-6
+YOUNGS_MODULUS = 2e11
+MASS_PER_LENGTH = 20.0
+FIXTURES = [["Pinned/Roller", 0.0], ["Pinned/Roller", OVERALL_LENGTH]]
+
+
+def main(element_counts=(100, 1000, 10000, 100000), num_modes=5):
+    modes = np.arange(1, num_modes + 1)
+    exact = (modes * np.pi / OVERALL_LENGTH)**2 * np.sqrt(YOUNGS_MODULUS * MOMENT_OF_INERTIA / MASS_PER_LENGTH) / (2 * np.pi)
+    print(f"exact: {', '.join(f'{f:.4f}' for f in exact)} Hz")
+    print(f"{'elements':>8} | {'time':>9} | largest relative error")
+    for num_elements in element_counts:
+        start = time.perf_counter()
+        results = modal_analysis(FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, MASS_PER_LENGTH, num_modes, num_elements)
+        elapsed = time.perf_counter() - start
+        error = np.max(np.abs(results['frequencies'] / exact - 1))
+        print(f"{num_elements:>8} | {elapsed * 1e3:>6.1f} ms | {error:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+'''
+Times the finite element solver for non-prismatic beams and checks it against the
+exact singularity function solution on a prismatic beam.
+
+Run from the repository root:
+    python -m benchmarks.nonprismatic_beam_benchmark
+'''
+import time
+from calculators.beam_calculator import solve_beam
+from calculators.nonprismatic_beam import solve_nonprismatic_beam
+
+LOADS_MOMENTS = [["Constant Distributed Load", 0.0, 10.0, -2000.0], ["Concentrated Force", 3.0, 3.0, -5000.0]]
+FIXTURES = [["Fixed", 0.0], ["Pinned/Roller", 6.0], ["Pinned/Roller", 10.0]]
+MOMENT_OF_INERTIA = 8e-6
+YOUNGS_MODULUS = 2e11
+# tapered haunch at the fixed end, a doubler plate over the middle support and a stepped end
+SECTIONS = [[0.0, 3.0, 2.4e-5, 8e-6, 2e11], [5.5, 6.5, 1.6e-5, 1.6e-5, 2e11], [8.0, 10.0, 5e-6, 5e-6, 2e11]]
+
+
+def main(element_counts=(1000, 10000, 100000), num_points=2000):
+    exact = solve_beam(LOADS_MOMENTS, FIXTURES, 10.0, MOMENT_OF_INERTIA, YOUNGS_MODULUS, num_points, 'm', 'N')
+    prismatic = solve_nonprismatic_beam(LOADS_MOMENTS, FIXTURES, 10.0, MOMENT_OF_INERTIA, YOUNGS_MODULUS, [], num_points, 'm', 'N', num_elements=10)
+    print(f"prismatic max deflection: exact {exact['max_deflection']:.9e} m, 10 elements {prismatic['max_deflection']:.9e} m")
+
+    print(f"{'elements':>8} | {'time':>9} | max deflection (non-prismatic)")
+    for num_elements in element_counts:
+        start = time.perf_counter()
+        results = dict(solve_nonprismatic_beam(LOADS_MOMENTS, FIXTURES, 10.0, MOMENT_OF_INERTIA, YOUNGS_MODULUS, SECTIONS, num_points, 'm', 'N', num_elements=num_elements))  # dict() reads every key
+        elapsed = time.perf_counter() - start
+        print(f"{num_elements:>8} | {elapsed * 1e3:>6.1f} ms | {results['max_deflection']:.9e} m at {results['max_deflection_pos']:.4f} m")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+'''
+Compares the beam plot patch from beam_plot_update with the diagram arrays as lists of floats
+(decimal text in the JSON) against Plotly typed arrays (base64 bdata) in float64 and float32:
+bytes sent to the browser and the server time to build and serialize the patch.
+
+Run from the repository root:
+    python -m benchmarks.plot_encoding_benchmark
+'''
+import json
+import time
+import numpy as np
+from calculators.beam_calculator import solve_beam, beam_plot_update
+from benchmarks.beam_plot_benchmark import stress_beam, OVERALL_LENGTH
+
+ENCODINGS = [('list of floats', None), ('bdata float64', 'f8'), ('bdata float32', 'f4')]
+
+
+def encode_time(results, dtype, repeats=5):
+    '''Best time to build the patch and serialize it the way ui.plotly's run_method does, and its size in bytes.'''
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        payload = json.dumps(beam_plot_update(results, dtype=dtype))
+        best = min(best, time.perf_counter() - start)
+    return best, len(payload)
+
+
+def main(point_counts=(250, 5000, 50000)):
+    loads_moments, fixtures = stress_beam()
+    print(f"{'points':>7} | {'encoding':<15} | {'payload':>10} | {'build + serialize':>17} | largest float32 error")
+    for num_points in point_counts:
+        results = solve_beam(loads_moments, fixtures, OVERALL_LENGTH, 8e-6, 2e11, num_points, 'm', 'N')
+        diagrams = np.array([results[key] for key in ['y_shear_plot', 'y_moment_plot', 'y_angle_plot', 'y_deflection_plot']])
+        # relative to each diagram's largest value, the way the plot scales it
+        float32_error = np.max(np.abs(diagrams.astype(np.float32) - diagrams) / np.max(np.abs(diagrams), axis=1, keepdims=True))
+        for name, dtype in ENCODINGS:
+            elapsed, size = encode_time(results, dtype)
+            error = f"{float32_error:.1e}" if dtype == 'f4' else ''
+            print(f"{num_points:>7} | {name:<15} | {size / 1024:>7.1f} kB | {elapsed * 1e3:>14.2f} ms | {error}")
+
+
+if __name__ == '__main__':
+    main()
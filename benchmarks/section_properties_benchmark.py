@@ -0,0 +1,46 @@
+'''
+Times section_properties on extrusion-like profiles of growing detail, uncached and cached.
+
+Run from the repository root:
+    python -m benchmarks.section_properties_benchmark
+'''
+import time
+import numpy as np
+from calculators import section_properties as properties
+from calculators.section_properties import circle, section_properties
+
+
+def profile(num_vertices):
+    '''A round extrusion with a wavy (finned) outline and a ring of round holes.'''
+    angle = np.linspace(0.0, 2 * np.pi, num_vertices, endpoint=False)
+    radius = 30.0 + 2.0 * np.sin(24 * angle)
+    outer = np.stack([radius * np.cos(angle), radius * np.sin(angle)], axis=1)
+    holes = [circle(6.0, 18 * np.cos(a), 18 * np.sin(a), num_vertices=max(num_vertices // 20, 16)) for a in np.linspace(0, 2 * np.pi, 8, endpoint=False)]
+    return [{'outer': outer, 'holes': holes}]
+
+
+def best_time(function, repeats=50):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(vertex_counts=(100, 1000, 10000, 100000)):
+    print(f"{'vertices':>8} | {'uncached':>9} | {'cached':>9}")
+    for num_vertices in vertex_counts:
+        shapes = profile(num_vertices)
+
+        def uncached():
+            properties.property_cache.clear()
+            section_properties(shapes)
+
+        uncached_time = best_time(uncached)
+        cached_time = best_time(lambda: section_properties(shapes))
+        print(f"{num_vertices:>8} | {uncached_time * 1e3:>6.3f} ms | {cached_time * 1e3:>6.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
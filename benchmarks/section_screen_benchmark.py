@@ -0,0 +1,40 @@
+'''
+Times the vectorized section x material screen against one solve_beam per pair.
+
+Run from the repository root:
+    python -m benchmarks.section_screen_benchmark
+'''
+import time
+from calculators.beam_calculator import solve_beam, materials
+from calculators.section_catalog import section_catalog, lightest_sections, STANDARD_GRAVITY
+
+OVERALL_LENGTH = 4.0
+LOADS_MOMENTS = [["Concentrated Force", 2.0, None, -8000.0], ["Constant Distributed Load", 0.0, OVERALL_LENGTH, -1500.0]]
+FIXTURES = [["Pinned/Roller", 0.0], ["Pinned/Roller", OVERALL_LENGTH]]
+
+
+def main(num_looped=200):
+    num_pairs = len(section_catalog['name']) * len(materials)
+    start = time.perf_counter()
+    rows = lightest_sections(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, deflection_ratio=360, min_safety_factor=2.0)
+    screen = time.perf_counter() - start
+
+    # the same check one pair at a time, timed on the first num_looped pairs
+    pairs = [(s, material) for s in range(len(section_catalog['name'])) for material in materials.values()][:num_looped]
+    start = time.perf_counter()
+    for s, material in pairs:
+        weight = section_catalog['area'][s] * material.density.to('kg/m**3').magnitude * STANDARD_GRAVITY
+        results = solve_beam(LOADS_MOMENTS + [["Constant Distributed Load", 0.0, OVERALL_LENGTH, -weight]], FIXTURES, OVERALL_LENGTH,
+                             section_catalog['moment_of_inertia'][s], material.modulus.to('Pa').magnitude, 100, 'm', 'N')
+        results['max_deflection'], results['max_moment']
+    looped = (time.perf_counter() - start) / len(pairs) * num_pairs
+
+    print(f"{num_pairs} section x material pairs")
+    print(f"  lightest_sections:           {screen * 1e3:8.1f} ms")
+    print(f"  solve_beam per pair (est.):  {looped * 1e3:8.1f} ms")
+    for row in rows[:5]:
+        print(f"  {row['section']:<28} {row['material']:<20} {row['weight_per_length']:7.1f} N/m  FoS {row['safety_factor']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+'''
+Times the Monte Carlo tolerance analysis in this process and across a process pool.
+
+Run from the repository root:
+    python -m benchmarks.tolerance_analysis_benchmark
+'''
+import os
+import time
+from calculators.tolerance_analysis import tolerance_analysis
+
+OVERALL_LENGTH = 10.0
+LOADS_MOMENTS = [
+    ["Concentrated Force", ('normal', 3.0, 0.2), None, ('normal', -5000.0, 300.0)],
+    ["Constant Distributed Load", ('uniform', 0.0, 1.0), OVERALL_LENGTH, ('normal', -2000.0, 100.0)],
+    ["Concentrated Moment", 7.0, None, ('triangular', 200.0, 300.0, 400.0)],
+]
+FIXTURES = [["Fixed", 0.0], ["Pinned/Roller", 6.0]]
+MOMENT_OF_INERTIA = ('uniform', 7.8e-6, 8.2e-6)
+YOUNGS_MODULUS = ('normal', 2e11, 5e9)
+SECTION_Y = ('normal', 0.05, 0.001)
+
+
+def main(num_samples=10000):
+    for processes in (None, os.cpu_count()):
+        start = time.perf_counter()
+        results = tolerance_analysis(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, SECTION_Y,
+                                     num_samples=num_samples, seed=0, processes=processes)
+        elapsed = time.perf_counter() - start
+        print(f"{num_samples} samples, processes={processes}: {elapsed:.2f} s")
+    for p, deflection, stress in zip(results['percentiles'], results['max_deflection'], results['max_bending_stress']):
+        print(f"P{p:g}: max deflection {deflection * 1e3:.2f} mm, max bending stress {stress / 1e6:.1f} MPa")
+
+
+if __name__ == '__main__':
+    main()
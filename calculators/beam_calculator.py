@@ -1,7 +1,14 @@
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import base64
+import copy
+import math
+from collections.abc import ItemsView, KeysView, ValuesView
+from functools import lru_cache
 import numpy as np
 from calculators.unit_conversion import *
+from calculators.linear_solvers import lu_factor, lu_solve
+from calculators.beam_elements import integrated_pieces, element_load_vectors, element_stiffness_matrices, solve_element_system, nodal_unknowns
 #from pint import UnitRegistry
 #u = UnitRegistry()
 #Q = u.Quantity
@@ -29,7 +36,7 @@ al_6063_T6 = Material('Aluminum 6063-T6', Q(10000, 'ksi'), Q(0.0975, 'lb/in**3')
 st_1020 = Material('AISI 1020 Steel', Q(29000, 'ksi'), Q(0.284, 'lb/in**3'), Q(42.7, 'ksi'))
 st_A500_B = Material('ASTM A500 Grade B', Q(29000, 'ksi'), Q(0.284, 'lb/in**3'), Q(46.0, 'ksi'))
 st_4130 = Material('AISI 4130 Chromoly Steel', Q(29700, 'ksi'), Q(0.284, 'lb/in**3'), Q(63.1, 'ksi'))
-st_4340 = Material('AISI 4340 Chromoly Steel', Q(29700, 'ksi'), Q(0.284, 'lb/in**3'), Q(103000, 'ksi'))
+st_4340 = Material('AISI 4340 Chromoly Steel', Q(29700, 'ksi'), Q(0.284, 'lb/in**3'), Q(103.0, 'ksi'))
 acetal = Material('Delrin/Acetal Homopolymer', Q(450, 'ksi'), Q(0.051, 'lb/in**3'), Q(11.0, 'ksi'))
 polycarbonate = Material('Polycarbonate', Q(335, 'ksi'), Q(0.04335, 'lb/in**3'), Q(11.0, 'ksi'))
 uhmw = Material('UHMW', Q(100, 'ksi'), Q(0.03360, 'lb/in**3'), Q(21, 'ksi'))
@@ -114,11 +121,9 @@ def find_unknowns(fixtures):
     return unknowns
 
 
-def find_coefficients(forces, unknowns, youngs_modulus, moment_of_inertia, overall_length, selection):
+def find_load_coefficients(forces, overall_length):
     # go through forces and moments and add them to p coefficients.
     # use the singularity function rules to determine exponent. identifier is 1000+ sequential
-    # go through unknowns and add them to the p coefficients. Choose the correct singularity function
-    # sort the p coefficients by location (L to R)
     identifier = 1000
     n = -1
     p_coeffs = []  # id, coefficient(value), location, exponent
@@ -150,438 +155,967 @@ def find_coefficients(forces, unknowns, youngs_modulus, moment_of_inertia, overa
                 identifier += 1
         elif force[0] == "None":
             continue
+    return p_coeffs
 
-    for unknown in unknowns:
-        if unknown[1] == "Moment":
-            n = -2
-            p_coeffs.append([unknown[0], 1, unknown[2], n])
-        elif unknown[1] == "Force y":
-            n = -1
-            p_coeffs.append([unknown[0], 1, unknown[2], n])
-        else:  # skip a1 and a2 FOR p. add them in as coefficients for theta and u later.
-            continue
 
-    v_coeffs = []
-    v_coeff = []
-    m_coeffs = []
-    m_coeff = []
-    theta_coeffs = []
-    theta_coeff = []
-    u_coeffs = []
-    u_coeff = []
-
-    # add a1 and a2 to theta and u. Assume a1 and a2 = 1 for now, will solve to find them later.
-    theta_coeffs.append([1, 1 / (youngs_modulus * moment_of_inertia), -1, 0])  # want EvalSingularity to return a1
-    theta_coeffs.append([2, 0 / (youngs_modulus * moment_of_inertia), 10000000, -1])  # want EvalSingularity to return 0
-    u_coeffs.append([1, 1 / (youngs_modulus * moment_of_inertia), 0, 1])  # want EvalSingularity to return a1*x
-    u_coeffs.append([2, 1 / (youngs_modulus * moment_of_inertia), -1, 0])  # want EvalSingularity to return a2
-
-    for p_coeff in p_coeffs:
-        v_coeff = integrate_singularity(p_coeff)
-        v_coeffs.append(v_coeff)
-        m_coeff = integrate_singularity(v_coeff)
-        m_coeffs.append(m_coeff)
-        theta_coeff = integrate_singularity(m_coeff)
-        theta_coeff[1] = theta_coeff[1] / (youngs_modulus * moment_of_inertia)
-        theta_coeffs.append(theta_coeff)
-        u_coeff = integrate_singularity(theta_coeff)
-        u_coeffs.append(u_coeff)
-
-    if selection == "P(x) Coefficients":
-        return p_coeffs
-    if selection == "V(x) Coefficients":
-        return v_coeffs
-    if selection == "M(x) Coefficients":
-        return m_coeffs
-    if selection == "Theta(x) Coefficients":
-        return theta_coeffs
-    if selection == "u(x) Coefficients":
-        return u_coeffs
-
-
-def integrate_singularity(coeffs):
-    # coeffs comes in the form [id, coeff, location, exp]
-    n = coeffs[3]
-    amplitude = coeffs[1]
-    if n >= 0:
-        amplitude = amplitude / (n + 1)
-        n += 1
-    if n == -1:
-        n = 0
-    if n == -2:
-        n = -1
-    return [coeffs[0], amplitude, coeffs[2], n]
-
-
-def eval_singularity(coeffs, x):
-    # coeffs comes in the form [id, coeff, location, exp]
-    amplitude = coeffs[1]
-    location = coeffs[2]
-    n = coeffs[3]
-    if x < location or n < 0:
-        return 0
-    if x >= location and n == 0:
-        return amplitude
-    if x >= location and n > 0:
-        return amplitude * (x - location) ** n
-
-
-def create_ab(fixtures, theta_coeffs, u_coeffs, p_coeffs, overall_length, selection):
-    b = []
-    a = []
-
-    # SUM OF FORCES IN Y DIRECTION
-    b.append(0)
-    a.append([0, 0])  # first two elements will be 0 for a1 and a2
-    for i in range(len(p_coeffs)):
-        id_val, mag, loc, exp = p_coeffs[i]
-        if id_val < 1000 and exp == -2:  # unknown moment
-            a[-1].append(0)  # add 0 to A matrix
-        if id_val < 1000 and exp == -1:  # unknown force
-            # append F*d directly to A
-            a[-1].append(mag)
-        if id_val >= 1000 and exp == -2:  # known moment
-            # ignore
-            b[-1] -= 0
-        if id_val >= 1000 and exp == -1:  # known force
-            # sum f*d directly to B
-            b[-1] -= mag
-        if id_val >= 1000 and exp == 0:  # known rect. distr. load
-            # sum (w*(Length-loc)) to B
-            b[-1] -= (mag * (overall_length - loc))
-        if id_val >= 1000 and exp == 1:  # known linear distr. load.
-            # sum (w*(1/2)*(Length-Loc)) to B Note that mag is the slope of the line here.
-            b[-1] -= (0.5 * mag * (overall_length - loc) ** 2)
-
-    b.append(0)
-    a.append([0, 0])  # first two elements will be 0 for a1 and a2
-
-    # SUM OF MOMENTS
-    for i in range(len(p_coeffs)):
-        id_val, mag, loc, exp = p_coeffs[i]
-        if id_val < 1000 and exp == -2:  # unknown moment
-            # append directly to A
-            a[-1].append(mag)
-        elif id_val < 1000 and exp == -1:  # unknown force
-            # append F*d directly to A
-            a[-1].append(mag * (overall_length - loc))
-        elif id_val >= 1000 and exp == -2:  # known moment
-            # sum directly to B
-            b[-1] -= mag
-        elif id_val >= 1000 and exp == -1:  # known force
-            # sum f*d directly to B
-            b[-1] -= mag * (overall_length - loc)
-        elif id_val >= 1000 and exp == 0:  # known rect. distr. load
-            # sum (w*(Length-loc))*((Length-loc)/2+loc) to B
-            b[-1] -= (mag * (overall_length - loc)) * ((overall_length - loc) / 2)
-        elif id_val >= 1000 and exp == 1:  # known linear distr. load
-            # sum (w*(1/2)*(Length-Loc))*((2/3)*(Length-loc)) to B
-            b[-1] -= (1 / 2) * (overall_length - loc) ** 3 * mag * (1 / 3)
+# kind of a singularity term
+TERM_PADDING = 0  # inactive filler so every diagram row has the same number of terms
+TERM_KNOWN = 1  # load or moment, the amplitude is final
+TERM_UNKNOWN = 2  # reaction or integration constant, the amplitude is multiplied by its solved value
 
-    for i in range(len(fixtures)):
-        if fixtures[i][0] == "None":
-            continue
-        elif fixtures[i][0] == "Fixed":
-            b.append(0)
-            a.append([])
-
-            x = fixtures[i][1]  # location of fixture
-            for j in range(len(u_coeffs)):
-                if u_coeffs[j][0] == "":
-                    continue
-                value_u = eval_singularity(u_coeffs[j], x)
-                if u_coeffs[j][0] >= 1000:
-                    b[-1] -= value_u
-                elif u_coeffs[j][0] < 1000:
-                    a[-1].append(value_u)
-
-            b.append(0)
-            a.append([])
-            for j in range(len(theta_coeffs)):
-                if theta_coeffs[j][0] == "":
-                    continue
-                value_theta = eval_singularity(theta_coeffs[j], x=x)
-                if theta_coeffs[j][0] >= 1000:
-                    b[-1] -= value_theta
-                elif theta_coeffs[j][0] < 1000:
-                    a[-1].append(value_theta)
-
-        elif fixtures[i][0] == "Pinned/Roller":
-            b.append(0)
-            a.append([])
-
-            x = fixtures[i][1]  # location of fixture
-            for j in range(len(u_coeffs)):
-                if u_coeffs[j][0] == "":
-                    continue
-                value_u = eval_singularity(u_coeffs[j], x)
-                if u_coeffs[j][0] >= 1000:
-                    b[-1] -= value_u
-                elif u_coeffs[j][0] < 1000:
-                    a[-1].append(value_u)
-
-    # gather only the equations you need to solve for unknowns
-    real_a = []
-    real_b = []
-    num_unknowns = len(a[0])
-    for i in range(num_unknowns):
-        real_a.append(a[i])
-        real_b.append(b[i])
-
-    #coeffs = []
-    if selection == "A":
-        return real_a
-    elif selection == "B":
-        return real_b
-
-
-def evaluate_beam_value(coeffs, x_val):
-    y_val = 0
-    for j in range(len(coeffs)):
-        y_val += eval_singularity(coeffs[j], x_val)
-    return y_val
-
-
-def create_points(coeffs, overall_length, num_points, selection='y'):
-    x_increment = overall_length / num_points
-    x_val = 0
-    y_vals = []
-    x_vals = []
-    for i in range(num_points+1):
-        y_val = evaluate_beam_value(coeffs, x_val)
-        y_vals.append(y_val)
-        x_vals.append(x_val)
-        x_val += x_increment
-    if selection == 'x':
-        return x_vals
+# one term: amplitude * <x - location>^exponent, 20 bytes instead of a 4 element list.
+# index is the unknown (0 = a1, 1 = a2, 2 and up = reactions) for UNKNOWN terms and the load term number for KNOWN terms.
+term_dtype = np.dtype([('kind', np.int8), ('index', np.int16), ('amplitude', np.float64), ('location', np.float64), ('exponent', np.int8)])
+
+
+def empty_terms(shape):
+    '''Array of padding terms (exponent -1, so they are never active).'''
+    terms = np.zeros(shape, dtype=term_dtype)
+    terms['index'] = -1
+    terms['exponent'] = -1
+    return terms
+
+
+def coefficient_terms(coeffs):
+    '''Converts a [id, coeff, location, exp] table to a term_dtype array (ids below 1000 are unknowns).'''
+    terms = [coeff for coeff in coeffs if coeff[0] != ""]
+    return np.array([(TERM_UNKNOWN, id_val - 1, mag, loc, exp) if id_val < 1000 else (TERM_KNOWN, id_val - 1000, mag, loc, exp)
+                     for id_val, mag, loc, exp in terms], dtype=term_dtype)
+
+
+def find_load_terms(forces, overall_length):
+    '''P(x) terms of the loads and moments.'''
+    return coefficient_terms(find_load_coefficients(forces, overall_length))
+
+
+def find_unknown_terms(unknowns):
+    '''P(x) terms of the reactions with amplitude 1. a1 and a2 only appear in Theta(x) and u(x).'''
+    exponents = {"Moment": -2, "Force y": -1}
+    return np.array([(TERM_UNKNOWN, unknown[0] - 1, 1.0, unknown[2], exponents[unknown[1]])
+                     for unknown in unknowns if unknown[1] in exponents], dtype=term_dtype)
+
+
+def diagram_terms(p_terms, youngs_modulus, moment_of_inertia, constant_terms=0):
+    '''
+    Integrates P(x) terms through V(x), M(x), Theta(x) and u(x).
+    Returns a (diagram, term) term_dtype array with one row per BeamModel.selections entry.
+    The first constant_terms columns of every row are left as padding for the integration constants.
+    '''
+    num_terms = len(p_terms)
+    terms = empty_terms((len(BeamModel.selections), max(constant_terms + num_terms, 1)))
+    integrated = terms[:, constant_terms:constant_terms + num_terms]
+    integrated[:] = p_terms
+    # integrating d times raises every exponent by d and divides by each new exponent that is >= 1
+    steps = np.arange(len(terms))[:, np.newaxis]
+    divisors = np.maximum(p_terms['exponent'] + steps, 1)
+    divisors[0] = 1
+    amplitude = p_terms['amplitude'] / np.cumprod(divisors, axis=0)
+    amplitude[3:] /= youngs_modulus * moment_of_inertia  # Theta(x) is the integral of M(x) / EI
+    integrated['amplitude'] = amplitude
+    integrated['exponent'] += steps
+    return terms
+
+
+def split_terms(terms):
+    '''Splits a term_dtype array into contiguous amplitude, location and exponent arrays for the evaluators.'''
+    return np.ascontiguousarray(terms['amplitude']), np.ascontiguousarray(terms['location']), terms['exponent'].astype(float)
+
+
+def equation_rows(fixtures, overall_length):
+    '''
+    The equations of A and b in order: sum of forces and sum of moments (V(x) and M(x) at the end of the beam),
+    then u(x) = 0 (and Theta(x) = 0 for Fixed) at each fixture.
+    Returns the diagram (index into BeamModel.selections) and the position of each equation.
+    '''
+    row_diagrams = [1, 2]
+    row_positions = [overall_length, overall_length]
+    for fixture in fixtures:
+        if fixture[0] == "Fixed":
+            row_diagrams += [4, 3]
+            row_positions += [fixture[1], fixture[1]]
+        elif fixture[0] == "Pinned/Roller":
+            row_diagrams.append(4)
+            row_positions.append(fixture[1])
+    return row_diagrams, row_positions
+
+
+def assemble_ab(fixtures, amplitude, location, exponent, unknown_index, overall_length):
+    '''
+    Builds A and b from (diagram, term) arrays in one vectorized pass: every term is evaluated
+    at the position of each equation, unknown terms (unknown_index >= 0) are summed into
+    their column of A and known terms are moved to b.
+    '''
+    row_diagrams, row_positions = equation_rows(fixtures, overall_length)
+    exponent = exponent[row_diagrams]
+    distance = np.array(row_positions)[:, np.newaxis] - location[row_diagrams]
+    values = np.where((distance >= 0) & (exponent >= 0), amplitude[row_diagrams] * distance ** np.maximum(exponent, 0), 0.0)
+    unknown_index = unknown_index[row_diagrams]
+    unknown = unknown_index >= 0
+    a = np.zeros((len(row_diagrams), len(row_diagrams)))
+    a[np.nonzero(unknown)[0], unknown_index[unknown]] = values[unknown]  # each unknown has one term per diagram
+    b = -np.sum(np.where(unknown, 0.0, values), axis=1)
+    return a, b
+
+
+binomial_coefficients = np.array([[math.comb(n, k) for k in range(8)] for n in range(8)], dtype=float)
+
+
+def diagram_breakpoints(location, exponent, start):
+    '''
+    Sorted positions where the diagrams can change from one polynomial to the next:
+    the start position plus the location of every non-negative exponent term after it.
+    '''
+    location = np.asarray(location, dtype=float)
+    exponent = np.asarray(exponent, dtype=float)
+    return np.unique(np.concatenate([[start], location[(exponent >= 0) & (location > start)]]))
+
+
+def polynomial_pieces(amplitude, location, exponent, breakpoints):
+    '''
+    Converts singularity terms into one polynomial per interval between breakpoints.
+
+    Each interval starts at a breakpoint and the polynomial is written in the local
+    coordinate t = x - breakpoint, so no large cancelling powers of x are formed.
+    Leading dimensions broadcast, so a batch of beams can be converted at once.
+
+    Parameters
+    ----------
+    amplitude, location, exponent : ARRAY
+        STACKED TERM TABLES OF SHAPE (..., diagrams, terms).
+    breakpoints : ARRAY
+        SORTED INTERVAL START POSITIONS OF SHAPE (..., intervals). PAD WITH np.inf.
+
+    Returns
+    -------
+    coeffs : ARRAY
+        POLYNOMIAL COEFFICIENTS IN ASCENDING POWERS OF t, SHAPE (..., diagrams, intervals, degree + 1).
+
+    '''
+    amplitude = np.asarray(amplitude, dtype=float)[..., :, np.newaxis, :]
+    location = np.asarray(location, dtype=float)[..., :, np.newaxis, :]
+    exponent = np.asarray(exponent, dtype=float)[..., :, np.newaxis, :]
+    breakpoints = np.asarray(breakpoints, dtype=float)[..., np.newaxis, :, np.newaxis]
+    distance = breakpoints - location
+    # a term is active on every interval that starts at or after its location
+    active = (distance >= 0) & (exponent >= 0) & np.isfinite(distance)
+    distance = np.where(active, distance, 0.0)
+    weight = np.where(active, amplitude, 0.0)
+    n = np.where(active, exponent, 0).astype(int)
+    degree = int(np.max(n, initial=0))
+    coeffs = np.empty(np.broadcast_shapes(amplitude.shape, distance.shape)[:-1] + (degree + 1,))
+    power = np.zeros(distance.shape)
+    for k in range(degree, -1, -1):
+        # binomial expansion of amplitude * (t + distance)^n, coefficient of t^k (the binomial is 0 when k > n).
+        # distance^(n - k) is built up one multiplication per k, which is much cheaper than a power with an array exponent
+        power = np.where(n == k, 1.0, power * distance)
+        coeffs[..., k] = (weight * binomial_coefficients[n, k] * power).sum(axis=-1)
+    return coeffs
+
+
+def evaluate_pieces(breakpoints, coeffs, x_values, left_limit=None):
+    '''
+    Evaluates piecewise polynomials from polynomial_pieces at the x values with Horner's rule.
+    Where left_limit is True the polynomial of the interval ending at x is used.
+    Breakpoints of shape (..., intervals), x values of shape (..., points). Returns (..., diagrams, points).
+    '''
+    breakpoints = np.asarray(breakpoints, dtype=float)
+    x_values = np.asarray(x_values, dtype=float)
+    if breakpoints.ndim == 1:
+        idx = np.searchsorted(breakpoints, x_values, side='right') - 1
+        if left_limit is not None:
+            idx = np.where(left_limit, np.searchsorted(breakpoints, x_values, side='left') - 1, idx)
     else:
-        return y_vals
-    
-    
-def find_new_coeffs(forces, unknowns, youngs_modulus, moment_of_inertia, solns, overall_length, selection):
-    id_val = 1000
-    n = -1
-    p_coeffs = []  # id, coefficient(value), location, exponent
+        # batches have different breakpoints per beam, count the breakpoints at or before each x instead
+        past = x_values[..., :, np.newaxis] >= breakpoints[..., np.newaxis, :]
+        if left_limit is not None:
+            past = np.where(np.asarray(left_limit, dtype=bool)[..., np.newaxis], x_values[..., :, np.newaxis] > breakpoints[..., np.newaxis, :], past)
+        idx = past.sum(axis=-1) - 1
+    idx = np.maximum(idx, 0)
+    if breakpoints.ndim == 1:
+        t = x_values - breakpoints[idx]
+        y_values = coeffs[:, idx, -1]
+        for k in range(coeffs.shape[-1] - 2, -1, -1):
+            y_values = y_values * t + coeffs[:, idx, k]
+        return y_values
+    t = (x_values - np.take_along_axis(breakpoints, idx, axis=-1))[..., np.newaxis, :]
+    idx = idx[..., np.newaxis, :]
+    y_values = np.take_along_axis(coeffs[..., -1], idx, axis=-1)
+    for k in range(coeffs.shape[-1] - 2, -1, -1):
+        y_values = y_values * t + np.take_along_axis(coeffs[..., k], idx, axis=-1)
+    return y_values
+
+
+def piecewise_extrema(breakpoints, coeffs, end, tolerance=1e-12):
+    '''
+    Exact maximum and minimum of piecewise polynomials from polynomial_pieces,
+    between the first breakpoint and end.
 
-    for i in range(len(forces)):
-        if forces[i][0] == "Concentrated Force":
-            n = -1
-            p_coeffs.append([id_val, forces[i][3], forces[i][1], n])
-            id_val += 1
-        elif forces[i][0] == "Concentrated Moment":
-            n = -2
-            p_coeffs.append([id_val, forces[i][3], forces[i][1], n])
-            id_val += 1
-        elif forces[i][0] == "Constant Distributed Load":
-            n = 0
-            p_coeffs.append([id_val, forces[i][3], forces[i][1], n])
-            id_val += 1
-            if forces[i][2] != overall_length:
-                p_coeffs.append([id_val, -1 * forces[i][3], forces[i][2], n])
-                id_val += 1
-        elif forces[i][0] == "Linear Distributed Load":
-            n = 1
-            m = forces[i][3] / (forces[i][2] - forces[i][1])
-            p_coeffs.append([id_val, m, forces[i][1], n])
-            id_val += 1
-            if forces[i][2] < overall_length:
-                p_coeffs.append([id_val, -1 * m, forces[i][2], n])
-                id_val += 1
-                p_coeffs.append([id_val, -1 * forces[i][3], forces[i][2], 0])
-                id_val += 1
-        elif forces[i][0] == "None":
-            continue
+    Each polynomial can only peak at the ends of its interval (one-sided values,
+    so both sides of a jump count) or where its derivative is zero. The derivative
+    roots are the eigenvalues of companion matrices, solved in batches grouped by degree.
+    Pieces whose coefficient bound cannot beat the best interval end value of their
+    diagram are skipped, which leaves few eigenvalue problems on finely meshed beams.
 
-    for i in range(len(unknowns)):
-        if unknowns[i][1] == "Moment":
-            n = -2
-            p_coeffs.append([unknowns[i][0], solns[i], unknowns[i][2], n]) #solns[i][0]]?
-        elif unknowns[i][1] == "Force y":
-            n = -1
-            p_coeffs.append([unknowns[i][0], solns[i], unknowns[i][2], n]) #solns[i][0]]?
+    Parameters
+    ----------
+    breakpoints : ARRAY
+        SORTED INTERVAL START POSITIONS OF SHAPE (..., intervals). PAD WITH np.inf.
+    coeffs : ARRAY
+        POLYNOMIAL COEFFICIENTS OF SHAPE (..., diagrams, intervals, degree + 1).
+    end : FLOAT OR ARRAY
+        END OF THE BEAM, ONE PER BEAM FOR BATCHES.
+    tolerance : FLOAT
+        RELATIVE SIZE BELOW WHICH A DERIVATIVE COEFFICIENT IS TREATED AS ZERO.
+
+    Returns
+    -------
+    max_values, max_positions, min_values, min_positions : ARRAY
+        ARRAYS OF SHAPE (..., diagrams).
+
+    '''
+    breakpoints = np.asarray(breakpoints, dtype=float)
+    end = np.asarray(end, dtype=float)[..., np.newaxis]
+    num_terms = coeffs.shape[-1]
+    next_breakpoints = np.concatenate([breakpoints[..., 1:], np.full(breakpoints.shape[:-1] + (1,), np.inf)], axis=-1)
+    width = np.minimum(next_breakpoints, end) - breakpoints
+    width = np.where(np.isfinite(breakpoints) & (width > 0), width, np.nan)
+    width = np.broadcast_to(width[..., np.newaxis, :], coeffs.shape[:-1]).reshape(-1)
+    flat_coeffs = coeffs.reshape(-1, num_terms)
+
+    # candidates: start of the interval, end of the interval and derivative roots inside it
+    candidates = np.full((len(flat_coeffs), num_terms), np.nan)
+    candidates[:, 0] = np.where(np.isnan(width), np.nan, 0.0)
+    candidates[:, 1] = width
+    if num_terms > 2:
+        # on [0, width] a polynomial lies between c0 + sum(min(c_k width^k, 0)) and c0 + sum(max(c_k width^k, 0))
+        spans = flat_coeffs[:, 1:] * np.nan_to_num(width)[:, np.newaxis] ** np.arange(1, num_terms)
+        upper_bound = (flat_coeffs[:, 0] + np.sum(np.maximum(spans, 0), axis=1)).reshape(coeffs.shape[:-1])
+        lower_bound = (flat_coeffs[:, 0] + np.sum(np.minimum(spans, 0), axis=1)).reshape(coeffs.shape[:-1])
+        end_values = np.stack([flat_coeffs[:, 0], flat_coeffs[:, 0] + np.sum(spans, axis=1)], axis=-1)
+        end_values = np.where(np.isnan(width)[:, np.newaxis], np.nan, end_values).reshape(coeffs.shape[:-1] + (2,))
+        best_max = np.max(np.where(np.isnan(end_values), -np.inf, end_values), axis=(-2, -1))[..., np.newaxis]
+        best_min = np.min(np.where(np.isnan(end_values), np.inf, end_values), axis=(-2, -1))[..., np.newaxis]
+        may_peak = ((upper_bound > best_max) | (lower_bound < best_min)).reshape(-1)
+
+        derivative = flat_coeffs[:, 1:] * np.arange(1, num_terms)
+        # size of each derivative term over the interval, to find the true degree of each polynomial
+        scaled = np.abs(derivative) * np.nan_to_num(width)[:, np.newaxis] ** np.arange(num_terms - 1)
+        significant = scaled > tolerance * np.max(scaled, axis=1, keepdims=True)
+        degree = np.where(np.any(significant, axis=1), num_terms - 2 - np.argmax(significant[:, ::-1], axis=1), 0)
+        for d in range(1, num_terms - 1):
+            rows = np.nonzero((degree == d) & ~np.isnan(width) & may_peak)[0]
+            if len(rows) == 0:
+                continue
+            companion = np.zeros((len(rows), d, d))
+            companion[:, np.arange(1, d), np.arange(d - 1)] = 1.0
+            companion[:, :, -1] = -derivative[rows, :d] / derivative[rows, d:d + 1]
+            roots = np.linalg.eigvals(companion)
+            # keep nearly real roots too (repeated roots come back slightly complex), extra candidates are harmless
+            t = roots.real
+            valid = (np.abs(roots.imag) <= 1e-6 * width[rows, np.newaxis]) & (t > 0) & (t < width[rows, np.newaxis])
+            candidates[rows, 2:2 + d] = np.where(valid, t, np.nan)
+
+    values = flat_coeffs[:, -1:] * np.ones_like(candidates)
+    for k in range(num_terms - 2, -1, -1):
+        values = values * candidates + flat_coeffs[:, k:k + 1]
+    shape = coeffs.shape[:-2] + (coeffs.shape[-2] * num_terms,)
+    values = values.reshape(shape)
+    positions = (np.broadcast_to(breakpoints[..., np.newaxis, :, np.newaxis], coeffs.shape) + candidates.reshape(coeffs.shape)).reshape(shape)
+
+    max_idx = np.argmax(np.where(np.isnan(values), -np.inf, values), axis=-1)[..., np.newaxis]
+    min_idx = np.argmin(np.where(np.isnan(values), np.inf, values), axis=-1)[..., np.newaxis]
+    return (np.take_along_axis(values, max_idx, axis=-1)[..., 0], np.take_along_axis(positions, max_idx, axis=-1)[..., 0],
+            np.take_along_axis(values, min_idx, axis=-1)[..., 0], np.take_along_axis(positions, min_idx, axis=-1)[..., 0])
+
+
+def evaluate_term_arrays(amplitude, location, exponent, x_values, left_limit=None, extrema_end=None):
+    '''
+    Evaluates (diagram, term) arrays over the same x values.
+
+    The terms are converted to piecewise polynomials once, then every x value costs one
+    interval lookup and a short Horner loop per diagram, no matter how many terms there are.
+    Where left_limit is True the value just left of the position is returned. If extrema_end
+    is given, the exact extrema between the first x and extrema_end (see piecewise_extrema)
+    are returned as well.
+    '''
+    x_values = np.asarray(x_values, dtype=float)
+    if left_limit is not None:
+        left_limit = np.asarray(left_limit, dtype=bool)
+    breakpoints = diagram_breakpoints(location, exponent, np.min(x_values, initial=0.0))
+    coeffs = polynomial_pieces(amplitude, location, exponent, breakpoints)
+    y_values = evaluate_pieces(breakpoints, coeffs, x_values, left_limit)
+    if extrema_end is None:
+        return y_values
+    return y_values, piecewise_extrema(breakpoints, coeffs, extrema_end)
+
+
+def stack_term_batch(term_arrays):
+    '''
+    Pads the stacked (diagram, term) arrays of several beams to the same number of terms
+    and stacks them into (beam, diagram, term) arrays. Padding terms are inactive.
+    Any extra arrays after amplitude, location and exponent (like unknown indices) are padded with -1.
+    '''
+    num_terms = max([arrays[0].shape[-1] for arrays in term_arrays] + [1])
+    stacked = []
+    for k in range(len(term_arrays[0])):
+        fill = 0.0 if k < 2 else -1
+        dtype = np.asarray(term_arrays[0][k]).dtype
+        out = np.full((len(term_arrays), term_arrays[0][k].shape[0], num_terms), fill, dtype=dtype)
+        for j, arrays in enumerate(term_arrays):
+            out[j, :, :arrays[k].shape[-1]] = arrays[k]
+        stacked.append(out)
+    return stacked
+
+
+def evaluate_term_batch(amplitude, location, exponent, x_values, left_limit=None, max_chunk_size=2**22, extrema_end=None):
+    '''
+    Evaluates a batch of beams given as (beam, diagram, term) arrays.
+    x_values and left_limit are (beam, point) arrays, or (point,) arrays shared by every beam.
+    Beams are processed in chunks so at most max_chunk_size (beam, diagram, point, interval) values exist at once.
+    Returns an array of shape (beam, diagram, point). If extrema_end (one per beam) is given,
+    the exact extrema from piecewise_extrema are returned as well, each of shape (beam, diagram).
+    '''
+    num_beams, num_diagrams = amplitude.shape[:2]
+    x_values = np.broadcast_to(np.asarray(x_values, dtype=float), (num_beams, np.shape(x_values)[-1]))
+    if left_limit is not None:
+        left_limit = np.broadcast_to(np.asarray(left_limit, dtype=bool), x_values.shape)
+
+    # breakpoints: the first x plus every active term location, sorted per beam (repeated breakpoints are harmless)
+    start = np.min(x_values, axis=1, initial=0.0)[:, np.newaxis]
+    term_locations = np.where((exponent >= 0) & (location > start[:, :, np.newaxis]), location, np.inf).reshape(num_beams, -1)
+    term_locations = np.sort(term_locations, axis=1)
+    term_locations = term_locations[:, :max(np.max(np.sum(np.isfinite(term_locations), axis=1), initial=0), 1)]
+    breakpoints = np.concatenate([start, term_locations], axis=1)
+
+    y_values = np.empty((num_beams, num_diagrams, x_values.shape[1]))
+    extrema = [np.empty((num_beams, num_diagrams)) for _ in range(4)]
+    step = max(1, max_chunk_size // (x_values.shape[1] * breakpoints.shape[1] * num_diagrams))
+    for first in range(0, num_beams, step):
+        chunk = slice(first, first + step)
+        coeffs = polynomial_pieces(amplitude[chunk], location[chunk], exponent[chunk], breakpoints[chunk])
+        y_values[chunk] = evaluate_pieces(breakpoints[chunk], coeffs, x_values[chunk], None if left_limit is None else left_limit[chunk])
+        if extrema_end is not None:
+            for out, values in zip(extrema, piecewise_extrema(breakpoints[chunk], coeffs, np.broadcast_to(extrema_end, (num_beams,))[chunk])):
+                out[chunk] = values
+    if extrema_end is None:
+        return y_values
+    return y_values, tuple(extrema)
+
+
+def beam_sample_points(overall_length, num_points):
+    '''
+    Evenly spaced sample positions (no accumulated float drift).
+    The last point is evaluated as a left limit so reactions and loads at the
+    right-hand end of the beam show up in the diagrams instead of closing them to zero.
+    '''
+    x_vals = np.linspace(0, overall_length, num_points + 1)
+    left_limit = np.zeros(len(x_vals), dtype=bool)
+    left_limit[-1] = True
+    return x_vals, left_limit
+
+
+def adaptive_piece_points(breakpoints, coeffs, overall_length, tolerance=1e-3, max_points=2000, min_segments=4):
+    '''
+    Sample positions that follow the shape of the diagrams.
+
+    Every breakpoint (loads, supports and load ends) is sampled on both sides when
+    any diagram jumps there. Each interval between breakpoints is bisected only
+    where a straight line between neighbouring samples misses a diagram by more
+    than tolerance times that diagram's range, so straight segments get few points
+    and curved ones get more. The exact peak positions are always included.
+
+    Parameters
+    ----------
+    breakpoints : ARRAY
+        START OF EACH POLYNOMIAL PIECE (SEE diagram_breakpoints).
+    coeffs : ARRAY
+        (diagram, piece, power) POLYNOMIAL COEFFICIENTS OF THE SOLVED DIAGRAMS (SEE polynomial_pieces).
+    overall_length : FLOAT
+        LENGTH OF THE BEAM.
+    tolerance : FLOAT
+        ALLOWED INTERPOLATION ERROR AS A FRACTION OF EACH DIAGRAM'S RANGE.
+    max_points : INT
+        POINT BUDGET FOR THE REFINEMENT. BREAKPOINTS AND PEAKS ARE ALWAYS SAMPLED.
+    min_segments : INT
+        NUMBER OF EQUAL SEGMENTS EACH INTERVAL STARTS WITH, SO A SYMMETRIC CURVE
+        CAN NOT HIDE FROM THE MIDPOINT TEST.
+
+    Returns
+    -------
+    x_vals : ARRAY
+        SORTED SAMPLE POSITIONS. POSITIONS WITH A JUMP APPEAR TWICE.
+    left_limit : ARRAY
+        TRUE WHERE THE SAMPLE IS THE VALUE JUST LEFT OF ITS POSITION.
+
+    '''
+    inside = breakpoints < overall_length
+    breakpoints, coeffs = breakpoints[inside], coeffs[:, inside]
+    ends = np.append(breakpoints[1:], overall_length)
+
+    def interval_values(interval, x):
+        t = x - breakpoints[interval]
+        y_values = coeffs[:, interval, -1]
+        for k in range(coeffs.shape[-1] - 2, -1, -1):
+            y_values = y_values * t + coeffs[:, interval, k]
+        return y_values
+
+    intervals = np.arange(len(breakpoints))
+    start_values = interval_values(intervals, breakpoints)
+    end_values = interval_values(intervals, ends)
+    max_values, max_positions, min_values, min_positions = piecewise_extrema(breakpoints, coeffs, overall_length)
+    scale = max_values - min_values
+    scale = np.where(scale > 0, scale, np.inf)[:, np.newaxis]  # flat diagrams never need refining
+
+    fractions = np.arange(min_segments) / min_segments
+    seg_interval = np.repeat(intervals, min_segments)
+    seg_start = np.repeat(breakpoints, min_segments) + np.tile(fractions, len(intervals)) * np.repeat(ends - breakpoints, min_segments)
+    seg_end = np.append(seg_start[1:], overall_length)
+    seg_end[min_segments - 1::min_segments] = ends
+    finished = []  # (start, interval) of segments that need no more splitting
+    num_points = len(seg_start) + len(intervals)
+    while len(seg_start):
+        middle = (seg_start + seg_end) / 2
+        chord_error = np.abs(interval_values(seg_interval, middle) - (interval_values(seg_interval, seg_start) + interval_values(seg_interval, seg_end)) / 2)
+        error = np.max(chord_error / scale, axis=0)
+        split = error > tolerance
+        budget = max_points - num_points
+        if np.sum(split) > budget:
+            # not enough points left: split only the worst segments, then stop
+            worst = np.argsort(error)[::-1][:max(budget, 0)]
+            split = np.zeros(len(split), dtype=bool)
+            split[worst] = True
+            finished.append((np.concatenate([seg_start, middle[split]]), np.concatenate([seg_interval, seg_interval[split]])))
+            break
+        finished.append((seg_start[~split], seg_interval[~split]))
+        num_points += np.sum(split)
+        seg_start, seg_end, seg_interval = (np.concatenate([seg_start[split], middle[split]]),
+                                            np.concatenate([middle[split], seg_end[split]]),
+                                            np.concatenate([seg_interval[split], seg_interval[split]]))
+
+    x_vals = [np.concatenate([points for points, _ in finished]), ends]
+    left_limit = [np.zeros(len(x_vals[0]), dtype=bool), np.ones(len(ends), dtype=bool)]
+    # the value just left of an interior breakpoint is only needed if some diagram jumps there
+    jumps = np.any(np.abs(end_values[:, :-1] - start_values[:, 1:]) > 1e-9 * scale, axis=0)
+    keep_end = np.append(jumps, True)
+    x_vals[1] = x_vals[1][keep_end]
+    left_limit[1] = left_limit[1][keep_end]
+    peaks = np.concatenate([max_positions, min_positions])
+    peaks = peaks[(peaks > 0) & (peaks < overall_length)]
+    x_vals = np.concatenate(x_vals + [peaks])
+    left_limit = np.concatenate(left_limit + [np.zeros(len(peaks), dtype=bool)])
+
+    # sort by position with the left limit first, then drop repeats
+    order = np.lexsort((~left_limit, x_vals))
+    x_vals, left_limit = x_vals[order], left_limit[order]
+    unique = np.ones(len(x_vals), dtype=bool)
+    unique[1:] = (x_vals[1:] != x_vals[:-1]) | (left_limit[1:] != left_limit[:-1])
+    return x_vals[unique], left_limit[unique]
+
+
+class BeamModel:
+    '''
+    Singularity function model of a beam.
+
+    The P(x) terms are integrated through V(x), M(x), Theta(x) and u(x) once and
+    kept as one (diagram, term) term_dtype array in self.terms, so the A and b
+    matrices and every diagram can be built from the same terms.
+
+    Parameters
+    ----------
+    loads_moments : LIST
+        LIST OF LOADS AND MOMENTS WITH THEIR LOCATIONS.
+    fixtures : LIST
+        LIST OF FIXTURES AND THEIR LOCATIONS.
+    overall_length : FLOAT
+        LENGTH OF THE BEAM.
+    moment_of_inertia : FLOAT
+        SECOND MOMENT OF AREA OF THE BEAM.
+    youngs_modulus : FLOAT
+        MODULUS OF ELASTICITY OF THE BEAM.
+
+    '''
+    selections = ["P(x) Coefficients", "V(x) Coefficients", "M(x) Coefficients", "Theta(x) Coefficients", "u(x) Coefficients"]
+
+    def __init__(self, loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus):
+        self.loads_moments = loads_moments
+        self.fixtures = fixtures
+        self.overall_length = overall_length
+        self.moment_of_inertia = moment_of_inertia
+        self.youngs_modulus = youngs_modulus
+        self.unknowns = find_unknowns(fixtures)
+
+        # loads and reactions through all five diagrams, with room in front for the a1 and a2 integration constants
+        load_terms = find_load_terms(loads_moments, overall_length)
+        unknown_terms = find_unknown_terms(self.unknowns)
+        p_terms = np.empty(len(load_terms) + len(unknown_terms), dtype=term_dtype)
+        p_terms[:len(load_terms)] = load_terms
+        p_terms[len(load_terms):] = unknown_terms
+        self.terms = diagram_terms(p_terms, youngs_modulus, moment_of_inertia, constant_terms=2)
+        flexibility = 1 / (youngs_modulus * moment_of_inertia)
+        self.terms[3, 0] = (TERM_UNKNOWN, 0, flexibility, -1, 0)  # Theta(x) = a1 / EI
+        self.terms[4, 0] = (TERM_UNKNOWN, 0, flexibility, 0, 1)  # u(x) = a1 * x / EI
+        self.terms[4, 1] = (TERM_UNKNOWN, 1, flexibility, -1, 0)  # + a2 / EI
+        self.A = None
+        self.b = None
+        self.nodes = None
+        self.nodal_displacements = None
+        self._term_arrays = None
+
+    def assemble(self):
+        '''Builds A and b from the term arrays.'''
+        if self.A is None:
+            self.A, self.b = assemble_ab(self.fixtures, *self.term_arrays(), self.overall_length)
+        return self.A, self.b
+
+    def solve(self):
+        A, b = self.assemble()
+        return np.linalg.solve(A, b)
+
+    def solve_banded(self):
+        '''
+        Solves for the same unknowns as solve() with the stiffness method, for beams with many supports.
+
+        The beam is split into cubic Hermite elements between the supports and beam ends. Loads
+        become consistent nodal loads (3 point Gauss on every piece of distributed load, exact for
+        these polynomials), which makes the nodal deflections and angles exact. The stiffness matrix
+        is block tridiagonal with one 2 x 2 block per node, so it is solved by cyclic reduction in
+        linear time. Reactions are the out of balance nodal forces at the supported DOFs, and a1 and a2
+        come from the angle and deflection at x = 0.
+        '''
+        flexural_rigidity = self.youngs_modulus * self.moment_of_inertia
+        nodes = np.unique(np.concatenate([[0.0, self.overall_length], [fixture[1] for fixture in self.fixtures]]))
+        p_terms = self.terms[0]
+        loads = p_terms[(p_terms['kind'] == TERM_KNOWN) & (p_terms['location'] <= self.overall_length)]
+        element_loads = element_load_vectors(nodes, *split_terms(loads))
+        stiffness = element_stiffness_matrices(nodes, flexural_rigidity)
+        displacements, reactions = solve_element_system(nodes, stiffness, element_loads, self.fixtures)
+        self.nodes = nodes
+        self.nodal_displacements = displacements
+        return nodal_unknowns(self.unknowns, nodes, displacements, reactions, flexural_rigidity)
+
+    def solved_pieces(self, solns):
+        '''
+        Piecewise polynomials of the solved diagrams from integrated_pieces, the linear time counterpart
+        of polynomial_pieces. After solve_banded the exact nodal angles and deflections anchor
+        the integration at every node, otherwise it starts from a1 and a2. Returns (breakpoints, coeffs).
+        '''
+        amplitude, location, exponent = split_terms(self.solved_terms(solns)[0])
+        breakpoints = np.unique(np.concatenate([[0.0], location[location > 0]]))
+        flexibility = 1 / (self.youngs_modulus * self.moment_of_inertia)
+        if self.nodes is None:
+            anchors, theta_anchors, u_anchors = [0], [flexibility * solns[0]], [flexibility * solns[1]]
         else:
-            continue
+            # every node below the end of the beam is a breakpoint (support reactions and x = 0)
+            anchored = self.nodes[self.nodes < self.overall_length]
+            anchors = np.searchsorted(breakpoints, anchored)
+            theta_anchors = self.nodal_displacements[:len(anchored), 1]
+            u_anchors = self.nodal_displacements[:len(anchored), 0]
+        coeffs = integrated_pieces(amplitude, location, exponent, breakpoints, flexibility, np.asarray(anchors), theta_anchors, u_anchors)
+        return breakpoints, coeffs
+
+    def solved_terms(self, solns):
+        '''A copy of the terms with the unknown amplitudes set to the solved values.'''
+        solved = self.terms.copy()
+        unknown = solved['kind'] == TERM_UNKNOWN
+        solved['amplitude'][unknown] *= np.asarray(solns)[solved['index'][unknown]]
+        return solved
+
+    def with_rigidity(self, youngs_modulus, moment_of_inertia):
+        '''
+        The same beam with another E and I. Only the Theta(x) and u(x) terms depend on E * I,
+        so they are rescaled instead of built again. A and b are assembled again when needed.
+        '''
+        ratio = (self.youngs_modulus * self.moment_of_inertia) / (youngs_modulus * moment_of_inertia)
+        model = copy.copy(self)
+        model.youngs_modulus = youngs_modulus
+        model.moment_of_inertia = moment_of_inertia
+        model.terms = self.terms.copy()
+        model.terms['amplitude'][3:] *= ratio
+        if self.nodal_displacements is not None:
+            model.nodal_displacements = self.nodal_displacements * ratio
+        model.A = model.b = model._term_arrays = None
+        return model
+
+    def term_arrays(self):
+        '''
+        The unit terms as (diagram, term) arrays of amplitude, location and exponent,
+        plus the index of the unknown each term is scaled by (-1 for known terms).
+        '''
+        if self._term_arrays is None:
+            unknown_index = np.where(self.terms['kind'] == TERM_UNKNOWN, self.terms['index'], -1)
+            self._term_arrays = split_terms(self.terms) + (unknown_index,)
+        return self._term_arrays
+
+    def solved_arrays(self, solns):
+        '''
+        Returns the five solved coefficient tables stacked into (diagram, term) arrays
+        of amplitude, location and exponent. solns may carry leading dimensions (one row per solution).
+        '''
+        amplitude, location, exponent, unknown_index = self.term_arrays()
+        scale = np.where(unknown_index >= 0, np.asarray(solns)[..., np.maximum(unknown_index, 0)], 1.0)
+        return amplitude * scale, location, exponent
+
+
+def beam_results(model, solns, beam_x_values, diagrams, result_length_unit, result_force_unit, loads_moments=None, extrema=None):
+    '''
+    Packs a solved beam with already sampled diagrams into BeamResults, the results read by
+    generate_beam_plot and the beam page. loads_moments defaults to the loads the model was built with.
+    extrema are the exact (max_values, max_positions, min_values, min_positions) of each diagram
+    from piecewise_extrema. Without them the largest sampled values are used.
+    '''
+    results = BeamResults(model, solns, None, None, len(beam_x_values) - 1, result_length_unit, result_force_unit, loads_moments=loads_moments)
+    results['beam_x_values'] = beam_x_values
+    results.update(zip(BeamResults.diagram_keys, diagrams))
+    if extrema is not None:
+        results.set_extrema(*extrema)
+    return results
 
-    v_coeffs = []
-    v_coeff = []
-    m_coeffs = []
-    m_coeff = []
-    theta_coeffs = []
-    theta_coeff = []
-    u_coeffs = []
-    u_coeff = []
-
-    # Add a1 and a2 to theta and u. Assume a1 and a2 = 1 for now, will solve to find them later.
-    theta_coeffs.append([1, solns[0] / (youngs_modulus * moment_of_inertia), -1, 0])  # want EvalSingularity to return a1
-    u_coeffs.append([1, solns[0] / (youngs_modulus * moment_of_inertia), 0, 1])  # want EvalSingularity to return a1*x
-    u_coeffs.append([2, solns[1] / (youngs_modulus * moment_of_inertia), -1, 0])  # want EvalSingularity to return a2
-
-    for i in range(len(p_coeffs)):
-        v_coeff = integrate_singularity(p_coeffs[i])
-        v_coeffs.append(v_coeff)
-        m_coeff = integrate_singularity(v_coeff)
-        m_coeffs.append(m_coeff)
-        theta_coeff = integrate_singularity(m_coeff)
-        theta_coeff[1] = theta_coeff[1] / (youngs_modulus * moment_of_inertia)
-        theta_coeffs.append(theta_coeff)
-        u_coeff = integrate_singularity(theta_coeff)
-        u_coeffs.append(u_coeff)
-
-    if selection == "P(x) Coefficients":
-        return p_coeffs
-    elif selection == "V(x) Coefficients":
-        return v_coeffs
-    elif selection == "M(x) Coefficients":
-        return m_coeffs
-    elif selection == "Theta(x) Coefficients":
-        return theta_coeffs
-    elif selection == "u(x) Coefficients":
-        return u_coeffs
 
-    
-def solve_beam(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus, num_points, result_length_unit, result_force_unit):
-    important_locations = locations_of_interest(loads_moments, fixtures)
-    unknowns = find_unknowns(fixtures)
-
-    p_coefficients = find_coefficients(loads_moments, unknowns, youngs_modulus, moment_of_inertia, overall_length, "P(x) Coefficients")
-    #v_coefficients = find_coefficients(loads_moments, unknowns, youngs_modulus, moment_of_inertia, overall_length, "V(x) Coefficients")
-    #m_coefficients = find_coefficients(loads_moments, unknowns, youngs_modulus, moment_of_inertia, overall_length, "M(x) Coefficients")
-    theta_coefficients = find_coefficients(loads_moments, unknowns, youngs_modulus, moment_of_inertia, overall_length, "Theta(x) Coefficients")
-    u_coefficients = find_coefficients(loads_moments, unknowns, youngs_modulus, moment_of_inertia, overall_length, "u(x) Coefficients")
-
-    A = np.array(create_ab(fixtures, theta_coefficients, u_coefficients, p_coefficients, overall_length, "A"))
-    b = np.array(create_ab(fixtures, theta_coefficients, u_coefficients, p_coefficients, overall_length, "B"))
-
-    solns = np.linalg.solve(A, b)
-
-    p_coefficients_new = find_new_coeffs(loads_moments, unknowns, youngs_modulus, moment_of_inertia, solns, overall_length, "P(x) Coefficients")
-    v_coefficients_new = find_new_coeffs(loads_moments, unknowns, youngs_modulus, moment_of_inertia, solns, overall_length, "V(x) Coefficients")
-    m_coefficients_new = find_new_coeffs(loads_moments, unknowns, youngs_modulus, moment_of_inertia, solns, overall_length, "M(x) Coefficients")
-    theta_coefficients_new = find_new_coeffs(loads_moments, unknowns, youngs_modulus, moment_of_inertia, solns, overall_length, "Theta(x) Coefficients")
-    u_coefficients_new = find_new_coeffs(loads_moments, unknowns, youngs_modulus, moment_of_inertia, solns, overall_length, "u(x) Coefficients")
-    
-    beam_x_values = create_points(p_coefficients_new, overall_length, num_points, 'x')
-    
-    y_force_plot = create_points(p_coefficients_new, overall_length, num_points)
-    y_shear_plot = create_points(v_coefficients_new, overall_length, num_points)
-    y_moment_plot = create_points(m_coefficients_new, overall_length, num_points)
-    y_angle_plot = create_points(theta_coefficients_new, overall_length, num_points)
-    y_deflection_plot = create_points(u_coefficients_new, overall_length, num_points)
-    y_deflection_plot = np.array(y_deflection_plot)
-    max_deflection_idx = np.argmax(np.absolute(y_deflection_plot))
-    max_deflection = y_deflection_plot[max_deflection_idx]
-    max_deflection_pos = beam_x_values[max_deflection_idx]
-
-    reactions = [row + [solns[i]] for i, row in enumerate(unknowns)] # add the reaction value to each row of the unknowns list
-    results = {
-        'fixtures': fixtures,
-        'loads_moments': loads_moments,
-        'reactions': reactions,
-        'important_locations': important_locations,
-        'beam_x_values': beam_x_values,
-        'y_force_plot': y_force_plot,
-        'y_shear_plot': y_shear_plot,
-        'y_moment_plot': y_moment_plot,
-        'y_angle_plot': y_angle_plot,
-        'y_deflection_plot': y_deflection_plot,
-        'max_deflection': max_deflection,
-        'max_deflection_pos': max_deflection_pos,
-        'length_unit': result_length_unit,
-        'force_unit': result_force_unit
-    }
+class BeamResults(dict):
+    '''
+    Results of solve_beam, read like the dict from beam_results.
+
+    The beam is solved up front, but the reactions, the sampled diagrams and the extrema are
+    only computed when one of their keys is first read, then kept. A caller that wants the
+    reactions skips the sampling and the extrema, one that wants the max deflection skips the
+    sampling. Each group is computed for all five diagrams together, which costs about the
+    same as one. The lazy keys are 'reactions', 'beam_x_values', diagram_keys and
+    extremum_keys. 'fixtures', 'loads_moments', 'important_locations', 'length_unit' and
+    'force_unit' are set up front. Iterating, items(), values(), copying and pickling compute
+    every lazy key. The solved BeamModel is the model attribute, not a key.
+
+    Without breakpoints and coeffs (see beam_results) the diagrams must be given and the
+    extrema are the largest sampled values unless set_extrema is called.
+    '''
+    diagram_keys = ['y_force_plot', 'y_shear_plot', 'y_moment_plot', 'y_angle_plot', 'y_deflection_plot']
+    extremum_keys = ['max_shear', 'max_shear_pos', 'max_moment', 'max_moment_pos', 'max_angle', 'max_angle_pos', 'max_deflection', 'max_deflection_pos']
+    result_keys = ['fixtures', 'loads_moments', 'reactions', 'important_locations', 'beam_x_values'] + diagram_keys + extremum_keys + ['length_unit', 'force_unit']
+
+    def __init__(self, model, solns, breakpoints, coeffs, num_points, result_length_unit, result_force_unit, adaptive_tolerance=None, loads_moments=None):
+        if loads_moments is None:
+            loads_moments = model.loads_moments
+        super().__init__({
+            'fixtures': model.fixtures,
+            'loads_moments': loads_moments,
+            'important_locations': locations_of_interest(loads_moments, model.fixtures),
+            'length_unit': result_length_unit,
+            'force_unit': result_force_unit,
+        })
+        self.model = model
+        self.solns = solns
+        self.breakpoints = breakpoints
+        self.coeffs = coeffs
+        self.num_points = num_points
+        self.adaptive_tolerance = adaptive_tolerance
+
+    def __missing__(self, key):
+        model = self.model
+        if key == 'reactions':
+            self[key] = [row + [self.solns[i]] for i, row in enumerate(model.unknowns)]  # add the reaction value to each row of the unknowns list
+        elif key == 'beam_x_values' or key in self.diagram_keys:
+            if self.adaptive_tolerance is None:
+                beam_x_values, left_limit = beam_sample_points(model.overall_length, self.num_points)
+            else:
+                beam_x_values, left_limit = adaptive_piece_points(self.breakpoints, self.coeffs, model.overall_length, self.adaptive_tolerance, self.num_points)
+            self['beam_x_values'] = beam_x_values
+            self.update(zip(self.diagram_keys, evaluate_pieces(self.breakpoints, self.coeffs, beam_x_values, left_limit)))
+        elif key in self.extremum_keys:
+            if self.coeffs is None:
+                diagrams = np.array([self[name] for name in self.diagram_keys])
+                beam_x_values = np.asarray(self['beam_x_values'])
+                max_idx, min_idx = np.argmax(diagrams, axis=-1), np.argmin(diagrams, axis=-1)
+                self.set_extrema(np.take_along_axis(diagrams, max_idx[:, np.newaxis], axis=-1)[:, 0], beam_x_values[max_idx],
+                                 np.take_along_axis(diagrams, min_idx[:, np.newaxis], axis=-1)[:, 0], beam_x_values[min_idx])
+            else:
+                self.set_extrema(*piecewise_extrema(self.breakpoints, self.coeffs, model.overall_length))
+        else:
+            raise KeyError(key)
+        return dict.__getitem__(self, key)
+
+    def set_extrema(self, max_values, max_positions, min_values, min_positions):
+        '''Stores the signed value with the largest magnitude of each diagram, and its position, as the extremum keys.'''
+        use_max = np.abs(max_values) >= np.abs(min_values)
+        peak_values = np.where(use_max, max_values, min_values)
+        peak_positions = np.where(use_max, max_positions, min_positions)
+        for diagram, name in enumerate(self.extremum_keys[::2], start=1):
+            self[name] = peak_values[diagram]
+            self[name + '_pos'] = peak_positions[diagram]
+
+    def __iter__(self):
+        return iter(self.result_keys)
+
+    def __len__(self):
+        return len(self.result_keys)
+
+    def __contains__(self, key):
+        return key in self.result_keys or dict.__contains__(self, key)
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def copy(self):
+        return dict(self.items())
+
+    def with_rigidity(self, youngs_modulus, moment_of_inertia):
+        '''
+        Results of the same beam with another E and I, without solving it again.
+
+        The reactions, P(x), V(x) and M(x) of a beam with one E * I along its length do not
+        depend on E * I, and Theta(x) and u(x) scale with 1 / (E * I): a1 and a2 are stored as
+        E * I times the angle and deflection at x = 0, so solns stay as they are. Keys that are
+        already computed are carried over (the angle and deflection ones rescaled), the rest
+        stay lazy. The sample positions and the positions of the extrema do not change.
+        For solve_nonprismatic_beam results, every section's E * I is scaled by the same ratio.
+        '''
+        model = self.model
+        ratio = (model.youngs_modulus * model.moment_of_inertia) / (youngs_modulus * moment_of_inertia)
+        coeffs = None
+        if self.coeffs is not None:
+            coeffs = self.coeffs.copy()
+            coeffs[3:] *= ratio
+        results = BeamResults(model.with_rigidity(youngs_modulus, moment_of_inertia), self.solns, self.breakpoints, coeffs, self.num_points,
+                              dict.__getitem__(self, 'length_unit'), dict.__getitem__(self, 'force_unit'), self.adaptive_tolerance,
+                              dict.__getitem__(self, 'loads_moments'))
+        scaled_keys = ('y_angle_plot', 'y_deflection_plot', 'max_angle', 'max_deflection')
+        for key in ['reactions', 'beam_x_values'] + self.diagram_keys + self.extremum_keys:
+            if dict.__contains__(self, key):
+                value = dict.__getitem__(self, key)
+                results[key] = value * ratio if key in scaled_keys else value
+        return results
+
+
+def compare_materials(results, moment_of_inertia=None, section_y=None, material_options=None):
+    '''
+    Deflection, bending stress and factor of safety of one solved beam made of every material.
+
+    Uses BeamResults.with_rigidity's scaling on the extrema only, so the whole table costs the one
+    solve behind results. The bending stress does not depend on the material, only the factor of
+    safety does. Results and section values are SI (m, N, Pa), like the values solve_beam takes.
+
+    Parameters
+    ----------
+    results : DICT
+        solve_beam RESULTS OF A BEAM WITH ONE E * I ALONG ITS LENGTH.
+    moment_of_inertia : FLOAT
+        SECOND MOMENT OF AREA OF THE SECTION TO COMPARE. DEFAULTS TO THE ONE THE BEAM WAS SOLVED WITH.
+    section_y : FLOAT
+        DISTANCE FROM THE NEUTRAL AXIS TO THE EXTREME FIBER. WITHOUT IT THE STRESS AND THE FACTOR OF SAFETY ARE None.
+    material_options : DICT
+        MATERIALS BY NAME, DEFAULTS TO materials.
+
+    Returns
+    -------
+    rows : LIST
+        ONE DICT PER MATERIAL WITH 'material', 'youngs_modulus', 'max_deflection', 'max_deflection_pos',
+        'max_angle', 'max_angle_pos', 'max_bending_stress' AND 'safety_factor'.
+
+    '''
+    model = results.model
+    if moment_of_inertia is None:
+        moment_of_inertia = model.moment_of_inertia
+    if material_options is None:
+        material_options = materials
+    rigidity = model.youngs_modulus * model.moment_of_inertia
+    bending_stress = None if section_y is None else abs(results['max_moment']) * section_y / moment_of_inertia
+    rows = []
+    for name, material in material_options.items():
+        youngs_modulus = material.modulus.to('Pa').magnitude
+        ratio = rigidity / (youngs_modulus * moment_of_inertia)
+        yield_strength = material.yield_strength.to('Pa').magnitude
+        rows.append({
+            'material': name,
+            'youngs_modulus': youngs_modulus,
+            'max_deflection': results['max_deflection'] * ratio,
+            'max_deflection_pos': results['max_deflection_pos'],
+            'max_angle': results['max_angle'] * ratio,
+            'max_angle_pos': results['max_angle_pos'],
+            'max_bending_stress': bending_stress,
+            'safety_factor': None if not bending_stress else yield_strength / bending_stress,
+        })
+    return rows
+
+
+def beam_pieces(model, solver='dense'):
+    '''
+    Solves a BeamModel and returns (solns, breakpoints, coeffs), the diagrams as piecewise polynomials.
+    solver is 'dense' (the singularity function equations solved together) or 'banded'
+    (BeamModel.solve_banded, linear in the number of supports, for long continuous beams).
+    '''
+    if solver == 'banded':
+        solns = model.solve_banded()
+        breakpoints, coeffs = model.solved_pieces(solns)
+    else:
+        solns = model.solve()
+        amplitude, location, exponent = model.solved_arrays(solns)
+        breakpoints = diagram_breakpoints(location, exponent, 0.0)
+        coeffs = polynomial_pieces(amplitude, location, exponent, breakpoints)
+    return solns, breakpoints, coeffs
+
+
+def solve_beam(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus, num_points, result_length_unit, result_force_unit, adaptive_tolerance=None, solver='dense'):
+    '''
+    Solves a beam, see beam_pieces for the solvers. Returns a BeamResults, which samples the
+    diagrams at num_points + 1 evenly spaced positions, or with adaptive_piece_points when
+    adaptive_tolerance is given (num_points is then the point budget), on first access.
+    '''
+    model = BeamModel(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus)
+    return BeamResults(model, *beam_pieces(model, solver), num_points, result_length_unit, result_force_unit, adaptive_tolerance)
+
+
+def solve_beams(configs, num_points, result_length_unit='m', result_force_unit='N', max_chunk_size=2**22):
+    '''
+    Solves many beams at once.
+
+    Beams with the same number of unknowns are grouped, their A and b matrices
+    are stacked into 3-D arrays and solved with one batched np.linalg.solve call.
+    The diagrams of each group are then evaluated as 2-D (beam, point) arrays.
+
+    Parameters
+    ----------
+    configs : LIST
+        LIST OF BEAM DEFINITIONS. EACH IS A DICT WITH THE solve_beam ARGUMENTS
+        loads_moments, fixtures, overall_length, moment_of_inertia AND youngs_modulus.
+    num_points : INT
+        NUMBER OF INTERVALS EACH BEAM IS SAMPLED WITH.
+    max_chunk_size : INT
+        MAXIMUM NUMBER OF (beam, diagram, x, interval) VALUES EVALUATED AT ONCE.
+
+    Returns
+    -------
+    results : LIST
+        ONE solve_beam STYLE RESULTS DICT PER CONFIG, IN INPUT ORDER. THE DIAGRAM
+        ARRAYS ARE ROWS OF THE GROUP'S 2-D ARRAYS.
+
+    '''
+    models = [BeamModel(config['loads_moments'], config['fixtures'], config['overall_length'],
+                        config['moment_of_inertia'], config['youngs_modulus']) for config in configs]
+    groups = {}
+    for i, model in enumerate(models):
+        groups.setdefault(len(model.unknowns), []).append(i)
+
+    results = [None] * len(models)
+    for indices in groups.values():
+        A = np.stack([models[i].assemble()[0] for i in indices])
+        b = np.stack([models[i].assemble()[1] for i in indices])
+        solns = np.linalg.solve(A, b[:, :, np.newaxis])[:, :, 0]
+
+        lengths = np.array([models[i].overall_length for i in indices])
+        beam_x_values = np.linspace(0, lengths, num_points + 1, axis=1)
+        left_limit = np.zeros(beam_x_values.shape, dtype=bool)
+        left_limit[:, -1] = True
+
+        amplitude, location, exponent, unknown_index = stack_term_batch([models[i].term_arrays() for i in indices])
+        # scale the unknown terms of every beam by its own solution
+        solved = np.take_along_axis(solns, np.maximum(unknown_index, 0).reshape(len(indices), -1), axis=1).reshape(amplitude.shape)
+        amplitude = np.where(unknown_index >= 0, amplitude * solved, amplitude)
+        diagrams, extrema = evaluate_term_batch(amplitude, location, exponent, beam_x_values, left_limit, max_chunk_size, extrema_end=lengths)
+
+        for j, i in enumerate(indices):
+            results[i] = beam_results(models[i], solns[j], beam_x_values[j], diagrams[j], result_length_unit, result_force_unit,
+                                      extrema=tuple(values[j] for values in extrema))
     return results
 
 
-def add_beam_context(fig, results:dict, row_num, col_num):
-    """Adds the flat beam line."""
-    flat_beam = np.zeros(np.shape(results['beam_x_values']))
-    fig.add_trace(go.Scatter(
-        x=results['beam_x_values'], y=flat_beam, 
-        mode='lines', line=dict(color='black', width=5), 
-        name='Beam', hoverinfo='none', showlegend=False
-    ), row=row_num, col=col_num)
-    for fixture in results['fixtures']:
-        if fixture[0] == "Pinned/Roller":
-            fixture_hover_text = "Pinned/Roller Support: "
-            for reaction in results['reactions']:
-                if reaction[0] > 2: # skip integration constants
-                    if reaction[2] == fixture[1]: # reaction and fixture at same location
-                        fixture_hover_text += "<br>Force = " + f"{reaction[3]:.4f}" + " " + results['force_unit']
-            fig.add_trace(go.Scatter(
-                x=[fixture[1]], y=[0],
-                marker_symbol="arrow-up",
-                marker_color="black",
-                marker_size=15,
-                showlegend=False,
-                hoverinfo="text",
-                hovertext=[fixture_hover_text]
-            ), row=row_num, col=col_num)
-        if fixture[0] == "Fixed":
-            fixture_hover_text = "Fixed Support: "
-            for reaction in results['reactions']:
-                if reaction[0] > 2: # skip integration constants
-                    if reaction[2] == fixture[1]: # reaction and fixture at same location
-                        if reaction[1] == 'Moment':
-                            fixture_hover_text += "<br>Moment = " + f"{reaction[3]:.4f}" + " " + results['force_unit'] + "*" + results['length_unit']
-                        if reaction[1] == 'Force y':
-                            fixture_hover_text += "<br>Force = " + f"{reaction[3]:.4f}" + " " + results['force_unit']
-            fig.add_trace(go.Scatter(
-                x=[fixture[1]], y=[0],
-                marker_symbol="square",
-                marker_color="black",
-                marker_size=15,
-                showlegend=False,
-                hoverinfo="text",
-                hovertext=[fixture_hover_text]
-            ), row=row_num, col=col_num)
-    #4. Add loads and moments
-    for load in results['loads_moments']:
-        load_value = f"{load[3]:.4f}"
-        if load[0] == 'Concentrated Force':
-            fig.add_trace(go.Scatter(
-                x=[load[1]],
-                y=[0],
-                mode="markers+text",
-                marker=dict(size=5, opacity=0),
-                text=["↑" if load[3] > 0 else "↓"],
-                textposition="top center",
-                textfont=dict(size=28, color="red", weight="bold"),
-                hoverinfo="text",
-                hovertext=[f"Force: {load_value}"+ " " + results['force_unit']],
-                showlegend=False
-            ), row=row_num, col=col_num)
-        if load[0] == 'Concentrated Moment':
-            fig.add_trace(go.Scatter(
-                x=[load[1]],
-                y=[0],
-                mode="markers+text",
-                marker=dict(size=5, opacity=0),
-                text=["↺" if load[3] < 0 else "↻"],
-                textposition="middle center",
-                textfont=dict(size=28, color="red", weight="bold"),
-                hoverinfo="text",
-                hovertext=[f"Moment: {load_value}"+ " " + results['force_unit']+ "*" + results['length_unit']],
-                showlegend=False
-            ), row=row_num, col=col_num)
+class BeamSupports:
+    '''
+    Support configuration of a beam: fixtures, overall length and E*I.
 
+    Matrix A only depends on the support configuration, so it is assembled and LU
+    factorized once. Any number of load cases are then solved against it as extra
+    right hand sides, which only costs a back substitution each.
 
-def generate_beam_plot(results: dict, length_unit:str='m', force_unit:str='N'):
+    Parameters
+    ----------
+    fixtures : LIST
+        LIST OF FIXTURES AND THEIR LOCATIONS.
+    overall_length : FLOAT
+        LENGTH OF THE BEAM.
+    moment_of_inertia : FLOAT
+        SECOND MOMENT OF AREA OF THE BEAM.
+    youngs_modulus : FLOAT
+        MODULUS OF ELASTICITY OF THE BEAM.
+
+    '''
+    def __init__(self, fixtures, overall_length, moment_of_inertia, youngs_modulus):
+        self.fixtures = fixtures
+        self.overall_length = overall_length
+        self.moment_of_inertia = moment_of_inertia
+        self.youngs_modulus = youngs_modulus
+        self.model = BeamModel([], fixtures, overall_length, moment_of_inertia, youngs_modulus)
+        self.unknowns = self.model.unknowns
+        A, _ = self.model.assemble()
+        self.lu, self.piv = lu_factor(A)
+
+        self.row_diagrams, self.row_positions = equation_rows(fixtures, overall_length)
+        self._unit_diagrams = None
+
+    def load_terms(self, loads_moments):
+        '''Known terms of all five diagrams for one load case, stacked into (diagram, term) arrays.'''
+        load_terms = find_load_terms(loads_moments, self.overall_length)
+        return split_terms(diagram_terms(load_terms, self.youngs_modulus, self.moment_of_inertia))
+
+    def load_vectors(self, load_terms):
+        '''b for a batch of load cases given as (case, diagram, term) arrays. Returns (case, unknown).'''
+        values = evaluate_term_batch(*load_terms, np.array(self.row_positions))
+        return -values[:, self.row_diagrams, np.arange(len(self.row_positions))]
+
+    def solve(self, load_cases):
+        '''Solves every load case (a list of loads_moments lists). Returns the unknowns as a (case, unknown) array.'''
+        return self.solve_terms(stack_term_batch([self.load_terms(loads_moments) for loads_moments in load_cases]))
+
+    def solve_terms(self, load_terms):
+        '''Solves load cases given as (case, diagram, term) arrays. Returns the unknowns as a (case, unknown) array.'''
+        return lu_solve(self.lu, self.piv, self.load_vectors(load_terms).T).T
+
+    def unit_diagrams(self, x_values, left_limit=None):
+        '''Diagrams produced by each unknown with a value of 1, shape (unknown, diagram, point). Cached per x array.'''
+        if self._unit_diagrams is None or not np.array_equal(self._unit_diagrams[0], x_values):
+            amplitude, location, exponent, unknown_index = self.model.term_arrays()
+            unknown = np.arange(len(self.unknowns))[:, np.newaxis, np.newaxis]
+            unit_amplitude = np.where(unknown_index == unknown, amplitude, 0.0)
+            shape = unit_amplitude.shape
+            diagrams = evaluate_term_batch(unit_amplitude, np.broadcast_to(location, shape), np.broadcast_to(exponent, shape), x_values, left_limit)
+            self._unit_diagrams = (np.array(x_values), diagrams)
+        return self._unit_diagrams[1]
+
+    def solve_load_cases(self, load_cases, num_points, result_length_unit='m', result_force_unit='N'):
+        '''
+        Solves every load case and returns one solve_beam style results dict per case.
+        Each case's diagrams come from its own load terms plus the unknown terms scaled by its solution.
+        '''
+        beam_x_values, left_limit = beam_sample_points(self.overall_length, num_points)
+        load_terms = stack_term_batch([self.load_terms(loads_moments) for loads_moments in load_cases])
+        solns = self.solve_terms(load_terms)
+        unknown_amplitude, unknown_location, unknown_exponent = self.model.solved_arrays(solns)
+        shape = unknown_amplitude.shape
+        amplitude = np.concatenate([load_terms[0], unknown_amplitude], axis=-1)
+        location = np.concatenate([load_terms[1], np.broadcast_to(unknown_location, shape)], axis=-1)
+        exponent = np.concatenate([load_terms[2], np.broadcast_to(unknown_exponent, shape)], axis=-1)
+        diagrams, extrema = evaluate_term_batch(amplitude, location, exponent, beam_x_values, left_limit, extrema_end=self.overall_length)
+        return [beam_results(self.model, solns[c], beam_x_values, diagrams[c], result_length_unit, result_force_unit,
+                             loads_moments=load_cases[c], extrema=tuple(values[c] for values in extrema))
+                for c in range(len(load_cases))]
+
+# trace slots of the beam plot: the diagrams of each row followed by the beam context (beam line, supports, point loads)
+context_trace_count = 5
+beam_plot_rows = [(1, ['y_force_plot']), (2, ['y_shear_plot', 'y_moment_plot']), (3, ['y_deflection_plot', 'y_angle_plot', 'max_deflection'])]
+
+
+@lru_cache(maxsize=1)
+def beam_plot_skeleton():
     """
-    Generates a single Plotly Figure with three stacked subplots, 
-    aligning zeros on dual-axis plots.
+    The beam plot with its subplots, axis styling, legend, fonts and every trace styled but empty,
+    as a plain figure dict. It is built once, beam_plot_update fills in the data.
     """
-    # Extract data
-    beam_x_values = results['beam_x_values']
-    y_force_plot = results['y_force_plot']      # Load
-    y_shear_plot = results['y_shear_plot']      # Shear
-    y_moment_plot = results['y_moment_plot']    # Moment
-    y_angle_plot = results['y_angle_plot']      # Angle
-    y_deflection_plot = results['y_deflection_plot'] # Deflection
-    max_deflection_y = results['max_deflection']
-    max_deflection_x = results['max_deflection_pos']
-    fixtures = results['fixtures']
-    loads = results['loads_moments']
-    
     # 1. Create Subplots Layout: 3 rows, with secondary Y axis on rows 2 and 3
     fig = make_subplots(
         rows=3, cols=1,
@@ -595,105 +1129,31 @@ def generate_beam_plot(results: dict, length_unit:str='m', force_unit:str='N'):
         ],
         vertical_spacing=0.1
     )
+    diagram_traces = {
+        # Distributed Load (Fill area is a good representation)
+        'y_force_plot': (go.Scatter(fill='tozeroy', fillcolor='rgba(255, 0, 0, 0.4)', mode='lines', line=dict(color='red', width=2), showlegend=False), False),
+        'y_shear_plot': (go.Scatter(mode='lines', line=dict(color='blue', width=2)), False),
+        'y_moment_plot': (go.Scatter(mode='lines', line=dict(color='green', width=2)), True),
+        'y_deflection_plot': (go.Scatter(mode='lines', line=dict(color='purple', width=3)), False),
+        'y_angle_plot': (go.Scatter(mode='lines', line=dict(color='red', width=2), name='Angle of Deflection (rad)'), True),
+        # Max Deflection Point (on the Primary Y-axis of Row 3)
+        'max_deflection': (go.Scatter(mode='markers', marker=dict(symbol='x', size=12, color='purple'), name='Max Deflection', hoverinfo='text', showlegend=False), False),
+    }
+    arrow_font = dict(size=28, color="red", weight="bold")
+    context_traces = [
+        go.Scatter(mode='lines', line=dict(color='black', width=5), name='Beam', hoverinfo='none', showlegend=False),
+        go.Scatter(mode='markers', marker=dict(symbol="arrow-up", color="black", size=15), hoverinfo="text", showlegend=False),
+        go.Scatter(mode='markers', marker=dict(symbol="square", color="black", size=15), hoverinfo="text", showlegend=False),
+        go.Scatter(mode="markers+text", marker=dict(size=5, opacity=0), textposition="top center", textfont=arrow_font, hoverinfo="text", showlegend=False),
+        go.Scatter(mode="markers+text", marker=dict(size=5, opacity=0), textposition="middle center", textfont=arrow_font, hoverinfo="text", showlegend=False),
+    ]
+    for row, keys in beam_plot_rows:
+        for key in keys:
+            trace, secondary_y = diagram_traces[key]
+            fig.add_trace(trace, row=row, col=1, secondary_y=secondary_y)
+        for trace in context_traces:
+            fig.add_trace(trace, row=row, col=1)
 
-    # --- ROW 1: Distributed Load ---
-    
-    # Add Distributed Load (Fill area is a good representation)
-    load_name = f"Distributed Load ({force_unit})"
-    fig.add_trace(go.Scatter(
-        x=beam_x_values, y=y_force_plot,
-        fill='tozeroy', fillcolor='rgba(255, 0, 0, 0.4)',
-        mode='lines', line=dict(color='red', width=2),
-        name=load_name, showlegend=False
-    ), row=1, col=1)
-    
-    # Add a flat beam line for context
-    add_beam_context(fig, results, 1, 1)
-
-    # --- ROW 2: Shear & Bending Moment ---
-
-    # Calculate zero-aligned ranges
-    try:
-        range_s = np.ptp(y_shear_plot)
-        min_s = np.min(y_shear_plot) - 0.1*range_s
-        max_s = np.max(y_shear_plot) + 0.1*range_s
-        range_m = np.ptp(y_moment_plot)
-        min_m = np.min(y_moment_plot) - 0.1*range_m
-        max_m = np.max(y_moment_plot) + 0.1*range_m
-        (range_s_min, range_s_max), (range_m_min, range_m_max) = align_zeros_plotly(min_s, max_s, min_m, max_m)
-    except:
-        (range_s_min, range_s_max), (range_m_min, range_m_max)= (-10, 10), (-10, 10)
-    
-    # Shear (Primary Y)
-    shear_name = f"Shear Force ({force_unit})"
-    fig.add_trace(go.Scatter(
-        x=beam_x_values, y=y_shear_plot, 
-        mode='lines', line=dict(color='blue', width=2), 
-        name=shear_name
-    ), row=2, col=1, secondary_y=False)
-
-    # Moment (Secondary Y)
-    bending_name = f"Bending Moment ({force_unit}*{length_unit})"
-    fig.add_trace(go.Scatter(
-        x=beam_x_values, y=y_moment_plot, 
-        mode='lines', line=dict(color='green', width=2), 
-        name=bending_name
-    ), row=2, col=1, secondary_y=True)
-    
-    # Add a flat beam line for context
-    add_beam_context(fig, results, 2, 1)
-
-    # --- ROW 3: Deflection & Angle of Deflection ---
-    
-    # Calculate zero-aligned ranges
-    try:
-        range_d = np.ptp(y_deflection_plot)
-        min_d = np.min(y_deflection_plot) - 0.1*range_d
-        max_d = np.max(y_deflection_plot) + 0.1*range_d
-        range_a = np.ptp(y_angle_plot)
-        min_a = np.min(y_angle_plot) - 0.1*range_a
-        max_a = np.max(y_angle_plot) + 0.1*range_a
-        (range_d_min, range_d_max), (range_a_min, range_a_max) = align_zeros_plotly(min_d, max_d, min_a, max_a)
-    except:
-        (range_d_min, range_d_max), (range_a_min, range_a_max) = (-10, 10), (-10, 10)
-        
-
-    # Deflection (Primary Y)
-    deflection_name = f"Deflection ({length_unit})"
-    fig.add_trace(go.Scatter(
-        x=beam_x_values, y=y_deflection_plot, 
-        mode='lines', line=dict(color='purple', width=3), 
-        name=deflection_name
-    ), row=3, col=1, secondary_y=False)
-
-    # Angle (Secondary Y)
-    fig.add_trace(go.Scatter(
-        x=beam_x_values, y=y_angle_plot, 
-        mode='lines', line=dict(color='red', width=2), 
-        name='Angle of Deflection (rad)'
-    ), row=3, col=1, secondary_y=True)
-    
-    # Max Deflection Point (on the Primary Y-axis of Row 3)
-    fig.add_trace(go.Scatter(
-        x=[max_deflection_x], y=[max_deflection_y],
-        mode='markers',
-        marker=dict(symbol='x', size=12, color='purple'),
-        name='Max Deflection',
-        hoverinfo='text',
-        text=f'Max Deflection: {max_deflection_y:.3E}',
-        showlegend=False
-    ), row=3, col=1, secondary_y=False)
-    
-    # Add a flat beam line for context
-    add_beam_context(fig, results, 3, 1)
-
-    # Calculate X-axis ranges
-    try:
-        x_min = np.min(beam_x_values) - np.ptp(beam_x_values)*0.05
-        x_max = np.max(beam_x_values) + np.ptp(beam_x_values)*0.05
-    except:
-        x_min=-0.1
-        x_max=10
     # --- 4. Configure Layout and Axes ---
     fig.update_layout(
         title_text="Beam Analysis Diagrams",
@@ -714,24 +1174,166 @@ def generate_beam_plot(results: dict, length_unit:str='m', force_unit:str='N'):
             x=0.5
         ),
 
-        xaxis=dict(
-            range=[x_min, x_max],
-            constrain="domain",
-        ),
+        xaxis=dict(constrain="domain"),
         
-        # Enforce zero alignment using the calculated ranges
-        yaxis2=dict(title=shear_name, color='blue', range=[range_s_min, range_s_max], zeroline=True, zerolinecolor='black'),
-        yaxis3=dict(title=bending_name, color='green', overlaying='y2', side='right', range=[range_m_min, range_m_max], zeroline=True, zerolinecolor='black'),
+        # zero alignment comes from the ranges set by beam_plot_update
+        yaxis2=dict(color='blue', zeroline=True, zerolinecolor='black'),
+        yaxis3=dict(color='green', overlaying='y2', side='right', zeroline=True, zerolinecolor='black'),
         
-        yaxis4=dict(title=deflection_name, color='purple', range=[range_d_min, range_d_max], zeroline=True, zerolinecolor='black'),
-        yaxis5=dict(title='Angle of Deflection (rad)', color='red', overlaying='y4', side='right', range=[range_a_min, range_a_max], zeroline=True, zerolinecolor='black'),
+        yaxis4=dict(color='purple', zeroline=True, zerolinecolor='black'),
+        yaxis5=dict(title='Angle of Deflection (rad)', color='red', overlaying='y4', side='right', zeroline=True, zerolinecolor='black'),
     )
-    
-    # Update X-axis title for the bottom plot only
-    x_axis_name = f"Distance Along Beam ({length_unit})"
-    fig.update_xaxes(title_text=x_axis_name, row=3, col=1)
-    
-    return fig
+    return fig.to_dict()
+
+
+def beam_context_data(results:dict):
+    """
+    Data of the five beam context traces drawn on every subplot row: a two point beam line and
+    one trace each for pinned/roller supports, fixed supports, forces and moments, holding the
+    positions and hover texts of all of them.
+    """
+    force_unit, length_unit = results['force_unit'], results['length_unit']
+    beam_x_values = results['beam_x_values']
+    beam_ends = [] if beam_x_values is None or len(beam_x_values) == 0 else [float(beam_x_values[0]), float(beam_x_values[-1])]
+    traces = [dict(x=beam_ends, y=[0] * len(beam_ends), text=None, hovertext=None, name='Beam')]
+    # reactions at each fixture position, skipping the integration constants
+    fixture_reactions = {}
+    for reaction in results['reactions']:
+        if reaction[0] > 2:
+            fixture_reactions.setdefault(reaction[2], []).append(reaction)
+    for fixture_type in ('Pinned/Roller', 'Fixed'):
+        x, hover_text = [], []
+        for fixture in results['fixtures']:
+            if fixture[0] != fixture_type:
+                continue
+            fixture_hover_text = fixture[0] + " Support: "
+            for reaction in fixture_reactions.get(fixture[1], []):
+                if reaction[1] == 'Moment':
+                    fixture_hover_text += "<br>Moment = " + f"{reaction[3]:.4f}" + " " + force_unit + "*" + length_unit
+                elif fixture[0] == 'Pinned/Roller' or reaction[1] == 'Force y':
+                    fixture_hover_text += "<br>Force = " + f"{reaction[3]:.4f}" + " " + force_unit
+            x.append(float(fixture[1]))
+            hover_text.append(fixture_hover_text)
+        traces.append(dict(x=x, y=[0] * len(x), text=None, hovertext=hover_text))
+    for load_type, label, arrow, hover_unit in (
+            ('Concentrated Force', "Force", lambda value: "↑" if value > 0 else "↓", force_unit),
+            ('Concentrated Moment', "Moment", lambda value: "↺" if value < 0 else "↻", force_unit + "*" + length_unit)):
+        loads = [load for load in results['loads_moments'] if load[0] == load_type]
+        traces.append(dict(x=[float(load[1]) for load in loads], y=[0] * len(loads),
+                           text=[arrow(load[3]) for load in loads],
+                           hovertext=[f"{label}: {load[3]:.4f} {hover_unit}" for load in loads]))
+    return traces
+
+
+def plot_array(values, dtype='f8'):
+    """
+    values as a Plotly typed array, {'dtype', 'bdata'} with the little endian bytes in base64,
+    or as a list of floats when dtype is None. 'f4' halves the size again and is plenty for display.
+    """
+    values = np.asarray(values, dtype=float)
+    if dtype is None:
+        return values.tolist()
+    return {'dtype': dtype, 'bdata': base64.b64encode(values.astype('<' + dtype).tobytes()).decode('ascii')}
+
+
+def beam_plot_update(results:dict, length_unit:str='m', force_unit:str='N', x_range=None, dtype='f8'):
+    """
+    The data, axis ranges and titles of the beam plot for a set of results, as the
+    (data_update, layout_update) arguments of Plotly.update for the traces of beam_plot_skeleton.
+    Values are JSON ready, the diagram arrays are typed arrays of dtype (see plot_array).
+    x_range is the visible (x_min, x_max), by default the beam with a 5% margin each side.
+    """
+    def values(key):
+        return np.empty(0) if results[key] is None else np.asarray(results[key], dtype=float)
+
+    beam_x_values = values('beam_x_values')
+    encoded_x_values = plot_array(beam_x_values, dtype)
+    names = {
+        'y_force_plot': f"Distributed Load ({force_unit})",
+        'y_shear_plot': f"Shear Force ({force_unit})",
+        'y_moment_plot': f"Bending Moment ({force_unit}*{length_unit})",
+        'y_deflection_plot': f"Deflection ({length_unit})",
+        'y_angle_plot': 'Angle of Deflection (rad)',
+        'max_deflection': 'Max Deflection',
+    }
+    context = beam_context_data(results)
+    data = {'x': [], 'y': [], 'text': [], 'hovertext': [], 'name': []}
+    for row, keys in beam_plot_rows:
+        for key in keys:
+            if key == 'max_deflection':
+                trace = dict(x=[float(results['max_deflection_pos'])], y=[float(results['max_deflection'])],
+                             text=f"Max Deflection: {results['max_deflection']:.3E}", hovertext=None)
+            else:
+                trace = dict(x=encoded_x_values, y=plot_array(values(key), dtype), text=None, hovertext=None)
+            trace['name'] = names[key]
+            for name in data:
+                data[name].append(trace[name])
+        for trace in context:
+            for name in data:
+                data[name].append(trace.get(name))
+
+    # Calculate zero-aligned ranges
+    y_ranges = []
+    for primary, secondary in (('y_shear_plot', 'y_moment_plot'), ('y_deflection_plot', 'y_angle_plot')):
+        try:
+            y_1, y_2 = np.asarray(results[primary], dtype=float), np.asarray(results[secondary], dtype=float)
+            range_1, range_2 = np.ptp(y_1), np.ptp(y_2)
+            ranges = align_zeros_plotly(np.min(y_1) - 0.1*range_1, np.max(y_1) + 0.1*range_1,
+                                        np.min(y_2) - 0.1*range_2, np.max(y_2) + 0.1*range_2)
+        except:
+            ranges = (-10, 10), (-10, 10)
+        y_ranges += [[float(limit) for limit in axis_range] for axis_range in ranges]
+
+    # Calculate X-axis ranges
+    if x_range is None:
+        try:
+            x_range = (np.min(beam_x_values) - np.ptp(beam_x_values)*0.05, np.max(beam_x_values) + np.ptp(beam_x_values)*0.05)
+        except:
+            x_range = (-0.1, 10)
+    layout = {}
+    for axis in ('xaxis', 'xaxis2', 'xaxis3'):
+        layout[axis + '.range'] = [float(x_range[0]), float(x_range[1])]
+    for axis, key, y_range in zip(('yaxis2', 'yaxis3', 'yaxis4', 'yaxis5'), ('y_shear_plot', 'y_moment_plot', 'y_deflection_plot', 'y_angle_plot'), y_ranges):
+        layout[axis + '.title.text'] = names[key]
+        layout[axis + '.range'] = y_range
+    # X-axis title for the bottom plot only
+    layout['xaxis3.title.text'] = f"Distance Along Beam ({length_unit})"
+    return data, layout
+
+
+def apply_plot_update(figure:dict, data:dict, layout:dict):
+    """
+    Applies a (data_update, layout_update) pair to a figure dict in place, the way Plotly.update
+    does in the browser. Keys are dotted attribute paths and None removes an attribute.
+    """
+    def set_path(target, path, value):
+        *parents, name = path.split('.')
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        if value is None:
+            target.pop(name, None)
+        else:
+            target[name] = value
+
+    for path, values in data.items():
+        for trace, value in zip(figure['data'], values):
+            set_path(trace, path, value)
+    for path, value in layout.items():
+        set_path(figure['layout'], path, value)
+    return figure
+
+
+def beam_plot_figure(results:dict, length_unit:str='m', force_unit:str='N', x_range=None, dtype='f8'):
+    """The beam plot as a figure dict, a copy of beam_plot_skeleton filled in by beam_plot_update."""
+    return apply_plot_update(copy.deepcopy(beam_plot_skeleton()), *beam_plot_update(results, length_unit, force_unit, x_range, dtype))
+
+
+def generate_beam_plot(results: dict, length_unit:str='m', force_unit:str='N'):
+    """
+    Generates a single Plotly Figure with three stacked subplots, 
+    aligning zeros on dual-axis plots.
+    """
+    return go.Figure(beam_plot_figure(results, length_unit, force_unit))
 
 
 def align_zeros_plotly(min1, max1, min2, max2):
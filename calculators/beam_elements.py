@@ -0,0 +1,222 @@
+import numpy as np
+from calculators.linear_solvers import block_tridiagonal_solve
+
+
+def hermite_shape_functions(r, length, derivative=False):
+    '''
+    Cubic Hermite shape functions of a beam element at local positions r (0 to 1) for
+    the end DOFs (u1, theta1, u2, theta2). With derivative=True the slopes d/dx are returned.
+    Returns an array of shape r.shape + (4,).
+    '''
+    r = np.asarray(r, dtype=float)
+    length = np.asarray(length, dtype=float)
+    if derivative:
+        return np.stack([(-6 * r + 6 * r**2) / length, 1 - 4 * r + 3 * r**2, (6 * r - 6 * r**2) / length, -2 * r + 3 * r**2], axis=-1)
+    return np.stack([1 - 3 * r**2 + 2 * r**3, length * (r - 2 * r**2 + r**3), 3 * r**2 - 2 * r**3, length * (r**3 - r**2)], axis=-1)
+
+
+def distributed_load_pieces(amplitude, location, exponent, breakpoints):
+    '''
+    Distributed load q(t) = q0 + q1 * t on every interval, t measured from the interval's breakpoint.
+    Only P(x) terms with exponent 0 and 1 are distributed. The terms are sorted by location and summed
+    with cumulative sums, so the cost grows linearly with the number of terms and intervals.
+    Returns q0 and q1, one value per breakpoint.
+    '''
+    q = []
+    for n in (0, 1):
+        order = np.argsort(location[exponent == n])
+        term_location = location[exponent == n][order]
+        term_amplitude = amplitude[exponent == n][order]
+        active = np.searchsorted(term_location, breakpoints, side='right')
+        q.append((np.append(0.0, np.cumsum(term_amplitude))[active], np.append(0.0, np.cumsum(term_amplitude * term_location))[active]))
+    (constant, _), (slope, slope_location) = q
+    return constant + breakpoints * slope - slope_location, slope
+
+
+def integrated_pieces(amplitude, location, exponent, breakpoints, flexibility, anchors, theta_anchors, u_anchors):
+    '''
+    Builds the P, V, M, Theta and u polynomials of every interval from the solved P(x) terms
+    by integrating from one breakpoint to the next, instead of summing every term on every
+    interval like polynomial_pieces. The work grows linearly with the number of intervals and
+    only nearby terms meet in each sum, so long beams with many supports stay accurate.
+
+    Parameters
+    ----------
+    amplitude, location, exponent : ARRAY
+        SOLVED P(x) TERMS, LOADS AND REACTIONS.
+    breakpoints : ARRAY
+        SORTED INTERVAL START POSITIONS. EVERY TERM LOCATION AFTER THE FIRST ONE MUST BE A BREAKPOINT.
+    flexibility : FLOAT OR ARRAY
+        1 / (E * I), ONE VALUE FOR THE WHOLE BEAM OR ONE PER INTERVAL.
+    anchors : ARRAY
+        SORTED INDICES OF THE BREAKPOINTS WHERE THE ANGLE AND DEFLECTION ARE KNOWN. MUST START WITH 0.
+        EVERY INTERVAL INTEGRATES THETA AND u FROM THE LAST ANCHOR BEFORE IT, SO ERRORS DO NOT BUILD UP ALONG THE BEAM.
+    theta_anchors, u_anchors : ARRAY
+        ANGLE AND DEFLECTION AT EACH ANCHOR.
+
+    Returns
+    -------
+    coeffs : ARRAY
+        POLYNOMIAL COEFFICIENTS IN ASCENDING POWERS OF t, SHAPE (5, intervals, 6), SAME LAYOUT AS polynomial_pieces.
+
+    '''
+    q0, q1 = distributed_load_pieces(amplitude, location, exponent, breakpoints)
+    # point forces and moments jump V(x) and M(x) at their breakpoint
+    interval = np.maximum(np.searchsorted(breakpoints, location, side='right') - 1, 0)
+    force_jump = np.bincount(interval, np.where(exponent == -1, amplitude, 0.0), len(breakpoints))
+    moment_jump = np.bincount(interval, np.where(exponent == -2, amplitude, 0.0), len(breakpoints))
+
+    h = np.diff(breakpoints)
+    flexibility = np.broadcast_to(np.asarray(flexibility, dtype=float), breakpoints.shape)
+    span_flexibility = flexibility[:-1]
+
+    def starts(increments, restarts=None, values=0.0):
+        # value at the start of each interval: the increments over the earlier intervals added to the last restart value
+        totals = np.append(0.0, np.cumsum(increments))
+        if restarts is None:
+            return values + totals
+        last = restarts[np.searchsorted(restarts, np.arange(len(breakpoints)), side='right') - 1]
+        return np.asarray(values)[np.searchsorted(restarts, last)] + totals - totals[last]
+
+    v0 = np.cumsum(force_jump) + starts(q0[:-1] * h + q1[:-1] * h**2 / 2)
+    m0 = np.cumsum(moment_jump) + starts(v0[:-1] * h + q0[:-1] * h**2 / 2 + q1[:-1] * h**3 / 6)
+    theta0 = starts(span_flexibility * (m0[:-1] * h + v0[:-1] * h**2 / 2 + q0[:-1] * h**3 / 6 + q1[:-1] * h**4 / 24), anchors, theta_anchors)
+    u0 = starts(theta0[:-1] * h + span_flexibility * (m0[:-1] * h**2 / 2 + v0[:-1] * h**3 / 6 + q0[:-1] * h**4 / 24 + q1[:-1] * h**5 / 120), anchors, u_anchors)
+
+    coeffs = np.zeros((5, len(breakpoints), 6))
+    coeffs[0, :, :2] = np.stack([q0, q1], axis=-1)
+    coeffs[1, :, :3] = np.stack([v0, q0, q1 / 2], axis=-1)
+    coeffs[2, :, :4] = np.stack([m0, v0, q0 / 2, q1 / 6], axis=-1)
+    coeffs[3, :, :5] = np.stack([theta0, flexibility * m0, flexibility * v0 / 2, flexibility * q0 / 6, flexibility * q1 / 24], axis=-1)
+    coeffs[4] = np.stack([u0, theta0, flexibility * m0 / 2, flexibility * v0 / 6, flexibility * q0 / 24, flexibility * q1 / 120], axis=-1)
+    return coeffs
+
+
+def element_load_vectors(nodes, amplitude, location, exponent):
+    '''
+    Consistent nodal loads (u1, theta1, u2, theta2) of the Hermite elements between the nodes, from P(x) terms.
+    Point forces and couples go through the shape functions, every piece of distributed load is
+    integrated with 3 point Gauss (exact for these polynomials). Returns an (element, 4) array.
+    '''
+    lengths = np.diff(nodes)
+    num_elements = len(lengths)
+    element_loads = np.zeros((num_elements, 4))
+    for n, derivative in ((-1, False), (-2, True)):
+        point = exponent == n
+        element = np.clip(np.searchsorted(nodes, location[point], side='right') - 1, 0, num_elements - 1)
+        r = (location[point] - nodes[element]) / lengths[element]
+        sign = -1.0 if derivative else 1.0  # a couple does work through the slope, <x-a>^-2 is the derivative of <x-a>^-1
+        np.add.at(element_loads, element, sign * amplitude[point, np.newaxis] * hermite_shape_functions(r, lengths[element], derivative))
+    starts = np.unique(np.concatenate([nodes[:-1], location[(location > nodes[0]) & (location < nodes[-1])]]))
+    widths = np.diff(np.append(starts, nodes[-1]))
+    q0, q1 = distributed_load_pieces(amplitude, location, exponent, starts)
+    gauss_points, gauss_weights = np.polynomial.legendre.leggauss(3)
+    t = widths[:, np.newaxis] * (1 + gauss_points) / 2
+    element = np.clip(np.searchsorted(nodes, starts, side='right') - 1, 0, num_elements - 1)[:, np.newaxis]
+    r = (starts[:, np.newaxis] + t - nodes[element]) / lengths[element]
+    weight = (q0[:, np.newaxis] + q1[:, np.newaxis] * t) * widths[:, np.newaxis] * gauss_weights / 2
+    np.add.at(element_loads, element[:, 0], np.sum(weight[..., np.newaxis] * hermite_shape_functions(r, lengths[element]), axis=1))
+    return element_loads
+
+
+def element_stiffness_matrices(nodes, flexural_rigidity):
+    '''
+    Stiffness matrices of the prismatic Hermite elements between the nodes, for (u1, theta1, u2, theta2).
+    flexural_rigidity is one E * I for all elements or one per element. Returns an (element, 4, 4) array.
+    '''
+    # EI / h^3 * template, the angle rows and columns carry a factor h
+    template = np.array([[12, 6, -12, 6], [6, 4, -6, 2], [-12, -6, 12, -6], [6, 2, -6, 4]], dtype=float)
+    powers = np.array([0, 1, 0, 1])
+    h = np.diff(nodes)[:, np.newaxis, np.newaxis]
+    flexural_rigidity = np.broadcast_to(np.asarray(flexural_rigidity, dtype=float), h.shape[:1])[:, np.newaxis, np.newaxis]
+    return flexural_rigidity * template * h ** (powers[:, np.newaxis] + powers - 3)
+
+
+def assemble_element_blocks(element_matrices):
+    '''
+    Assembles (element, 4, 4) matrices of the elements between consecutive nodes into one
+    2 x 2 block per node. Returns the (node, 2, 2) lower, diagonal and upper blocks of the
+    block tridiagonal matrix, see block_tridiagonal_solve.
+    '''
+    num_nodes = len(element_matrices) + 1
+    diagonal = np.zeros((num_nodes, 2, 2))
+    diagonal[:-1] += element_matrices[:, :2, :2]
+    diagonal[1:] += element_matrices[:, 2:, 2:]
+    lower = np.zeros((num_nodes, 2, 2))
+    lower[1:] = element_matrices[:, 2:, :2]
+    upper = np.zeros((num_nodes, 2, 2))
+    upper[:-1] = element_matrices[:, :2, 2:]
+    return lower, diagonal, upper
+
+
+def free_dofs(nodes, fixtures):
+    '''(node, 2) array with 0 for the (u, theta) DOFs the fixtures hold and 1 for the rest.'''
+    free = np.ones((len(nodes), 2))
+    for fixture in fixtures:
+        node = np.searchsorted(nodes, fixture[1])
+        if fixture[0] == "Fixed":
+            free[node] = 0.0
+        elif fixture[0] == "Pinned/Roller":
+            free[node, 0] = 0.0
+    return free
+
+
+def hold_dofs(lower, diagonal, upper, free, held_value=1.0):
+    '''Clears the rows and columns of the held DOFs (free == 0) and puts held_value on their diagonal.'''
+    held_diagonal = diagonal * free[:, :, np.newaxis] * free[:, np.newaxis, :] + held_value * np.eye(2) * (1 - free)[:, np.newaxis, :]
+    held_lower = lower * free[:, :, np.newaxis] * np.roll(free, 1, axis=0)[:, np.newaxis, :]
+    held_upper = upper * free[:, :, np.newaxis] * np.roll(free, -1, axis=0)[:, np.newaxis, :]
+    return held_lower, held_diagonal, held_upper
+
+
+def solve_element_system(nodes, stiffness, element_loads, fixtures):
+    '''
+    Assembles the element matrices into one 2 x 2 block per node (block tridiagonal), holds the
+    supported DOFs at 0 and solves with block_tridiagonal_solve.
+    Returns the nodal (u, theta) and the reactions K d - F, both (node, 2) arrays.
+    '''
+    fixture_locations = [fixture[1] for fixture in fixtures if fixture[0] in ("Fixed", "Pinned/Roller")]
+    if len(np.unique(fixture_locations)) < len(fixture_locations):
+        raise np.linalg.LinAlgError("Singular matrix")  # two supports in one place, the split of the reaction is undefined
+    lower, diagonal, upper = assemble_element_blocks(stiffness)
+    nodal_loads = np.zeros((len(nodes), 2))
+    nodal_loads[:-1] += element_loads[:, :2]
+    nodal_loads[1:] += element_loads[:, 2:]
+
+    # supported DOFs are held at 0: clear their rows and columns and put 1 on the diagonal
+    free = free_dofs(nodes, fixtures)
+    displacements = block_tridiagonal_solve(*hold_dofs(lower, diagonal, upper, free), nodal_loads * free)
+
+    previous = np.roll(displacements, 1, axis=0)[:, :, np.newaxis]
+    following = np.roll(displacements, -1, axis=0)[:, :, np.newaxis]
+    reactions = (lower @ previous + diagonal @ displacements[:, :, np.newaxis] + upper @ following)[:, :, 0] - nodal_loads
+    return displacements, reactions
+
+
+def nodal_unknowns(unknowns, nodes, displacements, reactions, flexural_rigidity):
+    '''
+    Converts a nodal solution to the solns vector of BeamModel: a1 and a2 from the angle and deflection
+    at x = 0 (scaled by flexural_rigidity), then the reaction of every unknown.
+    '''
+    solns = np.zeros(len(unknowns))
+    solns[0] = flexural_rigidity * displacements[0, 1]  # Theta(0) = a1 / EI
+    solns[1] = flexural_rigidity * displacements[0, 0]  # u(0) = a2 / EI
+    for i, unknown in enumerate(unknowns[2:], start=2):
+        node = np.searchsorted(nodes, unknown[2])
+        if unknown[1] == "Force y":
+            solns[i] = reactions[node, 0]
+        elif unknown[1] == "Moment":
+            solns[i] = -reactions[node, 1]  # the P(x) moment term acts against the angle DOF, like applied couples
+    return solns
+
+
+def element_nodes(overall_length, key_points, num_elements):
+    '''
+    Nodes of a mesh with about num_elements elements of similar length and a node at every key point
+    (supports, loads, section ends) between 0 and overall_length.
+    '''
+    key_points = np.unique(np.concatenate([[0.0, overall_length], np.clip(key_points, 0.0, overall_length)]))
+    gaps = np.diff(key_points)
+    divisions = np.maximum(np.ceil(gaps / overall_length * num_elements), 1).astype(int)
+    step = np.arange(np.sum(divisions)) - np.repeat(np.cumsum(divisions) - divisions, divisions)
+    return np.append(np.repeat(key_points[:-1], divisions) + step * np.repeat(gaps / divisions, divisions), overall_length)
@@ -0,0 +1,117 @@
+from functools import lru_cache
+from calculators.unit_conversion import Q
+
+
+@lru_cache(maxsize=None)
+def unit_scale(from_unit, to_unit):
+    '''
+    Factor that converts a value in from_unit to to_unit (multiplicative units only).
+    Pint only runs the first time a pair of units is seen, after that it is a dictionary lookup.
+    '''
+    return float(Q(1.0, from_unit).to(to_unit).magnitude)
+
+
+def to_si(value, unit, si_unit, message):
+    '''value in unit converted to si_unit as a float, ValueError(message) if either is missing or invalid.'''
+    try:
+        return float(value) * unit_scale(unit, si_unit)
+    except Exception:
+        raise ValueError(message) from None
+
+
+def distributed_load_terms(start, end, start_value, end_value):
+    '''
+    A linearly varying distributed load as 'Constant Distributed Load' plus 'Linear Distributed Load'
+    rows (SI floats). The constant part is the start value and the linear part ramps from 0 at the
+    start to end_value - start_value at the end.
+    '''
+    if start_value == end_value:
+        return [['Constant Distributed Load', start, end, start_value]]
+    return [['Constant Distributed Load', start, end, start_value], ['Linear Distributed Load', start, end, end_value - start_value]]
+
+
+def normalize_beam_inputs(length, length_unit, moment_of_inertia, moment_of_inertia_unit, youngs_modulus, youngs_modulus_unit,
+                          fixture_rows, point_load_rows, distributed_load_rows, section_y=0.0, section_y_unit='m'):
+    '''
+    Converts a beam definition from the input fields to SI floats and checks it.
+
+    Every value is multiplied by a cached unit_scale factor and all checks (positions on the beam,
+    load end order, sign rules) run on plain floats, so pint is only used for unit strings it has
+    not seen before.
+
+    Parameters
+    ----------
+    length, moment_of_inertia, youngs_modulus : FLOAT
+        BEAM LENGTH, SECOND MOMENT OF AREA AND MODULUS OF ELASTICITY, EACH WITH ITS UNIT STRING.
+    fixture_rows : LIST
+        [fixture_type, position, position_unit] ROWS.
+    point_load_rows : LIST
+        [load_type, position, position_unit, value, value_unit, case] ROWS. load_type IS 'Concentrated Force'
+        OR 'Concentrated Moment', OTHER ROWS ARE SKIPPED.
+    distributed_load_rows : LIST
+        [start, end, position_unit, start_value, end_value, load_unit, case] ROWS.
+    section_y : FLOAT
+        DISTANCE FROM THE NEUTRAL AXIS TO THE EXTREME FIBER, WITH ITS UNIT STRING.
+
+    Returns
+    -------
+    beam : DICT
+        'overall_length' (m), 'moment_of_inertia' (m^4), 'youngs_modulus' (Pa), 'section_y' (m), 'fixtures' AND 'loads_moments'
+        IN THE solve_beam FORMAT (m, N, N/m, N*m) AND 'load_case_of', THE CASE OF EACH loads_moments ENTRY.
+        RAISES ValueError WITH A MESSAGE FOR THE USER IF AN INPUT IS MISSING OR OUT OF BOUNDS.
+
+    '''
+    setup_message = 'Error: Check Beam Setup Data.'
+    overall_length = to_si(length, length_unit, 'm', setup_message)
+    moment_of_inertia = to_si(moment_of_inertia, moment_of_inertia_unit, 'm**4', setup_message)
+    youngs_modulus = to_si(youngs_modulus, youngs_modulus_unit, 'Pa', setup_message)
+    section_y = to_si(section_y, section_y_unit, 'm', 'Error: Check Beam Section Data.')
+
+    fixtures = []
+    for fixture_type, position, position_unit in fixture_rows:
+        position = to_si(position, position_unit, 'm', 'Error: Check Beam Fixture Data.')
+        if position > overall_length:
+            raise ValueError('Fixture position not on beam. Did not solve beam.')
+        fixtures.append([fixture_type, position])
+
+    loads_moments = []
+    load_case_of = []
+    for start, end, position_unit, start_value, end_value, load_unit, case in distributed_load_rows:
+        message = 'Error: Check Beam Distributed Load Data.'
+        start = to_si(start, position_unit, 'm', message)
+        end = to_si(end, position_unit, 'm', message)
+        start_value = to_si(start_value, load_unit, 'N/m', message)
+        end_value = to_si(end_value, load_unit, 'N/m', message)
+        if start > overall_length:
+            raise ValueError('Start position not on beam. Did not solve beam.')
+        if end > overall_length:
+            raise ValueError('End position not on beam. Did not solve beam.')
+        if start > end:
+            raise ValueError('Distributed Load start position must come after end position. Did not solve beam.')
+        if (start_value < 0 and end_value > 0) or (end_value < 0 and start_value > 0):
+            raise ValueError('Distributed loads cannot have both positive and negative values. Split it into two loads. Did not solve beam.')
+        terms = distributed_load_terms(start, end, start_value, end_value)
+        loads_moments += terms
+        load_case_of += [case] * len(terms)
+
+    value_units = {'Concentrated Force': 'N', 'Concentrated Moment': 'N*m'}
+    for load_type, position, position_unit, value, value_unit, case in point_load_rows:
+        if load_type not in value_units:
+            continue
+        message = 'Error: Check Beam Point Load Data.'
+        position = to_si(position, position_unit, 'm', message)
+        value = to_si(value, value_unit, value_units[load_type], message)
+        if position > overall_length:
+            raise ValueError('Point load position not on beam. Did not solve beam.')
+        loads_moments.append([load_type, position, None, value])
+        load_case_of.append(case)
+
+    return {
+        'overall_length': overall_length,
+        'moment_of_inertia': moment_of_inertia,
+        'youngs_modulus': youngs_modulus,
+        'section_y': section_y,
+        'fixtures': fixtures,
+        'loads_moments': loads_moments,
+        'load_case_of': load_case_of,
+    }
@@ -0,0 +1,344 @@
+import numpy as np
+import plotly.graph_objects as go
+from calculators.unit_conversion import Q
+from calculators.beam_calculator import materials
+from calculators.linear_solvers import block_tridiagonal_solve
+
+member_types = ['Frame', 'Truss']
+support_types = ['Fixed', 'Pinned', 'Roller']
+frame_load_types = ['Nodal Load', 'Uniform Load']
+
+# DOFs each support holds, of (x, y, rotation); a roller rests on a horizontal surface
+support_dofs = {'Fixed': [0, 1, 2], 'Pinned': [0, 1], 'Roller': [1]}
+
+
+def member_properties(members, stress_scale, length_scale):
+    '''
+    Start node, end node, E, A and I in SI of every member, and whether it is a truss member.
+    E is a number in the stress unit or a name from materials.
+    '''
+    start = np.array([member[1] for member in members], dtype=int)
+    end = np.array([member[2] for member in members], dtype=int)
+    youngs_modulus = np.array([materials[member[3]].modulus.to('Pa').magnitude if isinstance(member[3], str) else member[3] * stress_scale
+                               for member in members], dtype=float)
+    area = np.array([member[4] for member in members], dtype=float) * length_scale**2
+    truss = np.array([member[0] == 'Truss' for member in members], dtype=bool)
+    moment_of_inertia = np.array([0.0 if member[0] == 'Truss' else member[5] for member in members], dtype=float) * length_scale**4
+    return start, end, youngs_modulus, area, moment_of_inertia, truss
+
+
+def member_geometry(coordinates, start, end):
+    '''Length and direction cosines (cos, sin) of every member.'''
+    delta = coordinates[end] - coordinates[start]
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    if np.any(length == 0):
+        raise ValueError(f"Member {int(np.argmax(length == 0))} has zero length.")
+    return length, delta[:, 0] / length, delta[:, 1] / length
+
+
+def local_stiffness_matrices(length, youngs_modulus, area, moment_of_inertia):
+    '''
+    Stiffness matrices of 2-D frame members in their local axes, for (u1, v1, theta1, u2, v2, theta2)
+    with u along the member. Truss members have I = 0 and only the axial terms. Returns an (member, 6, 6) array.
+    '''
+    axial = youngs_modulus * area / length
+    bending = youngs_modulus * moment_of_inertia / length**3
+    h = length
+    k = np.zeros((len(length), 6, 6))
+    k[:, 0, 0] = k[:, 3, 3] = axial
+    k[:, 0, 3] = k[:, 3, 0] = -axial
+    # the Hermite beam element of element_stiffness_matrices on (v1, theta1, v2, theta2)
+    bending_dofs = [1, 2, 4, 5]
+    template = np.array([[12, 6, -12, 6], [6, 4, -6, 2], [-12, -6, 12, -6], [6, 2, -6, 4]], dtype=float)
+    powers = np.array([0, 1, 0, 1])
+    k[:, np.array(bending_dofs)[:, np.newaxis], bending_dofs] = bending[:, np.newaxis, np.newaxis] * template * h[:, np.newaxis, np.newaxis] ** (powers[:, np.newaxis] + powers)
+    return k
+
+
+def rotation_matrices(cos, sin):
+    '''(member, 6, 6) matrices that turn global end displacements into local ones.'''
+    rotation = np.zeros((len(cos), 6, 6))
+    for offset in (0, 3):
+        rotation[:, offset, offset] = rotation[:, offset + 1, offset + 1] = cos
+        rotation[:, offset, offset + 1] = sin
+        rotation[:, offset + 1, offset] = -sin
+        rotation[:, offset + 2, offset + 2] = 1.0
+    return rotation
+
+
+def uniform_member_loads(loads, num_members, cos, sin, length, truss, force_scale, length_scale):
+    '''
+    Local (axial, transverse) per unit member length of the 'Uniform Load' rows, summed per member,
+    and their equivalent nodal loads in local axes (the negative of the fixed end reactions, without
+    the end moments on truss members), (member, 6).
+    '''
+    distributed = np.zeros((num_members, 2))
+    for load in loads:
+        if load[0] == 'Uniform Load':
+            distributed[int(load[1])] += [load[2], load[3]]
+    distributed *= force_scale / length_scale
+    axial = distributed[:, 0] * cos + distributed[:, 1] * sin
+    transverse = -distributed[:, 0] * sin + distributed[:, 1] * cos
+    end_moment = np.where(truss, 0.0, transverse * length**2 / 12)
+    equivalent = np.stack([axial * length / 2, transverse * length / 2, end_moment,
+                           axial * length / 2, transverse * length / 2, -end_moment], axis=1)
+    return np.stack([axial, transverse], axis=1), equivalent
+
+
+def reverse_cuthill_mckee(num_nodes, start, end):
+    '''
+    Node order that keeps connected nodes close together, so the stiffness matrix is banded.
+
+    Every connected part is ordered breadth first from a node far from the rest of it (the last
+    level of a breadth first search from its lowest degree node), visiting neighbours from the
+    lowest degree up, and the whole order is reversed. Returns the nodes in the new order.
+    '''
+    neighbour = np.concatenate([end, start])
+    owner = np.concatenate([start, end])
+    degree = np.bincount(owner, minlength=num_nodes)
+    order = np.lexsort((degree[neighbour], owner))  # neighbours of each node, lowest degree first
+    indices = neighbour[order].tolist()
+    indptr = np.concatenate([[0], np.cumsum(degree)]).tolist()
+    degree_list = degree.tolist()
+    visited = np.zeros(num_nodes, dtype=bool)
+
+    def breadth_first(root, mark):
+        seen = {root}
+        level, levels = [root], [root]
+        while level:
+            following = []
+            for node in level:
+                for other in indices[indptr[node]:indptr[node + 1]]:
+                    if other not in seen and not visited[other]:
+                        seen.add(other)
+                        following.append(other)
+            levels.extend(following)
+            if not following:
+                break
+            level = following
+        if mark:
+            visited[levels] = True
+        return levels, level
+
+    ordering = []
+    for root in np.argsort(degree, kind='stable').tolist():
+        if visited[root]:
+            continue
+        _, last_level = breadth_first(root, False)
+        far_node = min(last_level, key=degree_list.__getitem__)
+        ordering.extend(breadth_first(far_node, True)[0])
+    return np.array(ordering[::-1], dtype=int)
+
+
+def banded_blocks(rows, cols, values, size, block_size):
+    '''
+    Sums the COO entries of a matrix with |row - col| <= block_size into the (block, k, k)
+    lower, diagonal and upper blocks of block_tridiagonal_solve. Padding DOFs past size get 1
+    on the diagonal.
+    '''
+    num_blocks = -(-size // block_size)
+    block_row, block_col = rows // block_size, cols // block_size
+    kind = block_col - block_row + 1  # 0 lower, 1 diagonal, 2 upper
+    flat = ((kind * num_blocks + block_row) * block_size + rows % block_size) * block_size + cols % block_size
+    blocks = np.bincount(flat, values, 3 * num_blocks * block_size**2).reshape(3, num_blocks, block_size, block_size)
+    padding = np.arange(size, num_blocks * block_size)
+    blocks[1, padding // block_size, padding % block_size, padding % block_size] = 1.0
+    return blocks[0], blocks[1], blocks[2]
+
+
+def member_shapes(coordinates, start, end, length, cos, sin, local_displacements, distributed, flexural_rigidity, truss, num_points):
+    '''
+    Displaced x, y of num_points along every member, (member, point) arrays: linear axial
+    displacement, Hermite bending from the end displacements plus the fixed-fixed deflection
+    q s^2 (L - s)^2 / (24 E I) of a uniform transverse load.
+    '''
+    r = np.linspace(0.0, 1.0, num_points)
+    h = length[:, np.newaxis]
+    u1, v1, theta1, u2, v2, theta2 = (local_displacements[:, k, np.newaxis] for k in range(6))
+    axial = u1 * (1 - r) + u2 * r
+    transverse = (v1 * (1 - 3 * r**2 + 2 * r**3) + theta1 * h * (r - 2 * r**2 + r**3) + v2 * (3 * r**2 - 2 * r**3) + theta2 * h * (r**3 - r**2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        transverse += np.where(truss[:, np.newaxis], 0.0, distributed[:, 1, np.newaxis] * (h * r)**2 * (h * (1 - r))**2 / (24 * flexural_rigidity[:, np.newaxis]))
+    transverse = np.where(truss[:, np.newaxis], v1 * (1 - r) + v2 * r, transverse)
+    c, s = cos[:, np.newaxis], sin[:, np.newaxis]
+    x = coordinates[start, 0, np.newaxis] + (coordinates[end, 0] - coordinates[start, 0])[:, np.newaxis] * r + axial * c - transverse * s
+    y = coordinates[start, 1, np.newaxis] + (coordinates[end, 1] - coordinates[start, 1])[:, np.newaxis] * r + axial * s + transverse * c
+    return x, y
+
+
+def solve_frame(nodes, members, supports, loads, length_unit='m', force_unit='N', stress_unit='Pa', num_points=11):
+    '''
+    Linear static analysis of a 2-D frame or truss with the direct stiffness method.
+
+    Every member is a 2-D frame element (axial plus Hermite bending) or a truss element (axial only),
+    turned to global axes and scattered into a sparse (COO) global stiffness matrix in one set of NumPy
+    operations. The nodes are renumbered with reverse_cuthill_mckee so the matrix is banded, and the
+    band is solved as a block tridiagonal system with block_tridiagonal_solve, so the work grows with
+    the number of DOFs times the bandwidth squared instead of the cube of the number of DOFs. Units are
+    converted to SI once on the way in and back once on the way out.
+
+    Parameters
+    ----------
+    nodes : LIST
+        [x, y] OF EVERY NODE, y IS UP.
+    members : LIST
+        [member_type, start_node, end_node, youngs_modulus, area, moment_of_inertia] ROWS. member_type IS
+        'Frame' OR 'Truss' (PINNED ENDS, moment_of_inertia IS IGNORED). youngs_modulus IS A NUMBER OR A
+        NAME FROM materials.
+    supports : LIST
+        [support_type, node] ROWS. support_type IS 'Fixed', 'Pinned' OR 'Roller' (HOLDS y ONLY).
+    loads : LIST
+        ['Nodal Load', node, Fx, Fy, Mz] AND ['Uniform Load', member, qx, qy] ROWS. UNIFORM LOADS ARE
+        GLOBAL COMPONENTS PER UNIT MEMBER LENGTH. MOMENTS ARE COUNTERCLOCKWISE POSITIVE.
+    length_unit, force_unit, stress_unit : STR
+        UNITS OF THE INPUTS AND RESULTS. AREAS ARE IN length_unit^2 AND MOMENTS OF INERTIA IN length_unit^4.
+    num_points : INT
+        POINTS PER MEMBER OF THE DEFLECTED SHAPE.
+
+    Returns
+    -------
+    results : DICT
+        'displacements' AND 'reactions' (node, 3) ARRAYS OF x, y AND ROTATION (RADIANS) / MOMENT,
+        'member_forces' (member, 6) ARRAY OF THE END FORCES (N1, V1, M1, N2, V2, M2) THE NODES EXERT ON
+        EACH MEMBER IN ITS LOCAL AXES (x FROM START TO END), 'axial_force' (TENSION POSITIVE),
+        'deflected_x' AND 'deflected_y' (member, point) ARRAYS, 'max_displacement' AND ITS 'max_displacement_node',
+        AND THE GEOMETRY AND UNITS FOR generate_frame_plot.
+
+    '''
+    length_scale = Q(1, length_unit).to('m').magnitude
+    force_scale = Q(1, force_unit).to('N').magnitude
+    stress_scale = Q(1, stress_unit).to('Pa').magnitude
+    coordinates = np.asarray(nodes, dtype=float).reshape(-1, 2) * length_scale
+    num_nodes = len(coordinates)
+    num_dofs = 3 * num_nodes
+    start, end, youngs_modulus, area, moment_of_inertia, truss = member_properties(members, stress_scale, length_scale)
+    if np.any((start < 0) | (end < 0) | (start >= num_nodes) | (end >= num_nodes)):
+        raise ValueError("A member connects a node that does not exist.")
+    length, cos, sin = member_geometry(coordinates, start, end)
+
+    # element matrices in global axes, scattered into COO entries
+    rotation = rotation_matrices(cos, sin)
+    local_stiffness = local_stiffness_matrices(length, youngs_modulus, area, moment_of_inertia)
+    global_stiffness = np.swapaxes(rotation, 1, 2) @ local_stiffness @ rotation
+    dofs = (3 * np.stack([start, start, start, end, end, end], axis=1) + [0, 1, 2, 0, 1, 2])
+    rows = np.repeat(dofs, 6, axis=1).ravel()
+    cols = np.tile(dofs, 6).ravel()
+    values = global_stiffness.ravel()
+
+    # loads: nodal loads plus the equivalent nodal loads of the member loads
+    forces = np.zeros((num_nodes, 3))
+    for load in loads:
+        if load[0] == 'Nodal Load':
+            forces[int(load[1])] += [load[2] * force_scale, load[3] * force_scale, load[4] * force_scale * length_scale]
+    distributed, equivalent = uniform_member_loads(loads, len(start), cos, sin, length, truss, force_scale, length_scale)
+    forces = forces.ravel()
+    np.add.at(forces, dofs.ravel(), (np.swapaxes(rotation, 1, 2) @ equivalent[:, :, np.newaxis]).ravel())
+
+    # held DOFs: the supports, and the rotations of nodes no frame member turns
+    held = np.zeros(num_dofs, dtype=bool)
+    supported = np.zeros(num_dofs, dtype=bool)
+    for support in supports:
+        supported[3 * int(support[1]) + np.array(support_dofs[support[0]])] = True
+    turned = np.zeros(num_nodes, dtype=bool)
+    turned[start[~truss]] = turned[end[~truss]] = True
+    unturned = 3 * np.flatnonzero(~turned) + 2
+    if np.any(forces[unturned[~supported[unturned]]] != 0):
+        raise ValueError("A moment acts on a node without a frame member to carry it.")
+    held[supported] = True
+    held[unturned] = True
+
+    # renumber for a narrow band and solve the free DOFs, held ones get 1 on the diagonal and 0 load
+    position = np.empty(num_nodes, dtype=int)
+    position[reverse_cuthill_mckee(num_nodes, start, end)] = np.arange(num_nodes)
+    new_dof = (3 * position[:, np.newaxis] + [0, 1, 2]).ravel()
+    keep = ~held[rows] & ~held[cols]
+    held_dofs = np.flatnonzero(held)
+    solve_rows = np.concatenate([new_dof[rows[keep]], new_dof[held_dofs]])
+    solve_cols = np.concatenate([new_dof[cols[keep]], new_dof[held_dofs]])
+    solve_values = np.concatenate([values[keep], np.ones(len(held_dofs))])
+    block_size = max(int(np.max(np.abs(solve_rows - solve_cols), initial=0)), 1)
+    rhs = np.zeros(-(-num_dofs // block_size) * block_size)
+    rhs[new_dof] = np.where(held, 0.0, forces)
+    try:
+        solution = block_tridiagonal_solve(*banded_blocks(solve_rows, solve_cols, solve_values, num_dofs, block_size), rhs.reshape(-1, block_size))
+    except np.linalg.LinAlgError:
+        solution = np.full(rhs.shape, np.nan)
+    displacements = solution.ravel()[new_dof]
+
+    # a mechanism makes the matrix singular: the solve fails, or ||K|| ||d|| / ||F|| (a lower bound of
+    # its condition number) is beyond what double precision can resolve
+    stiffness_product = np.bincount(rows, values * displacements[cols], num_dofs)
+    magnitude = np.bincount(rows, np.abs(values * displacements[cols]), num_dofs)
+    residual = np.where(held, 0.0, stiffness_product - forces)
+    largest_force = np.max(np.abs(forces), initial=0.0)
+    stiffness_norm = np.max(np.bincount(rows, np.abs(values), num_dofs), initial=0.0)
+    if (not np.all(np.isfinite(displacements))
+            or stiffness_norm * np.max(np.abs(displacements), initial=0.0) > 1e14 * largest_force
+            or np.max(np.abs(residual) - 1e-8 * (magnitude + np.abs(forces)), initial=0.0) > 0):
+        raise ValueError("The frame is unstable (a mechanism): add supports, frame members or bracing.")
+    reactions = np.where(supported, stiffness_product - forces, 0.0).reshape(num_nodes, 3)
+    displacements = displacements.reshape(num_nodes, 3)
+
+    # member end forces in local axes
+    local_displacements = (rotation @ displacements[np.stack([start, end], axis=1)].reshape(-1, 6, 1))[:, :, 0]
+    member_forces = (local_stiffness @ local_displacements[:, :, np.newaxis])[:, :, 0] - equivalent
+    deflected_x, deflected_y = member_shapes(coordinates, start, end, length, cos, sin, local_displacements, distributed,
+                                             youngs_modulus * moment_of_inertia, truss, num_points)
+
+    moment_scale = force_scale * length_scale
+    result_scale = np.array([length_scale, length_scale, 1.0])
+    displacements = displacements / result_scale
+    translation = np.hypot(displacements[:, 0], displacements[:, 1])
+    return {
+        'displacements': displacements,
+        'reactions': reactions / np.array([force_scale, force_scale, moment_scale]),
+        'member_forces': member_forces / np.array([force_scale, force_scale, moment_scale] * 2),
+        'axial_force': member_forces[:, 3] / force_scale,
+        'deflected_x': deflected_x / length_scale,
+        'deflected_y': deflected_y / length_scale,
+        'max_displacement': float(translation.max(initial=0.0)),
+        'max_displacement_node': int(np.argmax(translation)) if num_nodes else None,
+        'nodes': coordinates / length_scale,
+        'start': start,
+        'end': end,
+        'supports': [list(support) for support in supports],
+        'bandwidth': block_size,
+        'length_unit': length_unit,
+        'force_unit': force_unit,
+    }
+
+
+def generate_frame_plot(results, scale=None):
+    '''
+    Plots the frame and its deflected shape, the displacements magnified by scale
+    (by default so the largest one is a tenth of the frame size). All members go in
+    one trace each, with None between members.
+    '''
+    nodes = results['nodes']
+    start, end = results['start'], results['end']
+    if scale is None:
+        size = np.ptp(nodes, axis=0).max() if len(nodes) else 0.0
+        scale = 0.1 * size / results['max_displacement'] if results['max_displacement'] > 0 else 1.0
+    gap = np.full((len(start), 1), np.nan)
+    undeformed_x = np.hstack([nodes[start, 0:1], nodes[end, 0:1], gap]).ravel()
+    undeformed_y = np.hstack([nodes[start, 1:2], nodes[end, 1:2], gap]).ravel()
+    r = np.linspace(0.0, 1.0, results['deflected_x'].shape[1])
+    line_x = nodes[start, 0:1] + (nodes[end, 0] - nodes[start, 0])[:, np.newaxis] * r
+    line_y = nodes[start, 1:2] + (nodes[end, 1] - nodes[start, 1])[:, np.newaxis] * r
+    deflected_x = np.hstack([line_x + scale * (results['deflected_x'] - line_x), gap]).ravel()
+    deflected_y = np.hstack([line_y + scale * (results['deflected_y'] - line_y), gap]).ravel()
+    support_nodes = [int(support[1]) for support in results['supports']]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=undeformed_x, y=undeformed_y, mode='lines', name='Frame', line=dict(color='gray', width=2)))
+    fig.add_trace(go.Scatter(x=deflected_x, y=deflected_y, mode='lines', name=f'Deflected (x{scale:.3g})', line=dict(color='purple', width=2)))
+    fig.add_trace(go.Scatter(x=nodes[support_nodes, 0], y=nodes[support_nodes, 1], mode='markers', name='Supports',
+                             text=[support[0] for support in results['supports']], marker=dict(symbol='triangle-up', size=12, color='black')))
+    fig.update_layout(
+        title=f"Deflected Shape (displacements x{scale:.3g}, max {results['max_displacement']:.4g} {results['length_unit']})",
+        xaxis_title=f"x ({results['length_unit']})",
+        yaxis_title=f"y ({results['length_unit']})",
+        yaxis=dict(scaleanchor='x', scaleratio=1),
+        height=600,
+    )
+    return fig
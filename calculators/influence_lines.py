@@ -0,0 +1,119 @@
+import numpy as np
+from calculators.beam_calculator import BeamModel, beam_sample_points, evaluate_term_batch
+
+
+def unit_load_responses(supports, load_positions, stations, left_limit=None):
+    '''
+    Responses of a BeamSupports to a Concentrated Force of 1 placed at each load position.
+    Returns the unknowns as a (position, unknown) array and the diagrams at the stations
+    as a (position, diagram, station) array.
+    '''
+    load_positions = np.asarray(load_positions, dtype=float)
+    amplitude, location, exponent = supports.load_terms([["Concentrated Force", 0.0, 0.0, 1.0]])
+    shape = (len(load_positions),) + amplitude.shape
+    # every term of a point load sits at the load position, so moving the load only moves the terms
+    load_terms = [np.broadcast_to(amplitude, shape), location + load_positions[:, np.newaxis, np.newaxis], np.broadcast_to(exponent, shape)]
+    solns = supports.solve_terms(load_terms)
+    diagrams = evaluate_term_batch(*load_terms, stations, left_limit)
+    diagrams += np.einsum('ku,uds->kds', solns, supports.unit_diagrams(stations, left_limit))
+    return solns, diagrams
+
+
+def influence_lines(supports, load_positions, stations, result_length_unit='m', result_force_unit='N'):
+    '''
+    Influence lines of a BeamSupports: how each reaction, and the shear, moment, angle and
+    deflection at each station, change as a Concentrated Force of 1 moves across the load positions.
+    Reactions are the unknown rows with their line appended, diagrams are (station, position) arrays.
+    '''
+    stations = np.asarray(stations, dtype=float)
+    solns, diagrams = unit_load_responses(supports, load_positions, stations)
+    return {
+        'fixtures': supports.fixtures,
+        'load_positions': np.asarray(load_positions, dtype=float),
+        'stations': stations,
+        'reactions': [unknown + [solns[:, i]] for i, unknown in enumerate(supports.unknowns)],
+        'shear': diagrams[:, 1].T,
+        'moment': diagrams[:, 2].T,
+        'angle': diagrams[:, 3].T,
+        'deflection': diagrams[:, 4].T,
+        'length_unit': result_length_unit,
+        'force_unit': result_force_unit,
+    }
+
+
+def moving_load(supports, axle_loads, axle_offsets, lead_positions, stations=None, num_points=100, result_length_unit='m', result_force_unit='N', max_chunk_size=2**22):
+    '''
+    Envelopes of a load train (axles with fixed spacing) travelling along the beam.
+
+    The unit load responses are linear, so the response to the train at one lead position
+    is the sum of the unit responses at each axle position weighted by the axle loads.
+    Axles that are off the beam carry nothing.
+
+    Parameters
+    ----------
+    supports : BeamSupports
+        THE BEAM, FACTORIZED ONCE FOR EVERY AXLE POSITION.
+    axle_loads : ARRAY
+        FORCE OF EACH AXLE, SAME SIGN CONVENTION AS A CONCENTRATED FORCE.
+    axle_offsets : ARRAY
+        DISTANCE OF EACH AXLE BEHIND THE LEAD AXLE.
+    lead_positions : ARRAY
+        POSITIONS OF THE LEAD AXLE TO CHECK.
+    stations : ARRAY
+        POSITIONS WHERE THE DIAGRAMS ARE ENVELOPED. DEFAULTS TO num_points + 1 EVEN STATIONS.
+    max_chunk_size : INT
+        MAXIMUM NUMBER OF (POSITION, DIAGRAM, STATION) VALUES HELD AT ONCE.
+
+    Returns
+    -------
+    envelope : DICT
+        MAX AND MIN OF EACH DIAGRAM PER STATION WITH THE LEAD POSITION THAT CAUSES IT,
+        AND THE SAME FOR EACH REACTION (APPENDED TO THE UNKNOWN ROWS AS max, max_lead, min, min_lead).
+
+    '''
+    axle_loads = np.asarray(axle_loads, dtype=float)
+    axle_offsets = np.asarray(axle_offsets, dtype=float)
+    lead_positions = np.asarray(lead_positions, dtype=float)
+    if stations is None:
+        stations, left_limit = beam_sample_points(supports.overall_length, num_points)
+    else:
+        stations, left_limit = np.asarray(stations, dtype=float), None
+
+    num_diagrams = len(BeamModel.selections)
+    step = max(1, max_chunk_size // (len(axle_loads) * num_diagrams * len(stations)))
+    reactions = np.empty((len(lead_positions), len(supports.unknowns)))
+    max_values = np.full((num_diagrams, len(stations)), -np.inf)
+    min_values = np.full((num_diagrams, len(stations)), np.inf)
+    max_leads = np.zeros((num_diagrams, len(stations)))
+    min_leads = np.zeros((num_diagrams, len(stations)))
+    for first in range(0, len(lead_positions), step):
+        leads = lead_positions[first:first + step]
+        positions = leads[:, np.newaxis] - axle_offsets
+        weights = np.where((positions >= 0) & (positions <= supports.overall_length), axle_loads, 0.0)
+        solns, diagrams = unit_load_responses(supports, positions.ravel(), stations, left_limit)
+        reactions[first:first + step] = np.einsum('pa,pau->pu', weights, solns.reshape(positions.shape + solns.shape[1:]))
+        responses = np.einsum('pa,pads->pds', weights, diagrams.reshape(positions.shape + diagrams.shape[1:]))
+        chunk_max, chunk_min = np.max(responses, axis=0), np.min(responses, axis=0)
+        max_leads = np.where(chunk_max > max_values, leads[np.argmax(responses, axis=0)], max_leads)
+        min_leads = np.where(chunk_min < min_values, leads[np.argmin(responses, axis=0)], min_leads)
+        max_values = np.maximum(max_values, chunk_max)
+        min_values = np.minimum(min_values, chunk_min)
+
+    envelope = {
+        'fixtures': supports.fixtures,
+        'axle_loads': axle_loads,
+        'axle_offsets': axle_offsets,
+        'lead_positions': lead_positions,
+        'stations': stations,
+        'reactions': [unknown + [reactions[:, i].max(), lead_positions[np.argmax(reactions[:, i])],
+                                 reactions[:, i].min(), lead_positions[np.argmin(reactions[:, i])]]
+                      for i, unknown in enumerate(supports.unknowns)],
+        'length_unit': result_length_unit,
+        'force_unit': result_force_unit,
+    }
+    for i, name in enumerate(['shear', 'moment', 'angle', 'deflection'], start=1):
+        envelope['max_' + name] = max_values[i]
+        envelope['max_' + name + '_lead'] = max_leads[i]
+        envelope['min_' + name] = min_values[i]
+        envelope['min_' + name + '_lead'] = min_leads[i]
+    return envelope
@@ -0,0 +1,117 @@
+import numpy as np
+
+
+def lu_factor(a):
+    '''
+    LU factorization with partial pivoting of a square matrix.
+
+    Parameters
+    ----------
+    a : ARRAY
+        SQUARE MATRIX.
+
+    Returns
+    -------
+    lu : ARRAY
+        L (UNIT DIAGONAL, BELOW THE DIAGONAL) AND U (ON AND ABOVE THE DIAGONAL) IN ONE MATRIX.
+    piv : ARRAY
+        ROW PERMUTATION. ROW i OF THE FACTORIZED MATRIX IS ROW piv[i] OF a.
+
+    '''
+    lu = np.array(a, dtype=float)
+    n = lu.shape[0]
+    piv = np.arange(n)
+    for k in range(n):
+        pivot_row = k + np.argmax(np.abs(lu[k:, k]))
+        if lu[pivot_row, k] == 0:
+            raise np.linalg.LinAlgError("Singular matrix")
+        if pivot_row != k:
+            lu[[k, pivot_row]] = lu[[pivot_row, k]]
+            piv[[k, pivot_row]] = piv[[pivot_row, k]]
+        lu[k + 1:, k] /= lu[k, k]
+        lu[k + 1:, k + 1:] -= np.outer(lu[k + 1:, k], lu[k, k + 1:])
+    return lu, piv
+
+
+def lu_solve(lu, piv, b):
+    '''
+    Solves a x = b with the factorization from lu_factor.
+    b can be a vector or a matrix with one right hand side per column.
+    '''
+    x = np.array(b, dtype=float)[piv]
+    n = lu.shape[0]
+    for k in range(n):  # forward substitution with unit diagonal L
+        x[k + 1:] -= np.multiply.outer(lu[k + 1:, k], x[k])
+    for k in range(n - 1, -1, -1):  # back substitution with U
+        x[k] /= lu[k, k]
+        x[:k] -= np.multiply.outer(lu[:k, k], x[k])
+    return x
+
+
+def block_tridiagonal_solve(lower, diagonal, upper, rhs):
+    '''
+    Solves a block tridiagonal system by cyclic (odd-even) reduction.
+
+    Row i of the system is lower[i] x[i-1] + diagonal[i] x[i] + upper[i] x[i+1] = rhs[i].
+    Each level eliminates the odd rows from their even neighbours with batched k x k
+    inverses, which halves the system, so the work grows linearly with the number of
+    blocks and only log2(blocks) levels run in Python. The diagonal blocks (and the
+    reduced ones) must stay invertible, which holds for symmetric positive definite systems.
+
+    Parameters
+    ----------
+    lower, diagonal, upper : ARRAY
+        BLOCKS OF SHAPE (blocks, k, k). lower[0] AND upper[-1] ARE IGNORED.
+    rhs : ARRAY
+        RIGHT HAND SIDE OF SHAPE (blocks, k) OR (blocks, k, right hand sides).
+
+    Returns
+    -------
+    x : ARRAY
+        SOLUTION WITH THE SHAPE OF rhs.
+
+    '''
+    lower = np.array(lower, dtype=float)
+    diagonal = np.asarray(diagonal, dtype=float)
+    upper = np.array(upper, dtype=float)
+    rhs = np.asarray(rhs, dtype=float)
+    vector = rhs.ndim == 2
+    if vector:
+        rhs = rhs[:, :, np.newaxis]
+    lower[0] = 0.0
+    upper[-1] = 0.0
+    x = _cyclic_reduction(lower, diagonal, upper, rhs)
+    return x[:, :, 0] if vector else x
+
+
+def _cyclic_reduction(lower, diagonal, upper, rhs):
+    num_blocks, k = diagonal.shape[:2]
+    if num_blocks == 1:
+        return np.linalg.solve(diagonal[0], rhs[0])[np.newaxis]
+    num_even = (num_blocks + 1) // 2
+    num_odd = num_blocks // 2
+    odd_inverse = np.linalg.inv(diagonal[1::2])
+
+    # odd neighbours of every even row: row 2j has 2j-1 on its left (odd j-1) and 2j+1 on its right (odd j)
+    def neighbours(blocks, side):
+        out = np.zeros((num_even,) + blocks.shape[1:])
+        if side == 'left':
+            out[1:] = blocks[:num_even - 1]
+        else:
+            out[:num_odd] = blocks
+        return out
+
+    left_factor = lower[0::2] @ neighbours(odd_inverse, 'left')
+    right_factor = upper[0::2] @ neighbours(odd_inverse, 'right')
+    reduced_lower = -left_factor @ neighbours(lower[1::2], 'left')
+    reduced_diagonal = diagonal[0::2] - left_factor @ neighbours(upper[1::2], 'left') - right_factor @ neighbours(lower[1::2], 'right')
+    reduced_upper = -right_factor @ neighbours(upper[1::2], 'right')
+    reduced_rhs = rhs[0::2] - left_factor @ neighbours(rhs[1::2], 'left') - right_factor @ neighbours(rhs[1::2], 'right')
+
+    x = np.empty(rhs.shape)
+    x[0::2] = _cyclic_reduction(reduced_lower, reduced_diagonal, reduced_upper, reduced_rhs)
+    # back substitute the odd rows from their even neighbours
+    even_right = np.zeros((num_odd,) + rhs.shape[1:])
+    even_right[:num_even - 1] = x[2::2]
+    x[1::2] = odd_inverse @ (rhs[1::2] - lower[1::2] @ x[0:2 * num_odd:2] - upper[1::2] @ even_right)
+    return x
@@ -0,0 +1,163 @@
+import re
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from calculators.beam_calculator import beam_sample_points, stack_term_batch, diagram_breakpoints, polynomial_pieces, evaluate_pieces, piecewise_extrema
+
+# basic load cases: dead, live, roof live, snow, wind, earthquake
+load_case_names = ['D', 'L', 'Lr', 'S', 'W', 'E']
+# the basic strength (LRFD) combinations, see parse_combination
+default_combinations = ['1.4D', '1.2D + 1.6L + 0.5Lr', '1.2D + 1.6L + 0.5S', '1.2D + 1.6Lr + L', '1.2D + 1.6S + L',
+                        '1.2D + 1.6S + 0.5W', '1.2D + W + L + 0.5S', '1.2D + E + L + 0.2S', '0.9D + W', '0.9D + E']
+
+
+def parse_combination(text):
+    '''
+    Factors of a load combination written like '1.2D + 1.6L + 0.5S' (or '1.2*D', '0.9D - W').
+    Returns a dict of case name -> factor, repeated cases are added up.
+    '''
+    factors = {}
+    terms = re.findall(r'\s*([+-]?)\s*(\d*\.?\d*(?:[eE][+-]?\d+)?)\s*\*?\s*([A-Za-z]\w*)\s*', text)
+    if not terms or ''.join(''.join(term) for term in terms) != re.sub(r'[\s*]', '', text):
+        raise ValueError(f"Could not read the load combination '{text}'.")
+    for sign, factor, case in terms:
+        factors[case] = factors.get(case, 0.0) + (-1.0 if sign == '-' else 1.0) * (float(factor) if factor else 1.0)
+    return factors
+
+
+def load_combinations(supports, load_cases, combinations, stations=None, num_points=100, result_length_unit='m', result_force_unit='N'):
+    '''
+    Envelopes of factored load combinations.
+
+    Every basic load case is solved once. The diagrams are linear in the loads, so the diagrams
+    of all combinations are one matrix product of the (combination, case) factors with the
+    stacked case diagrams, both at the stations and for the piecewise polynomials, which give
+    the exact peak of every combination with piecewise_extrema.
+
+    Parameters
+    ----------
+    supports : BeamSupports
+        THE BEAM, FACTORIZED ONCE FOR EVERY LOAD CASE.
+    load_cases : DICT
+        CASE NAME -> loads_moments LIST OF THE BASIC LOAD CASE.
+    combinations : DICT
+        COMBINATION NAME -> DICT OF CASE NAME -> FACTOR (SEE parse_combination).
+    stations : ARRAY
+        POSITIONS WHERE THE DIAGRAMS ARE ENVELOPED. DEFAULTS TO num_points + 1 EVEN STATIONS.
+
+    Returns
+    -------
+    envelope : DICT
+        MAX AND MIN OF EACH DIAGRAM PER STATION WITH THE NAME OF THE GOVERNING COMBINATION,
+        THE SAME FOR EACH REACTION (APPENDED TO THE UNKNOWN ROWS AS max, max_combination, min,
+        min_combination) AND 'peaks', ONE ROW PER DIAGRAM WITH THE EXACT LARGEST AND SMALLEST
+        VALUE OF ANY COMBINATION, ITS POSITION AND ITS COMBINATION.
+
+    '''
+    case_names = list(load_cases)
+    combination_names = list(combinations)
+    factors = np.zeros((len(combination_names), len(case_names)))
+    for k, name in enumerate(combination_names):
+        for case, factor in combinations[name].items():
+            if case not in load_cases:
+                raise ValueError(f"Combination '{name}' uses the load case '{case}', which is not defined.")
+            factors[k, case_names.index(case)] += factor
+    if stations is None:
+        stations, left_limit = beam_sample_points(supports.overall_length, num_points)
+    else:
+        stations, left_limit = np.asarray(stations, dtype=float), None
+
+    # every case's terms (loads plus solved unknowns) as pieces on shared breakpoints
+    load_terms = stack_term_batch([supports.load_terms(load_cases[name]) for name in case_names])
+    solns = supports.solve_terms(load_terms)
+    unknown_amplitude, unknown_location, unknown_exponent = supports.model.solved_arrays(solns)
+    shape = unknown_amplitude.shape
+    amplitude = np.concatenate([load_terms[0], unknown_amplitude], axis=-1)
+    location = np.concatenate([load_terms[1], np.broadcast_to(unknown_location, shape)], axis=-1)
+    exponent = np.concatenate([load_terms[2], np.broadcast_to(unknown_exponent, shape)], axis=-1)
+    breakpoints = diagram_breakpoints(location[amplitude != 0], exponent[amplitude != 0], 0.0)
+    coeffs = polynomial_pieces(amplitude, location, exponent, breakpoints)
+    num_diagrams = coeffs.shape[1]
+    case_diagrams = evaluate_pieces(breakpoints, coeffs.reshape((-1,) + coeffs.shape[2:]), stations, left_limit)
+
+    # combinations are matrix products over the case axis
+    diagrams = (factors @ case_diagrams.reshape(len(case_names), -1)).reshape(len(combination_names), num_diagrams, len(stations))
+    reactions = factors @ solns
+    # exact peaks, only for the combinations that can hold one. Between samples (the stations and both
+    # sides of every breakpoint) a diagram is smooth and an inner peak has zero slope, so it beats the
+    # nearest sample by at most gap^2 / 8 * max|f''|, and max|f''| of a combination is at most
+    # |factors| times that of the cases
+    inner = breakpoints[(breakpoints > 0) & (breakpoints < supports.overall_length)]
+    sample_x = np.concatenate([[0.0, supports.overall_length], inner, inner])
+    sample_left = np.concatenate([[False, True], np.ones(len(inner), dtype=bool), np.zeros(len(inner), dtype=bool)])
+    samples = factors @ evaluate_pieces(breakpoints, coeffs.reshape((-1,) + coeffs.shape[2:]), sample_x, sample_left).reshape(len(case_names), -1)
+    samples = np.concatenate([diagrams, samples.reshape(len(combination_names), num_diagrams, -1)], axis=-1)
+    gap = np.max(np.diff(np.unique(np.clip(np.concatenate([stations, sample_x]), 0.0, supports.overall_length))), initial=0.0)
+    width = np.clip(np.append(breakpoints[1:], supports.overall_length), None, supports.overall_length) - breakpoints
+    power = np.arange(2, coeffs.shape[-1])
+    curvature = np.max(np.sum(np.abs(coeffs[..., 2:]) * power * (power - 1) * np.clip(width, 0.0, None)[:, np.newaxis] ** (power - 2), axis=-1), axis=-1)
+    slack = gap**2 / 8 * (np.abs(factors) @ curvature)
+    sample_max, sample_min = samples.max(axis=-1), samples.min(axis=-1)
+    can_peak = (sample_max + slack >= sample_max.max(axis=0)) | (sample_min - slack <= sample_min.min(axis=0))
+    candidates = np.flatnonzero(np.any(can_peak[:, 1:], axis=1))
+    combined = (factors[candidates] @ coeffs.reshape(len(case_names), -1)).reshape((len(candidates),) + coeffs.shape[1:])
+    max_peaks, max_peak_positions, min_peaks, min_peak_positions = piecewise_extrema(breakpoints, combined, supports.overall_length)
+    names = np.array(combination_names, dtype=object)
+
+    envelope = {
+        'fixtures': supports.fixtures,
+        'load_cases': case_names,
+        'combinations': combination_names,
+        'stations': stations,
+        'reactions': [unknown + [reactions[:, i].max(), names[np.argmax(reactions[:, i])],
+                                 reactions[:, i].min(), names[np.argmin(reactions[:, i])]]
+                      for i, unknown in enumerate(supports.unknowns)],
+        'peaks': [],
+        'length_unit': result_length_unit,
+        'force_unit': result_force_unit,
+    }
+    for i, name in enumerate(['shear', 'moment', 'angle', 'deflection'], start=1):
+        envelope['max_' + name] = diagrams[:, i].max(axis=0)
+        envelope['max_' + name + '_combination'] = names[np.argmax(diagrams[:, i], axis=0)]
+        envelope['min_' + name] = diagrams[:, i].min(axis=0)
+        envelope['min_' + name + '_combination'] = names[np.argmin(diagrams[:, i], axis=0)]
+        governing_max, governing_min = np.argmax(max_peaks[:, i]), np.argmin(min_peaks[:, i])
+        envelope['peaks'].append({
+            'diagram': name,
+            'max': max_peaks[governing_max, i],
+            'max_pos': max_peak_positions[governing_max, i],
+            'max_combination': names[candidates[governing_max]],
+            'min': min_peaks[governing_min, i],
+            'min_pos': min_peak_positions[governing_min, i],
+            'min_combination': names[candidates[governing_min]],
+        })
+    return envelope
+
+
+def generate_envelope_plot(envelope):
+    """
+    Plots the max and min envelopes of shear, moment and deflection from load_combinations,
+    hovering shows the governing combination at each station.
+    """
+    length_unit, force_unit = envelope['length_unit'], envelope['force_unit']
+    diagrams = [('shear', f"Shear Force ({force_unit})", 'blue'),
+                ('moment', f"Bending Moment ({force_unit}*{length_unit})", 'green'),
+                ('deflection', f"Deflection ({length_unit})", 'purple')]
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, subplot_titles=[title for _, title, _ in diagrams], vertical_spacing=0.08)
+    for row, (name, title, color) in enumerate(diagrams, start=1):
+        for side, dash in (('max', 'solid'), ('min', 'dash')):
+            fig.add_trace(go.Scatter(
+                x=envelope['stations'], y=envelope[f'{side}_{name}'],
+                customdata=envelope[f'{side}_{name}_combination'],
+                hovertemplate='%{y:.4g}<br>%{customdata}',
+                mode='lines', line=dict(color=color, width=2, dash=dash),
+                name=f"{side.capitalize()} {title}", showlegend=False,
+            ), row=row, col=1)
+        fig.add_trace(go.Scatter(x=[envelope['stations'][0], envelope['stations'][-1]], y=[0, 0], mode='lines',
+                                 line=dict(color='black', width=5), hoverinfo='none', showlegend=False), row=row, col=1)
+        fig.add_trace(go.Scatter(x=[fixture[1] for fixture in envelope['fixtures']], y=[0] * len(envelope['fixtures']), mode='markers',
+                                 marker=dict(symbol=['square' if fixture[0] == 'Fixed' else 'arrow-up' for fixture in envelope['fixtures']], size=15, color='black'),
+                                 hovertext=[fixture[0] for fixture in envelope['fixtures']], hoverinfo='text', showlegend=False), row=row, col=1)
+    fig.update_layout(title_text="Load Combination Envelopes", height=850)
+    fig.update_xaxes(title_text=f"Distance Along Beam ({length_unit})", row=3, col=1)
+    return fig
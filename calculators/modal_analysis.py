@@ -0,0 +1,227 @@
+import numpy as np
+import plotly.graph_objects as go
+from calculators.beam_elements import element_nodes, assemble_element_blocks, free_dofs, hold_dofs
+
+
+def element_mass_matrices(nodes, mass_per_length):
+    '''
+    Consistent mass matrices of the Hermite elements between the nodes, for (u1, theta1, u2, theta2).
+    mass_per_length is one value for all elements or one per element. Returns an (element, 4, 4) array.
+    '''
+    # m h / 420 * template, the angle rows and columns carry a factor h
+    template = np.array([[156, 22, 54, -13], [22, 4, 13, -3], [54, 13, 156, -22], [-13, -3, -22, 4]], dtype=float) / 420
+    powers = np.array([0, 1, 0, 1])
+    h = np.diff(nodes)[:, np.newaxis, np.newaxis]
+    mass_per_length = np.broadcast_to(np.asarray(mass_per_length, dtype=float), h.shape[:1])[:, np.newaxis, np.newaxis]
+    return mass_per_length * template * h ** (powers[:, np.newaxis] + powers + 1)
+
+
+def block_product(lower, diagonal, upper, x):
+    '''Block tridiagonal matrix (node, 2, 2) blocks times x of shape (node, 2, columns).'''
+    y = diagonal @ x
+    y[1:] += lower[1:] @ x[:-1]
+    y[:-1] += upper[:-1] @ x[1:]
+    return y
+
+
+def nodal_deflections(nodes, forces, moments, flexural_rigidity):
+    '''
+    Exact nodal u and theta (node, columns) of a beam with theta(0) = u(0) = 0 under forces and
+    moments at the nodes (the loads conjugate to u and theta, moments counterclockwise), plus
+    V and M just right of the last node. M(x) is linear on each element, so Theta(x) and u(x)
+    are integrated exactly with cumulative sums.
+    '''
+    h = np.diff(nodes)[:, np.newaxis]
+    shear = np.cumsum(forces, axis=0)  # just right of each node
+    moment_left = np.zeros(forces.shape)  # just left of each node
+    moment_left[1:] = np.cumsum(shear[:-1] * h - moments[:-1], axis=0)
+    moment_right = moment_left - moments
+    theta = np.zeros(forces.shape)
+    theta[1:] = np.cumsum((moment_right[:-1] + moment_left[1:]) * h / 2, axis=0)
+    u = np.zeros(forces.shape)
+    u[1:] = np.cumsum(theta[:-1] * h + (2 * moment_right[:-1] + moment_left[1:]) * h**2 / 6, axis=0)
+    return u / flexural_rigidity, theta / flexural_rigidity, shear[-1], moment_right[-1]
+
+
+def flexibility_solver(nodes, fixtures, flexural_rigidity):
+    '''
+    Returns a function that solves K d = f for the held Hermite mesh without assembling K.
+
+    Hermite elements are exact at the nodes for nodal loads, so K^-1 f is the exact deflection of
+    the beam under the nodal loads f. It is found like solve_beam does: nodal_deflections of the
+    loads, plus a1, a2 and the support reactions from a small system that holds the supports and
+    leaves both ends free of shear and moment. The cost is linear in the number of nodes, and
+    unlike a factorization of K (whose condition number grows with the fourth power of the
+    number of elements) it stays accurate on fine meshes. The function takes and returns
+    (node, 2, columns) arrays.
+    '''
+    num_nodes = len(nodes)
+    support_nodes = np.searchsorted(nodes, [fixture[1] for fixture in fixtures])
+    fixed_nodes = support_nodes[[fixture[0] == "Fixed" for fixture in fixtures]]
+    # unit loads of the unknowns: a1 and a2 directly, then a force at every support and a moment at every fixed support
+    unit_forces = np.zeros((num_nodes, len(support_nodes) + len(fixed_nodes)))
+    unit_forces[support_nodes, np.arange(len(support_nodes))] = 1.0
+    unit_moments = np.zeros(unit_forces.shape)
+    unit_moments[fixed_nodes, len(support_nodes) + np.arange(len(fixed_nodes))] = 1.0
+    u, theta, shear_end, moment_end = nodal_deflections(nodes, unit_forces, unit_moments, flexural_rigidity)
+    unit_u = np.column_stack([nodes / flexural_rigidity, np.full(num_nodes, 1 / flexural_rigidity), u])
+    unit_theta = np.column_stack([np.full(num_nodes, 1 / flexural_rigidity), np.zeros(num_nodes), theta])
+    unit_ends = np.vstack([np.zeros((2, 2)), np.column_stack([shear_end, moment_end])]).T
+
+    def constraint_rows(u, theta, ends):
+        # u = 0 at the supports, theta = 0 at the fixed supports, no shear or moment past the end
+        return np.concatenate([u[support_nodes], theta[fixed_nodes], ends])
+
+    system = constraint_rows(unit_u, unit_theta, unit_ends)
+    free = free_dofs(nodes, fixtures)
+
+    def solve(rhs):
+        u, theta, shear_end, moment_end = nodal_deflections(nodes, rhs[:, 0], rhs[:, 1], flexural_rigidity)
+        unknowns = np.linalg.solve(system, -constraint_rows(u, theta, np.stack([shear_end, moment_end])))
+        deflections = np.stack([u + unit_u @ unknowns, theta + unit_theta @ unknowns], axis=1)
+        return deflections * free[:, :, np.newaxis]  # the held DOFs are 0 up to round off
+
+    return solve
+
+
+def subspace_iteration(solve, mass_blocks, num_modes, tolerance=1e-10, max_iterations=200, seed=0):
+    '''
+    Lowest eigenpairs of K phi = omega^2 M phi by subspace iteration.
+
+    A block of q = max(2 p, p + 8) vectors is pushed through K^-1 M (one solve with q right hand
+    sides) and then Rayleigh-Ritz projected onto the q x q problem, which is the only dense
+    eigenvalue problem solved. K itself is never needed, since x_bar^T K x_bar = x_bar^T M x.
+    The lowest p eigenvalues converge at the rate omega_p^2 / omega_(q+1)^2 per iteration.
+
+    Parameters
+    ----------
+    solve : FUNCTION
+        RETURNS K^-1 rhs FOR rhs OF SHAPE (node, 2, columns), SEE flexibility_solver.
+    mass_blocks : TUPLE
+        (lower, diagonal, upper) (node, 2, 2) BLOCKS OF M.
+    num_modes : INT
+        NUMBER OF MODES p.
+    tolerance : FLOAT
+        RELATIVE CHANGE OF THE p EIGENVALUES BELOW WHICH THE ITERATION STOPS.
+
+    Returns
+    -------
+    eigenvalues : ARRAY
+        THE p LOWEST omega^2, ASCENDING.
+    vectors : ARRAY
+        M-NORMALIZED MODE SHAPES OF SHAPE (node, 2, p).
+
+    '''
+    num_nodes = mass_blocks[1].shape[0]
+    num_vectors = min(max(2 * num_modes, num_modes + 8), 2 * num_nodes)
+    x = np.random.default_rng(seed).standard_normal((num_nodes, 2, num_vectors))
+    previous = None
+    for _ in range(max_iterations):
+        mass_x = block_product(*mass_blocks, x)
+        x_bar = solve(mass_x)
+        # projected matrices: x_bar^T K x_bar = x_bar^T M x, since K x_bar = M x
+        reduced_stiffness = np.einsum('nij,nik->jk', x_bar, mass_x)
+        reduced_mass = np.einsum('nij,nik->jk', x_bar, block_product(*mass_blocks, x_bar))
+        reduced_stiffness = (reduced_stiffness + reduced_stiffness.T) / 2
+        reduced_mass = (reduced_mass + reduced_mass.T) / 2
+        # M-orthonormal Ritz vectors from the reduced generalized problem
+        inverse = np.linalg.inv(np.linalg.cholesky(reduced_mass))
+        eigenvalues, q = np.linalg.eigh(inverse @ reduced_stiffness @ inverse.T)
+        x = x_bar @ (inverse.T @ q)
+        if previous is not None and np.all(np.abs(eigenvalues[:num_modes] - previous) <= tolerance * np.abs(eigenvalues[:num_modes])):
+            break
+        previous = eigenvalues[:num_modes]
+    return eigenvalues[:num_modes], x[:, :, :num_modes]
+
+
+def modal_analysis(fixtures, overall_length, moment_of_inertia, youngs_modulus, mass_per_length, num_modes=3, num_elements=200, result_length_unit='m'):
+    '''
+    Natural frequencies and mode shapes of a beam on the supports the beam page configures.
+
+    The beam is meshed with cubic Hermite elements (a node at every support) with consistent
+    mass matrices, block tridiagonal with one 2 x 2 block per node and the supported DOFs held
+    (their rows and columns cleared). The lowest modes come from subspace_iteration with
+    flexibility_solver in place of a factorization of K. Every step is linear in num_elements.
+    Inputs are SI: m, m^4, Pa and kg/m.
+
+    Parameters
+    ----------
+    fixtures : LIST
+        LIST OF FIXTURES AND THEIR LOCATIONS.
+    overall_length : FLOAT
+        LENGTH OF THE BEAM.
+    moment_of_inertia, youngs_modulus : FLOAT
+        SECTION AND MATERIAL OF THE BEAM.
+    mass_per_length : FLOAT
+        MASS OF THE BEAM AND ANYTHING IT CARRIES PER UNIT LENGTH (DENSITY * AREA FOR A BARE BEAM).
+    num_modes : INT
+        NUMBER OF MODES.
+    num_elements : INT
+        APPROXIMATE NUMBER OF ELEMENTS.
+
+    Returns
+    -------
+    results : DICT
+        'frequencies' (Hz) AND 'angular_frequencies' (rad/s), ASCENDING, 'mode_x_values' (THE NODES) AND
+        'mode_shapes', ONE ROW OF NODAL DEFLECTIONS PER MODE, SCALED TO A LARGEST |DEFLECTION| OF 1.
+
+    '''
+    fixture_locations = [fixture[1] for fixture in fixtures]
+    if len(np.unique(fixture_locations)) < len(fixture_locations):
+        raise np.linalg.LinAlgError("Singular matrix")  # two supports in one place, like solve_element_system
+    num_pinned = sum(fixture[0] == "Pinned/Roller" for fixture in fixtures)
+    if not any(fixture[0] == "Fixed" for fixture in fixtures) and num_pinned < 2:
+        raise ValueError("The supports must keep the beam from moving as a rigid body.")
+    nodes = element_nodes(overall_length, fixture_locations, num_elements)
+    free = free_dofs(nodes, fixtures)
+    num_modes = min(num_modes, int(np.sum(free)))
+    mass_blocks = hold_dofs(*assemble_element_blocks(element_mass_matrices(nodes, mass_per_length)), free, held_value=0.0)
+    eigenvalues, vectors = subspace_iteration(flexibility_solver(nodes, fixtures, youngs_modulus * moment_of_inertia), mass_blocks, num_modes)
+
+    mode_shapes = vectors[:, 0, :].T
+    peak = np.take_along_axis(mode_shapes, np.argmax(np.abs(mode_shapes), axis=1)[:, np.newaxis], axis=1)
+    angular_frequencies = np.sqrt(np.maximum(eigenvalues, 0.0))
+    return {
+        'fixtures': fixtures,
+        'frequencies': angular_frequencies / (2 * np.pi),
+        'angular_frequencies': angular_frequencies,
+        'mode_x_values': nodes,
+        'mode_shapes': mode_shapes / peak,
+        'length_unit': result_length_unit,
+    }
+
+
+def generate_mode_plot(results: dict, length_unit: str = 'm'):
+    '''Plotly figure of the mode shapes of modal_analysis results, one line per mode.'''
+    fig = go.Figure()
+    x_values = results['mode_x_values']
+    fig.add_trace(go.Scatter(
+        x=x_values, y=np.zeros(np.shape(x_values)),
+        mode='lines', line=dict(color='black', width=5),
+        name='Beam', hoverinfo='none', showlegend=False
+    ))
+    for fixture in results['fixtures']:
+        fig.add_trace(go.Scatter(
+            x=[fixture[1]], y=[0],
+            marker_symbol="square" if fixture[0] == "Fixed" else "arrow-up",
+            marker_color="black",
+            marker_size=15,
+            showlegend=False,
+            hoverinfo="text",
+            hovertext=[f"{fixture[0]} Support"]
+        ))
+    for mode, (frequency, shape) in enumerate(zip(results['frequencies'], results['mode_shapes']), start=1):
+        fig.add_trace(go.Scatter(
+            x=x_values, y=shape,
+            mode='lines', line=dict(width=2),
+            name=f"Mode {mode}: {frequency:.2f} Hz"
+        ))
+    fig.update_layout(
+        title_text="Mode Shapes",
+        height=450,
+        font=dict(family="Roboto", size=12, color="black"),
+        legend=dict(orientation="h", yanchor="top", y=-0.2, xanchor="center", x=0.5),
+        yaxis=dict(title='Normalized Deflection', range=[-1.2, 1.2], zeroline=True, zerolinecolor='black'),
+    )
+    fig.update_xaxes(title_text=f"Distance Along Beam ({length_unit})")
+    return fig
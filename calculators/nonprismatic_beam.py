@@ -0,0 +1,143 @@
+import numpy as np
+from calculators.beam_calculator import TERM_KNOWN, BeamModel, BeamResults, split_terms, evaluate_pieces
+from calculators.beam_elements import integrated_pieces, solve_element_system, nodal_unknowns, element_nodes
+
+
+def section_rigidity(sections, moment_of_inertia, youngs_modulus):
+    '''
+    E * I along a non-prismatic beam, as a function of an array of positions.
+
+    The beam has moment_of_inertia and youngs_modulus everywhere except inside the sections.
+    Each section is [start, end, moment_of_inertia_start, moment_of_inertia_end, youngs_modulus]
+    with I changing linearly from start to end (equal ends for a stepped shaft or a doubler
+    plate, different ends for a tapered member). Later sections win where sections overlap.
+    '''
+    def rigidity(x_values):
+        x_values = np.asarray(x_values, dtype=float)
+        values = np.full(x_values.shape, moment_of_inertia * youngs_modulus)
+        for start, end, inertia_start, inertia_end, modulus in sections:
+            fraction = (x_values - start) / (end - start)
+            values = np.where((x_values >= start) & (x_values <= end), modulus * (inertia_start + (inertia_end - inertia_start) * fraction), values)
+        return values
+    return rigidity
+
+
+def condensed_element_matrices(key_nodes, nodes, flexibility, amplitude, location, exponent):
+    '''
+    Exact stiffness matrices and nodal loads of the elements between the key nodes of a non-prismatic beam.
+
+    Every element spans many mesh intervals, each with a constant 1 / (E * I). Instead of assembling
+    the mesh (its stiffness matrix gets worse conditioned with the 4th power of the number of
+    intervals), the mesh intervals of an element are condensed through flexibility integrals:
+    on the element, M(s) = Mc(s) + m + v * s with Mc the moment of the loads inside the element
+    (zero at its start), and the unit cases m and v give
+
+        [theta2 - theta1, h * theta2 - u2 + u1] = G [m, v] + Theta,  G = integral of [[1, s], [s, s^2]] / (E * I)
+
+    so K = B^T G^-1 B with B the matrix on the left and F = B^T G^-1 Theta + [0, 0, Vc(h), -Mc(h)].
+    A prismatic element gives the Hermite element back.
+
+    Parameters
+    ----------
+    key_nodes : ARRAY
+        ELEMENT ENDS, THE SUPPORTS AND EVERY POINT LOAD MUST BE AMONG THEM.
+    nodes : ARRAY
+        MESH NODES, INCLUDING THE KEY NODES.
+    flexibility : ARRAY
+        1 / (E * I) OF EVERY MESH INTERVAL.
+    amplitude, location, exponent : ARRAY
+        P(x) TERMS OF THE LOADS.
+
+    Returns
+    -------
+    stiffness : ARRAY
+        (element, 4, 4) ARRAY.
+    element_loads : ARRAY
+        (element, 4) ARRAY.
+
+    '''
+    overall_length = key_nodes[-1]
+    h = np.diff(key_nodes)
+    num_elements = len(h)
+    # G from the mesh intervals, in the local coordinate s of each element
+    element = np.clip(np.searchsorted(key_nodes, nodes[:-1], side='right') - 1, 0, num_elements - 1)
+    s0 = nodes[:-1] - key_nodes[element]
+    s1 = nodes[1:] - key_nodes[element]
+    moments = [np.bincount(element, flexibility * (s1**(k + 1) - s0**(k + 1)) / (k + 1), num_elements) for k in range(3)]
+    flexibility_matrix = np.stack([np.stack(moments[:2], axis=-1), np.stack(moments[1:], axis=-1)], axis=-2)
+
+    # Theta from the loads alone: integrate over the mesh with theta and u restarting at 0 at every key node
+    breakpoints = np.unique(np.concatenate([nodes[:-1], location[location > 0]]))
+    interval_flexibility = flexibility[np.clip(np.searchsorted(nodes, breakpoints, side='right') - 1, 0, len(flexibility) - 1)]
+    anchors = np.searchsorted(breakpoints, key_nodes[:-1])
+    coeffs = integrated_pieces(amplitude, location, exponent, breakpoints, interval_flexibility, anchors, np.zeros(num_elements), np.zeros(num_elements))
+    before = evaluate_pieces(breakpoints, coeffs, key_nodes[:-1], np.ones(num_elements, dtype=bool))
+    before[:, 0] = 0.0  # nothing acts before x = 0
+    after = evaluate_pieces(breakpoints, coeffs, key_nodes[1:], key_nodes[1:] < overall_length)  # loads at the end of the beam go to the last element
+    shear_start, moment_start = before[1], before[2]
+    theta_end, u_end = after[3], after[4]
+    load_theta = np.stack([theta_end - moment_start * moments[0] - shear_start * moments[1],
+                           h * theta_end - u_end - moment_start * moments[1] - shear_start * moments[2]], axis=-1)
+    load_shear = after[1] - shear_start
+    load_moment = after[2] - moment_start - shear_start * h
+
+    kinematics = np.zeros((num_elements, 2, 4))
+    kinematics[:, 0, 1] = -1.0
+    kinematics[:, 0, 3] = 1.0
+    kinematics[:, 1, 0] = 1.0
+    kinematics[:, 1, 2] = -1.0
+    kinematics[:, 1, 3] = h
+    transpose = np.swapaxes(kinematics, 1, 2)
+    inverse = np.linalg.inv(flexibility_matrix)
+    stiffness = transpose @ inverse @ kinematics
+    element_loads = (transpose @ inverse @ load_theta[:, :, np.newaxis])[:, :, 0]
+    element_loads[:, 2] += load_shear
+    element_loads[:, 3] -= load_moment
+    return stiffness, element_loads
+
+
+def solve_nonprismatic_beam(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus, sections, num_points, result_length_unit, result_force_unit, num_elements=1000, adaptive_tolerance=None):
+    '''
+    Finite element version of solve_beam for beams whose E * I changes along the length.
+
+    The beam is meshed into about num_elements intervals with a node at every support, load and
+    section end, each interval with the E * I at its middle. The intervals between key nodes are
+    condensed into one exact element each (condensed_element_matrices), the elements are assembled
+    into a block tridiagonal matrix and solved by cyclic reduction, and Theta(x) and u(x) are then
+    integrated over the mesh from the key nodes. Every step is linear in the number of elements.
+    Stepped beams are exact, tapered members converge with the square of the interval length.
+
+    Parameters
+    ----------
+    moment_of_inertia, youngs_modulus : FLOAT
+        SECTION OF THE BEAM OUTSIDE THE SECTIONS.
+    sections : LIST
+        LIST OF [start, end, moment_of_inertia_start, moment_of_inertia_end, youngs_modulus], SEE section_rigidity.
+    num_elements : INT
+        APPROXIMATE NUMBER OF MESH INTERVALS.
+
+    Returns
+    -------
+    results : DICT
+        BeamResults, SAME KEYS AS solve_beam. a1 AND a2 ARE SCALED BY THE E * I AT x = 0.
+
+    '''
+    model = BeamModel(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus)
+    rigidity = section_rigidity(sections, moment_of_inertia, youngs_modulus)
+    p_terms = model.terms[0]
+    amplitude, location, exponent = split_terms(p_terms[(p_terms['kind'] == TERM_KNOWN) & (p_terms['location'] <= overall_length)])
+    point_loads = location[exponent < 0]
+    key_nodes = np.unique(np.concatenate([[0.0, overall_length], [fixture[1] for fixture in fixtures], np.clip(point_loads, 0.0, overall_length)]))
+    section_ends = [section[i] for section in sections for i in (0, 1)]
+    nodes = element_nodes(overall_length, np.concatenate([key_nodes, section_ends, location]), num_elements)
+    flexibility = 1 / rigidity((nodes[:-1] + nodes[1:]) / 2)
+    stiffness, element_loads = condensed_element_matrices(key_nodes, nodes, flexibility, amplitude, location, exponent)
+    displacements, reactions = solve_element_system(key_nodes, stiffness, element_loads, fixtures)
+    solns = nodal_unknowns(model.unknowns, key_nodes, displacements, reactions, 1 / flexibility[0])
+
+    amplitude, location, exponent = split_terms(model.solved_terms(solns)[0])
+    breakpoints = np.unique(np.concatenate([nodes[:-1], location[location > 0]]))
+    interval_flexibility = flexibility[np.clip(np.searchsorted(nodes, breakpoints, side='right') - 1, 0, len(flexibility) - 1)]
+    anchors = np.searchsorted(breakpoints, key_nodes[:-1])
+    coeffs = integrated_pieces(amplitude, location, exponent, breakpoints, interval_flexibility, anchors, displacements[:-1, 1], displacements[:-1, 0])
+    return BeamResults(model, solns, breakpoints, coeffs, num_points, result_length_unit, result_force_unit, adaptive_tolerance)
@@ -0,0 +1,124 @@
+import re
+import numpy as np
+from calculators.beam_calculator import BeamResults, evaluate_pieces
+
+# about one bucket per three pixels of a full width beam plot
+default_plot_buckets = 400
+# samples of a zoomed window, well above the 4 * default_plot_buckets min_max_indices starts to decimate at
+default_window_points = 20000
+
+
+def min_max_indices(x, ys, num_buckets=default_plot_buckets, x_range=None):
+    '''
+    Indices of the samples to plot so every series keeps its peaks at a fixed point budget.
+
+    The window of x is cut into num_buckets equal width buckets and each bucket keeps its first
+    and last sample plus the sample with the smallest and the largest value of each series. All
+    series share the kept indices so they can share one x array.
+
+    Parameters
+    ----------
+    x : ARRAY
+        SORTED SAMPLE POSITIONS.
+    ys : ARRAY
+        (series, len(x)) VALUES AT THE SAMPLES.
+    num_buckets : INT
+        NUMBER OF BUCKETS ACROSS THE WINDOW, AT MOST 2 + 2 * len(ys) SAMPLES ARE KEPT PER BUCKET.
+    x_range : TUPLE, optional
+        (x_min, x_max) WINDOW TO KEEP, THE WHOLE ARRAY IF None. THE SAMPLE JUST OUTSIDE EACH END IS
+        KEPT SO THE LINES REACH THE EDGES OF THE PLOT.
+
+    Returns
+    -------
+    indices : ARRAY
+        SORTED INDICES INTO x.
+
+    '''
+    x = np.asarray(x, dtype=float)
+    ys = np.atleast_2d(np.asarray(ys, dtype=float))
+    start, stop = 0, len(x)
+    if x_range is not None:
+        start = max(np.searchsorted(x, x_range[0], side='left') - 1, 0)
+        stop = min(np.searchsorted(x, x_range[1], side='right') + 1, len(x))
+    window_x = x[start:stop]
+    if len(window_x) <= 4 * num_buckets or window_x[-1] <= window_x[0]:
+        return np.arange(start, stop)
+    bucket = np.minimum(((window_x - window_x[0]) * (num_buckets / (window_x[-1] - window_x[0]))).astype(int), num_buckets - 1)
+    firsts = np.flatnonzero(np.diff(bucket, prepend=-1))  # first sample of each non-empty bucket
+    lasts = np.append(firsts[1:], len(window_x)) - 1
+    keep = [firsts, lasts]
+    for y in ys[:, start:stop]:
+        order = np.lexsort((y, bucket))  # buckets stay in place, sorted by value inside each one
+        keep += [order[firsts], order[lasts]]
+    return np.unique(np.concatenate(keep)) + start
+
+
+def downsample_results(results, num_buckets=default_plot_buckets, x_range=None):
+    '''
+    Copy of a solve_beam results dict with the sampled diagrams cut down by min_max_indices for plotting.
+    results is not changed, so the full resolution arrays can be decimated again for another x_range.
+    '''
+    if results['beam_x_values'] is None:
+        return results
+    x = np.asarray(results['beam_x_values'], dtype=float)
+    ys = np.array([results[key] for key in BeamResults.diagram_keys], dtype=float)
+    indices = min_max_indices(x, ys, num_buckets, x_range)
+    downsampled = dict(results)
+    downsampled['beam_x_values'] = x[indices]
+    downsampled.update(zip(BeamResults.diagram_keys, ys[:, indices]))
+    return downsampled
+
+
+def window_sample_points(breakpoints, overall_length, x_range, num_points=default_window_points):
+    '''
+    num_points + 1 evenly spaced positions across x_range (cut to the beam) plus both sides of every
+    breakpoint inside it, sorted, with the left_limit flags evaluate_pieces takes. None if the window
+    is off the beam. Like beam_sample_points, the end of the beam is evaluated as a left limit.
+    '''
+    start, end = max(x_range[0], 0.0), min(x_range[1], overall_length)
+    if end <= start:
+        return None
+    inner = breakpoints[(breakpoints > start) & (breakpoints < end)]
+    x_values = np.concatenate([np.linspace(start, end, num_points + 1), inner, inner])
+    left_limit = np.zeros(len(x_values), dtype=bool)
+    left_limit[num_points] = end == overall_length
+    left_limit[num_points + 1:num_points + 1 + len(inner)] = True
+    order = np.lexsort((~left_limit, x_values))  # the left limit of a jump comes first
+    return x_values[order], left_limit[order]
+
+
+def resample_results(results, x_range, num_points=default_window_points):
+    '''
+    Copy of BeamResults with the diagrams sampled again from its polynomial pieces across x_range,
+    so a zoomed window shows detail the samples of the whole beam do not have. Pass the copy to
+    downsample_results to cut it down to the plot's point budget. Results without pieces, and
+    windows off the beam, come back as they are.
+    '''
+    coeffs = getattr(results, 'coeffs', None)
+    if coeffs is None or x_range is None:
+        return results
+    samples = window_sample_points(results.breakpoints, results.model.overall_length, x_range, num_points)
+    if samples is None:
+        return results
+    x_values, left_limit = samples
+    resampled = {key: results[key] for key in BeamResults.result_keys if key != 'beam_x_values' and key not in BeamResults.diagram_keys}
+    resampled['beam_x_values'] = x_values
+    resampled.update(zip(BeamResults.diagram_keys, evaluate_pieces(results.breakpoints, coeffs, x_values, left_limit)))
+    return resampled
+
+
+def relayout_x_range(relayout):
+    '''
+    The x window from a Plotly relayout event (any of the shared x axes).
+    Returns (x_min, x_max), None when the axes were reset to autorange and False if the event did not move x.
+    '''
+    for key, value in relayout.items():
+        axis = re.fullmatch(r'xaxis\d*\.(range\[0\]|range|autorange)', key)
+        if axis is None:
+            continue
+        if axis.group(1) == 'autorange':
+            return None
+        if axis.group(1) == 'range':
+            return float(value[0]), float(value[1])
+        return float(value), float(relayout[key.replace('[0]', '[1]')])
+    return False
@@ -0,0 +1,104 @@
+from collections.abc import Mapping
+import numpy as np
+from calculators.beam_inputs import unit_scale
+
+# (length exponent, force exponent) of the SI units results are stored in
+si_unit_dimensions = {'m': (1, 0), 'N': (0, 1), 'N/m': (-1, 1), 'N*m': (1, 1), 'rad': (0, 0)}
+
+# SI unit of each series of a solve_beam results dict or a load_combinations envelope
+result_units = {
+    'beam_x_values': 'm',
+    'y_force_plot': 'N/m',
+    'y_shear_plot': 'N',
+    'y_moment_plot': 'N*m',
+    'y_angle_plot': 'rad',
+    'y_deflection_plot': 'm',
+    'max_shear': 'N',
+    'max_shear_pos': 'm',
+    'max_moment': 'N*m',
+    'max_moment_pos': 'm',
+    'max_angle': 'rad',
+    'max_angle_pos': 'm',
+    'max_deflection': 'm',
+    'max_deflection_pos': 'm',
+    'stations': 'm',
+    'min_shear': 'N',
+    'min_moment': 'N*m',
+    'min_angle': 'rad',
+    'min_deflection': 'm',
+}
+
+# SI unit of the value of each load type in loads_moments
+load_value_units = {
+    'Concentrated Force': 'N',
+    'Concentrated Moment': 'N*m',
+    'Constant Distributed Load': 'N/m',
+    'Linear Distributed Load': 'N/m',
+}
+
+# SI unit of each reaction type in reactions
+reaction_units = {'Force y': 'N', 'Moment': 'N*m'}
+
+
+class ResultView(Mapping):
+    '''
+    Read-only view of SI beam results (or load combination envelopes) in display units.
+
+    The results are never changed, so switching units only builds a new view (two cached scale
+    factors) and any number of switches gives the same numbers as converting once. Values are
+    scaled when they are read: series in the display units' SI unit are returned as they are,
+    the others are multiplied by one float. Loads, fixtures, reactions and locations are small
+    and come back as converted copies. The integration constants in reactions stay in SI.
+    '''
+    def __init__(self, results, length_unit='m', force_unit='N'):
+        self.results = results
+        self.length_unit = length_unit
+        self.force_unit = force_unit
+        # raises for an unknown unit before anything is displayed
+        self.length_scale = unit_scale('m', length_unit)
+        self.force_scale = unit_scale('N', force_unit)
+
+    def scale(self, si_unit):
+        '''Factor from si_unit to the display units.'''
+        length_power, force_power = si_unit_dimensions[si_unit]
+        return self.length_scale ** length_power * self.force_scale ** force_power
+
+    def convert(self, value, si_unit):
+        if value is None:
+            return None
+        scale = self.scale(si_unit)
+        if scale == 1.0:
+            return value
+        if isinstance(value, (np.ndarray, list)):
+            return np.asarray(value, dtype=float) * scale
+        return value * scale
+
+    def __getitem__(self, key):
+        if key == 'length_unit':
+            return self.length_unit
+        if key == 'force_unit':
+            return self.force_unit
+        value = self.results[key]
+        if key in result_units:
+            return self.convert(value, result_units[key])
+        if key == 'loads_moments':
+            return [[load[0], self.convert(load[1], 'm'), self.convert(load[2], 'm'), self.convert(load[3], load_value_units.get(load[0], 'N'))]
+                    for load in value]
+        if key in ('fixtures', 'important_locations'):
+            return [[row[0], self.convert(row[1], 'm')] + list(row[2:]) for row in value]
+        if key == 'reactions':
+            # envelopes append max, max_combination, min, min_combination instead of one value
+            return [reaction if reaction[0] <= 2 else [reaction[0], reaction[1], self.convert(reaction[2], 'm')]
+                    + [entry if isinstance(entry, str) else self.convert(entry, reaction_units[reaction[1]]) for entry in reaction[3:]]
+                    for reaction in value]
+        if key == 'peaks':
+            return [dict(peak, max=self.convert(peak['max'], result_units['max_' + peak['diagram']]), max_pos=self.convert(peak['max_pos'], 'm'),
+                         min=self.convert(peak['min'], result_units['min_' + peak['diagram']]), min_pos=self.convert(peak['min_pos'], 'm'))
+                    for peak in value]
+        return value
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
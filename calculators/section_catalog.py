@@ -0,0 +1,280 @@
+import numpy as np
+from calculators.beam_calculator import BeamModel, materials, diagram_breakpoints, polynomial_pieces, piecewise_extrema
+
+INCH = 0.0254  # m
+STANDARD_GRAVITY = 9.80665  # m/s^2
+
+# W shapes from the AISC Shapes Database: name, A (in^2), Ix (in^4), Sx (in^3).
+# Tabulated values include the fillets; the weight is the nominal lb/ft in the name.
+wide_flange_properties = [
+    ('W4x13', 3.83, 11.3, 5.46),
+    ('W6x9', 2.68, 16.4, 5.56),
+    ('W6x15', 4.43, 29.1, 9.72),
+    ('W8x10', 2.96, 30.8, 7.81),
+    ('W8x18', 5.26, 61.9, 15.2),
+    ('W8x31', 9.13, 110, 27.5),
+    ('W10x12', 3.54, 53.8, 10.9),
+    ('W10x22', 6.49, 118, 23.2),
+    ('W10x33', 9.71, 171, 35.0),
+    ('W12x14', 4.16, 88.6, 14.9),
+    ('W12x26', 7.65, 204, 33.4),
+    ('W12x40', 11.7, 307, 51.5),
+    ('W14x22', 6.49, 199, 29.0),
+    ('W14x30', 8.85, 291, 42.0),
+    ('W16x26', 7.68, 301, 38.4),
+    ('W16x40', 11.8, 518, 64.7),
+    ('W18x35', 10.3, 510, 57.6),
+    ('W21x44', 13.0, 843, 81.6),
+    ('W24x55', 16.2, 1350, 114),
+]
+# other families in nominal inches
+aluminum_i_beam_dimensions = [  # Aluminum Association standard I-beams: depth, flange width, flange thickness, web thickness
+    (3.0, 2.50, 0.20, 0.13),
+    (4.0, 3.00, 0.23, 0.15),
+    (5.0, 3.50, 0.27, 0.15),
+    (6.0, 4.00, 0.29, 0.19),
+    (8.0, 5.00, 0.35, 0.23),
+    (10.0, 6.00, 0.41, 0.25),
+    (12.0, 7.00, 0.47, 0.29),
+]
+rectangular_tube_sizes = [(1, 1), (1.5, 1.5), (2, 1), (2, 2), (3, 1), (3, 2), (3, 3), (4, 2), (4, 4), (5, 3), (6, 2), (6, 4), (6, 6), (8, 4), (8, 8), (10, 6)]  # depth, width
+rectangular_tube_walls = [0.065, 0.120, 0.1875, 0.250, 0.375]
+round_tube_diameters = [0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.5, 3.0, 3.5, 4.0, 5.0, 6.0]
+round_tube_walls = [0.035, 0.049, 0.065, 0.083, 0.120, 0.1875, 0.250]
+flat_bar_sizes = [(1, 0.25), (1, 0.5), (1.5, 0.25), (1.5, 0.5), (2, 0.25), (2, 0.5), (2, 1), (3, 0.5), (3, 1), (4, 0.5), (4, 1), (6, 0.5), (6, 1)]  # depth, width
+
+# AISC 360 B4.2: the design wall of an ERW tube is 0.93 of the nominal wall
+TUBE_DESIGN_WALL = 0.93
+# the fillets left out of the aluminum I-beams are under 4% of their weight
+OMITTED_FILLET_WEIGHT = 1.05
+
+catalog_basis = ('W shapes use tabulated AISC properties. Tubes use the AISC design wall (0.93 x nominal), with '
+                 'rounded corners on rectangular tubes, and their weight uses the nominal wall. Aluminum I-beams '
+                 'use nominal dimensions without fillets, which understates their stiffness and strength, and '
+                 'their weight is increased 5% to cover the fillets.')
+
+# material each family is usually made of, for the catalog's weight per length
+family_materials = {
+    'Wide Flange': 'AISI 1020 Steel',
+    'Aluminum I-Beam': 'Aluminum 6061-T6',
+    'Rectangular Tube': 'ASTM A500 Grade B',
+    'Round Tube': 'ASTM A500 Grade B',
+    'Flat Bar': 'Aluminum 6061-T6',
+}
+
+
+def i_section_properties(depth, flange_width, flange_thickness, web_thickness):
+    '''Area, second moment of area about the strong axis and extreme fiber distance of I-sections (arrays).'''
+    web_depth = depth - 2 * flange_thickness
+    area = 2 * flange_width * flange_thickness + web_depth * web_thickness
+    moment_of_inertia = (flange_width * depth**3 - (flange_width - web_thickness) * web_depth**3) / 12
+    return area, moment_of_inertia, depth / 2
+
+
+def rectangular_tube_properties(depth, width, wall):
+    '''Area, second moment of area and extreme fiber distance of rectangular tubes bent about the depth (arrays).'''
+    area = depth * width - (depth - 2 * wall) * (width - 2 * wall)
+    moment_of_inertia = (width * depth**3 - (width - 2 * wall) * (depth - 2 * wall)**3) / 12
+    return area, moment_of_inertia, depth / 2
+
+
+def rounded_rectangle_properties(depth, width, radius):
+    '''Area and second moment of area about the depth of rectangles with rounded corners (arrays).'''
+    area = depth * width - (4 - np.pi) * radius**2
+    # each corner removes an R x R square and adds back a quarter circle centered at circle_y
+    circle_y = depth / 2 - radius
+    square = radius * ((depth / 2)**3 - circle_y**3) / 3
+    quarter_circle = np.pi * radius**4 / 16 + np.pi * radius**2 / 4 * (circle_y**2 + 2 * circle_y * 4 * radius / (3 * np.pi))
+    moment_of_inertia = width * depth**3 / 12 - 4 * (square - quarter_circle)
+    return area, moment_of_inertia
+
+
+def rectangular_tube_design_properties(depth, width, wall):
+    '''
+    Area, second moment of area and extreme fiber distance of rectangular tubes the way AISC tabulates
+    them: the design wall with an outside corner radius of twice the wall (arrays).
+    '''
+    wall = TUBE_DESIGN_WALL * wall
+    outer_area, outer_inertia = rounded_rectangle_properties(depth, width, 2 * wall)
+    inner_area, inner_inertia = rounded_rectangle_properties(depth - 2 * wall, width - 2 * wall, wall)
+    return outer_area - inner_area, outer_inertia - inner_inertia, depth / 2
+
+
+def round_tube_properties(diameter, wall):
+    '''Area, second moment of area and extreme fiber distance of round tubes (arrays).'''
+    inner = diameter - 2 * wall
+    area = np.pi / 4 * (diameter**2 - inner**2)
+    moment_of_inertia = np.pi / 64 * (diameter**4 - inner**4)
+    return area, moment_of_inertia, diameter / 2
+
+
+def build_section_catalog():
+    '''
+    Builds the standard section catalog from the tables above.
+
+    Stiffness and strength never come out above the published values: W shapes use the tabulated
+    properties, tubes the design wall and the other families nominal dimensions without fillets.
+    The area, which sets the weight and mass, never comes out below them: tubes use the nominal
+    wall and the aluminum I-beams are increased by OMITTED_FILLET_WEIGHT.
+
+    Returns
+    -------
+    catalog : DICT
+        ONE ARRAY PER COLUMN, ONE ROW PER SECTION: 'name', 'family', 'material' (THE USUAL MATERIAL OF THE FAMILY),
+        'area' (m^2), 'moment_of_inertia' (m^4), 'section_y' (m) AND 'weight_per_length' (N/m IN THE USUAL MATERIAL).
+
+    '''
+    names, families, properties = [], [], []
+
+    def add(family, family_names, family_properties):
+        names.extend(family_names)
+        families.extend([family] * len(family_names))
+        properties.append(np.stack(family_properties, axis=1))
+
+    w_names, w_area, w_inertia, w_modulus = zip(*wide_flange_properties)
+    w_inertia = np.array(w_inertia, dtype=float)
+    add('Wide Flange', list(w_names), (np.array(w_area), w_inertia, w_inertia / np.array(w_modulus)))
+    aa_area, aa_inertia, aa_y = i_section_properties(*np.array(aluminum_i_beam_dimensions).T)
+    add('Aluminum I-Beam', [f"I {d:g} x {b:g}" for d, b, *_ in aluminum_i_beam_dimensions], (aa_area * OMITTED_FILLET_WEIGHT, aa_inertia, aa_y))
+
+    tubes = np.array([(d, b, t) for d, b in rectangular_tube_sizes for t in rectangular_tube_walls if t < min(d, b) / 4]).T
+    _, tube_inertia, tube_y = rectangular_tube_design_properties(*tubes)
+    add('Rectangular Tube', [f"Rect Tube {d:g} x {b:g} x {t:.3f}" for d, b, t in tubes.T], (rectangular_tube_properties(*tubes)[0], tube_inertia, tube_y))
+    rounds = np.array([(d, t) for d in round_tube_diameters for t in round_tube_walls if t <= d / 6]).T
+    _, round_inertia, round_y = round_tube_properties(rounds[0], TUBE_DESIGN_WALL * rounds[1])
+    add('Round Tube', [f"Round Tube {d:g} x {t:.3f}" for d, t in rounds.T], (round_tube_properties(*rounds)[0], round_inertia, round_y))
+    bars = np.array(flat_bar_sizes).T
+    add('Flat Bar', [f"Flat Bar {d:g} x {b:g}" for d, b in bars.T], rectangular_tube_properties(bars[0], bars[1], bars[1] / 2))
+
+    area, moment_of_inertia, section_y = np.concatenate(properties).T
+    families = np.array(families)
+    material = np.array([family_materials[family] for family in families])
+    density = np.array([materials[name].density.to('kg/m**3').magnitude for name in material])
+    return {
+        'name': np.array(names),
+        'family': families,
+        'material': material,
+        'area': area * INCH**2,
+        'moment_of_inertia': moment_of_inertia * INCH**4,
+        'section_y': section_y * INCH,
+        'weight_per_length': area * INCH**2 * density * STANDARD_GRAVITY,
+    }
+
+
+section_catalog = build_section_catalog()
+section_names = list(section_catalog['name'])
+
+
+def material_arrays(material_options):
+    '''Names and SI (Pa, kg/m^3, Pa) modulus, density and yield strength arrays of a materials dict.'''
+    names = list(material_options)
+    modulus = np.array([material_options[name].modulus.to('Pa').magnitude for name in names])
+    density = np.array([material_options[name].density.to('kg/m**3').magnitude for name in names])
+    yield_strength = np.array([material_options[name].yield_strength.to('Pa').magnitude for name in names])
+    return np.array(names), modulus, density, yield_strength
+
+
+def lightest_sections(loads_moments, fixtures, overall_length, max_deflection=None, deflection_ratio=None, min_safety_factor=1.0,
+                      include_self_weight=True, catalog=None, material_options=None, families=None, num_results=10):
+    '''
+    Screens every section x material pair of a catalog and returns the lightest that meet
+    the deflection and yield limits.
+
+    The beam is solved once with E * I = 1 and, with include_self_weight, once more under
+    a 1 N/m downward load over its length. Both are linear, so M(x) and u(x) of every pair are
+    M = M_loads + w * M_weight and u = (u_loads + w * u_weight) / (E * I), with w the pair's
+    weight per length. The exact extrema of all pairs come from one batched piecewise_extrema
+    call, so the whole screen is a few NumPy operations instead of one solve_beam per pair.
+    Inputs and results are SI (m, N, Pa).
+
+    Parameters
+    ----------
+    loads_moments : LIST
+        LIST OF LOADS AND MOMENTS WITH THEIR LOCATIONS, LIKE solve_beam.
+    fixtures : LIST
+        LIST OF FIXTURES AND THEIR LOCATIONS.
+    overall_length : FLOAT
+        LENGTH OF THE BEAM.
+    max_deflection : FLOAT
+        LARGEST ALLOWED |DEFLECTION|.
+    deflection_ratio : FLOAT
+        LARGEST ALLOWED |DEFLECTION| AS overall_length / deflection_ratio (E.G. 360 FOR L/360).
+    min_safety_factor : FLOAT
+        SMALLEST ALLOWED YIELD STRENGTH / MAX BENDING STRESS.
+    include_self_weight : BOOL
+        ADD EACH PAIR'S OWN WEIGHT AS A DISTRIBUTED LOAD OVER THE BEAM.
+    catalog : DICT
+        SECTIONS LIKE section_catalog, WHICH IS THE DEFAULT.
+    material_options : DICT
+        MATERIALS BY NAME, DEFAULTS TO materials.
+    families : LIST
+        ONLY SCREEN THESE SECTION FAMILIES. None SCREENS ALL.
+    num_results : INT
+        NUMBER OF FEASIBLE PAIRS TO RETURN.
+
+    Returns
+    -------
+    rows : LIST
+        THE LIGHTEST FEASIBLE PAIRS, LIGHTEST FIRST. EACH IS A DICT WITH 'section', 'family', 'material',
+        'weight_per_length', 'area', 'moment_of_inertia', 'section_y', 'max_deflection', 'max_deflection_pos',
+        'max_bending_stress' AND 'safety_factor'.
+
+    '''
+    if catalog is None:
+        catalog = section_catalog
+    if material_options is None:
+        material_options = materials
+    keep = np.ones(len(catalog['name']), dtype=bool) if families is None else np.isin(catalog['family'], families)
+    area, moment_of_inertia, section_y = catalog['area'][keep], catalog['moment_of_inertia'][keep], catalog['section_y'][keep]
+    material_names, modulus, density, yield_strength = material_arrays(material_options)
+    # (section, material) grids
+    weight = area[:, np.newaxis] * density * STANDARD_GRAVITY
+    rigidity = moment_of_inertia[:, np.newaxis] * modulus
+
+    load_model = BeamModel(loads_moments, fixtures, overall_length, 1.0, 1.0)
+    models = [load_model]
+    if include_self_weight:
+        models.append(BeamModel([["Constant Distributed Load", 0.0, overall_length, -1.0]], fixtures, overall_length, 1.0, 1.0))
+    term_arrays = [model.solved_arrays(model.solve()) for model in models]
+    breakpoints = diagram_breakpoints(np.concatenate([terms[1].ravel() for terms in term_arrays]),
+                                      np.concatenate([terms[2].ravel() for terms in term_arrays]), 0.0)
+    # M(x) and u(x) pieces of each model on the same breakpoints
+    pieces = [polynomial_pieces(*terms, breakpoints)[2::2] for terms in term_arrays]
+    degree = max(piece.shape[-1] for piece in pieces)
+    pieces = [np.pad(piece, ((0, 0), (0, 0), (0, degree - piece.shape[-1]))) for piece in pieces]
+    coeffs = pieces[0] if not include_self_weight else pieces[0] + weight[..., np.newaxis, np.newaxis, np.newaxis] * pieces[1]
+    max_values, max_positions, min_values, min_positions = piecewise_extrema(breakpoints, coeffs, overall_length)
+    use_max = np.abs(max_values) >= np.abs(min_values)
+    peak_values = np.broadcast_to(np.where(use_max, max_values, min_values), weight.shape + (2,))
+    peak_positions = np.broadcast_to(np.where(use_max, max_positions, min_positions), weight.shape + (2,))
+
+    deflection = peak_values[..., 1] / rigidity
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bending_stress = np.abs(peak_values[..., 0]) * (section_y / moment_of_inertia)[:, np.newaxis]
+        safety_factor = np.where(bending_stress > 0, yield_strength / bending_stress, np.inf)
+    deflection_limit = np.inf
+    if max_deflection is not None:
+        deflection_limit = max_deflection
+    if deflection_ratio is not None:
+        deflection_limit = min(deflection_limit, overall_length / deflection_ratio)
+    feasible = (np.abs(deflection) <= deflection_limit) & (safety_factor >= min_safety_factor)
+
+    section_idx, material_idx = np.nonzero(feasible)
+    order = np.argsort(weight[section_idx, material_idx], kind='stable')[:num_results]
+    names, section_families = catalog['name'][keep], catalog['family'][keep]
+    rows = []
+    for s, m in zip(section_idx[order], material_idx[order]):
+        rows.append({
+            'section': str(names[s]),
+            'family': str(section_families[s]),
+            'material': str(material_names[m]),
+            'weight_per_length': weight[s, m],
+            'area': area[s],
+            'moment_of_inertia': moment_of_inertia[s],
+            'section_y': section_y[s],
+            'max_deflection': deflection[s, m],
+            'max_deflection_pos': peak_positions[s, m, 1],
+            'max_bending_stress': bending_stress[s, m],
+            'safety_factor': safety_factor[s, m],
+        })
+    return rows
@@ -0,0 +1,151 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+PROPERTY_CACHE_SIZE = 256
+property_cache = OrderedDict()  # geometry_key -> results, most recently used last
+
+
+def rectangle(width, height, x=0.0, y=0.0):
+    '''Vertices of a width x height rectangle centered on (x, y).'''
+    return np.array([[-width / 2, -height / 2], [width / 2, -height / 2], [width / 2, height / 2], [-width / 2, height / 2]]) + [x, y]
+
+
+def circle(diameter, x=0.0, y=0.0, num_vertices=256):
+    '''
+    Vertices of a regular polygon inscribed in a circle of the diameter, centered on (x, y).
+    Its area is low by about 20 / num_vertices**2 relative, 3e-4 at the default 256.
+    '''
+    angle = np.linspace(0.0, 2 * np.pi, num_vertices, endpoint=False)
+    return np.stack([x + diameter / 2 * np.cos(angle), y + diameter / 2 * np.sin(angle)], axis=1)
+
+
+def pack_shapes(shapes):
+    '''
+    Packs shapes into one (vertex, 2) array, the first vertex of each ring and the role
+    of each ring (1 for an outer boundary, -1 for a hole).
+    '''
+    rings, roles = [], []
+    for shape in shapes:
+        if not isinstance(shape, dict):
+            shape = {'outer': shape}
+        for role, ring in [(1, shape['outer'])] + [(-1, hole) for hole in shape.get('holes', [])]:
+            ring = np.asarray(ring, dtype=float).reshape(-1, 2)
+            if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+                ring = ring[:-1]  # closed rings repeat their first vertex
+            if len(ring) < 3:
+                raise ValueError("Every ring needs at least 3 vertices.")
+            rings.append(ring)
+            roles.append(role)
+    if not rings:
+        raise ValueError("No shapes given.")
+    ring_starts = np.cumsum([0] + [len(ring) for ring in rings[:-1]])
+    return np.concatenate(rings), ring_starts, np.array(roles)
+
+
+def geometry_key(vertices, ring_starts, roles):
+    '''Hash of packed geometry, so the same section is recognized however it was built.'''
+    digest = hashlib.sha1(np.ascontiguousarray(vertices).tobytes())
+    digest.update(np.asarray(ring_starts, dtype=np.int64).tobytes())
+    digest.update(np.asarray(roles, dtype=np.int8).tobytes())
+    return digest.hexdigest()
+
+
+def ring_integrals(vertices, ring_starts):
+    '''
+    Area, first moments and second moments about the origin of every ring with the shoelace
+    (Green's theorem) sums over its edges, all edges of all rings at once. Returns
+    (integral, ring) rows: A, A * Cx, A * Cy, Ixx, Iyy, Ixy, signed by each ring's orientation
+    (counterclockwise positive).
+    '''
+    x, y = vertices[:, 0], vertices[:, 1]
+    following = np.arange(1, len(vertices) + 1)
+    following[np.append(ring_starts[1:], len(vertices)) - 1] = ring_starts  # the last vertex of each ring wraps to its first
+    x_next, y_next = x[following], y[following]
+    cross = x * y_next - x_next * y
+    edge_terms = np.stack([
+        cross,
+        (x + x_next) * cross,
+        (y + y_next) * cross,
+        (y * y + y * y_next + y_next * y_next) * cross,
+        (x * x + x * x_next + x_next * x_next) * cross,
+        (x * y_next + 2 * x * y + 2 * x_next * y_next + x_next * y) * cross,
+    ])
+    return np.add.reduceat(edge_terms, ring_starts, axis=1) / np.array([2.0, 6.0, 6.0, 12.0, 12.0, 24.0])[:, np.newaxis]
+
+
+def compute_section_properties(vertices, ring_starts, roles):
+    '''section_properties without the cache, for packed geometry.'''
+    # integrate about the middle of the bounding box, which keeps the parallel axis shift below small
+    low, high = vertices.min(axis=0), vertices.max(axis=0)
+    origin = (low + high) / 2
+    integrals = ring_integrals(vertices - origin, ring_starts)
+    # outer rings add and holes subtract, whichever way their vertices run
+    area, first_x, first_y, ixx, iyy, ixy = integrals @ (roles * np.sign(integrals[0]))
+    if area <= 0:
+        raise ValueError("The section has no area.")
+    centroid_x, centroid_y = first_x / area, first_y / area
+    ixx -= area * centroid_y**2
+    iyy -= area * centroid_x**2
+    ixy -= area * centroid_x * centroid_y
+    # principal axes
+    average, radius = (ixx + iyy) / 2, np.hypot((ixx - iyy) / 2, ixy)
+    principal_angle = 0.5 * np.arctan2(-2 * ixy, ixx - iyy)
+
+    top, bottom = high[1] - origin[1] - centroid_y, centroid_y - (low[1] - origin[1])
+    right, left = high[0] - origin[0] - centroid_x, centroid_x - (low[0] - origin[0])
+    return {
+        'area': float(area),
+        'centroid_x': float(centroid_x + origin[0]),
+        'centroid_y': float(centroid_y + origin[1]),
+        'ixx': float(ixx),
+        'iyy': float(iyy),
+        'ixy': float(ixy),
+        'i1': float(average + radius),
+        'i2': float(average - radius),
+        'principal_angle': float(principal_angle),
+        'section_modulus_top': float(ixx / top),
+        'section_modulus_bottom': float(ixx / bottom),
+        'section_modulus_left': float(iyy / left),
+        'section_modulus_right': float(iyy / right),
+        'moment_of_inertia': float(ixx),
+        'section_y': float(max(top, bottom)),
+    }
+
+
+def section_properties(shapes):
+    '''
+    Properties of a cross section made of polygons with holes.
+
+    Every ring is integrated exactly with shoelace sums, all rings in one set of NumPy
+    operations, so profiles with thousands of vertices take well under a millisecond.
+    Results are memoized by geometry_key, so dragging a dimension back to an earlier value
+    or redrawing the same section is a dictionary lookup. Overlapping shapes are added
+    together (no boolean union), so composite sections should be split into touching parts.
+
+    Parameters
+    ----------
+    shapes : LIST
+        EACH SHAPE IS AN (n, 2) ARRAY OF x, y VERTICES OR A DICT WITH AN 'outer' ARRAY AND
+        AN OPTIONAL LIST OF 'holes' ARRAYS. VERTICES MAY RUN EITHER WAY AROUND.
+
+    Returns
+    -------
+    results : DICT
+        'area', 'centroid_x', 'centroid_y', CENTROIDAL 'ixx', 'iyy' AND 'ixy', PRINCIPAL 'i1', 'i2'
+        AND 'principal_angle' (RADIANS FROM x TO THE i1 AXIS), SECTION MODULI 'section_modulus_top',
+        '_bottom', '_left' AND '_right', AND 'moment_of_inertia' (= ixx) AND 'section_y' (THE LARGER
+        DISTANCE FROM THE CENTROID TO THE TOP OR BOTTOM FIBER) FOR THE BEAM CALCULATOR. y IS UP.
+
+    '''
+    vertices, ring_starts, roles = pack_shapes(shapes)
+    key = geometry_key(vertices, ring_starts, roles)
+    results = property_cache.get(key)
+    if results is None:
+        results = compute_section_properties(vertices, ring_starts, roles)
+        property_cache[key] = results
+        while len(property_cache) > PROPERTY_CACHE_SIZE:
+            property_cache.popitem(last=False)
+    else:
+        property_cache.move_to_end(key)
+    return dict(results)
@@ -0,0 +1,187 @@
+import io
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
+import numpy as np
+from calculators.beam_calculator import BeamModel, BeamResults, beam_pieces
+
+# version of the disk table, bump it whenever the stored arrays change so old files are never read
+DISK_FORMAT = 2
+
+
+def canonical_value(value, digits=12):
+    '''Rounds a number to digits significant digits so inputs that differ only by float noise share a key. None stays None.'''
+    if value is None:
+        return None
+    return float(f"{float(value):.{digits}g}") + 0.0  # + 0.0 turns -0.0 into 0.0
+
+
+def canonical_beam_key(loads_moments, fixtures, overall_length, num_points, result_length_unit, result_force_unit, adaptive_tolerance=None, solver='dense', digits=12):
+    '''
+    Hashable key of a solve_beam call.
+
+    The inputs are the SI values solve_beam takes (the beam page converts every quantity to
+    m, N and Pa before solving), rounded to digits significant digits. Loads and fixtures are
+    sorted, so the same beam entered in a different order gets the same key, and "None" rows
+    and the unused end position of point loads are dropped. E and I are not part of the key,
+    see cached_solve_beam.
+
+    Returns
+    -------
+    key : TUPLE
+
+    '''
+    loads = []
+    for load in loads_moments:
+        if load[0] == "None":
+            continue
+        end = None if load[0] in ("Concentrated Force", "Concentrated Moment") else canonical_value(load[2], digits)
+        loads.append((load[0], canonical_value(load[1], digits), end, canonical_value(load[3], digits)))
+    supports = [(fixture[0], canonical_value(fixture[1], digits)) for fixture in fixtures]
+    return (tuple(sorted(loads, key=repr)), tuple(sorted(supports, key=repr)),
+            canonical_value(overall_length, digits), int(num_points), result_length_unit, result_force_unit, canonical_value(adaptive_tolerance, digits), solver)
+
+
+def solution_bytes(results):
+    '''The solution vector and the diagram pieces of BeamResults as np.savez bytes, the disk format of SolutionCache.'''
+    buffer = io.BytesIO()
+    np.savez(buffer, solns=results.solns, breakpoints=results.breakpoints, coeffs=results.coeffs)
+    return buffer.getvalue()
+
+
+def solution_arrays(data):
+    '''(solns, breakpoints, coeffs) from solution_bytes. Never unpickles, so a shared file cannot run code.'''
+    with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+        return arrays['solns'], arrays['breakpoints'], arrays['coeffs']
+
+
+class SolutionCache:
+    '''
+    Size bounded LRU cache of solve_beam results with an optional SQLite tier on disk.
+
+    The memory tier keeps the max_entries most recently used BeamResults. They are shared, not
+    copied, so lazy keys are computed once for every caller and never forced by a copy. Callers
+    must not change them (the beam page reads them through ResultView). With a path, the
+    solution vector and the diagram pieces (as plain arrays, see solution_bytes) are also written
+    to a SQLite file with the loads, fixtures, E and I they were solved with (as JSON and floats).
+    The file survives restarts and is shared by every process that opens it. A memory miss that is found on disk is rebuilt with
+    the caller's from_solution and kept in memory.
+
+    hits, disk_hits and misses count the lookups answered from memory, from disk and by solving.
+    '''
+    def __init__(self, max_entries=128, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.table = f"solutions_v{DISK_FORMAT}"
+        if path is not None:
+            self.execute("PRAGMA journal_mode=WAL")  # readers in other processes do not block the writer
+            self.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, inputs TEXT, moment_of_inertia REAL, youngs_modulus REAL, solution BLOB)")
+
+    def execute(self, sql, parameters=()):
+        # one short connection per statement, so the cache can be shared with other processes and threads
+        with closing(sqlite3.connect(self.path, timeout=10)) as connection, connection:
+            return connection.execute(sql, parameters).fetchone()
+
+    @staticmethod
+    def disk_key(key):
+        return json.dumps(key, separators=(',', ':'))
+
+    def get(self, key, from_solution=None):
+        '''
+        Cached results for key, or None. from_solution(loads_moments, fixtures, moment_of_inertia, youngs_modulus,
+        solns, breakpoints, coeffs) rebuilds results from a disk entry, without it the disk tier is not read.
+        '''
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+        if self.path is not None and from_solution is not None:
+            row = self.execute(f"SELECT inputs, moment_of_inertia, youngs_modulus, solution FROM {self.table} WHERE key = ?", (self.disk_key(key),))
+            if row is not None:
+                results = from_solution(*json.loads(row[0]), row[1], row[2], *solution_arrays(row[3]))
+                with self.lock:
+                    self.disk_hits += 1
+                    self.remember(key, results)
+                return results
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, results):
+        '''Keeps BeamResults for key, on disk as well with a path.'''
+        with self.lock:
+            self.remember(key, results)
+        if self.path is not None:
+            model = results.model
+            self.execute(f"INSERT OR REPLACE INTO {self.table} (key, inputs, moment_of_inertia, youngs_modulus, solution) VALUES (?, ?, ?, ?, ?)",
+                         (self.disk_key(key), json.dumps([model.loads_moments, model.fixtures]), model.moment_of_inertia, model.youngs_modulus, solution_bytes(results)))
+
+    def remember(self, key, results):
+        # caller holds the lock
+        self.entries[key] = results
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self, disk=False):
+        '''Empties the memory tier and resets the counters, and the disk tier too when disk is True.'''
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if disk and self.path is not None:
+            self.execute(f"DELETE FROM {self.table}")
+
+    def info(self):
+        '''Counters and sizes as a dict.'''
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'path': self.path,
+            }
+
+
+# set BEAM_SOLUTION_CACHE to a file path to keep solutions on disk across restarts and worker processes
+solution_cache = SolutionCache(path=os.environ.get('BEAM_SOLUTION_CACHE'))
+
+
+def cached_solve_beam(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus, num_points, result_length_unit, result_force_unit, adaptive_tolerance=None, solver='dense', cache=None):
+    '''
+    solve_beam through a SolutionCache (the module level solution_cache by default).
+    Same arguments and results as solve_beam, but the results are shared with the cache and must
+    not be changed. Beams that only differ in the order of their loads and fixtures share an
+    entry, so the order of 'reactions' follows the first solve.
+    Beams that only differ in E and I share an entry too: the cached results are rescaled
+    with BeamResults.with_rigidity, so swapping the material or the section is never a miss.
+    '''
+    if cache is None:
+        cache = solution_cache
+
+    def from_solution(solved_loads_moments, solved_fixtures, solved_moment_of_inertia, solved_youngs_modulus, solns, breakpoints, coeffs):
+        # the model the solution was found for, the order of the unknowns follows its fixtures
+        model = BeamModel(solved_loads_moments, solved_fixtures, overall_length, solved_moment_of_inertia, solved_youngs_modulus)
+        return BeamResults(model, solns, breakpoints, coeffs, num_points, result_length_unit, result_force_unit, adaptive_tolerance)
+
+    key = canonical_beam_key(loads_moments, fixtures, overall_length, num_points, result_length_unit, result_force_unit, adaptive_tolerance, solver)
+    results = cache.get(key, from_solution)
+    if results is None:
+        model = BeamModel(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus)
+        results = BeamResults(model, *beam_pieces(model, solver), num_points, result_length_unit, result_force_unit, adaptive_tolerance)
+        cache.put(key, results)
+    elif (results.model.youngs_modulus, results.model.moment_of_inertia) != (youngs_modulus, moment_of_inertia):
+        results = results.with_rigidity(youngs_modulus, moment_of_inertia)
+    return results
@@ -0,0 +1,195 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from calculators.beam_calculator import BeamModel, BeamSupports, beam_sample_points, evaluate_term_batch
+
+
+def sample_distribution(spec, num_samples, rng):
+    '''
+    Draws num_samples values from a distribution spec.
+
+    Parameters
+    ----------
+    spec : FLOAT OR TUPLE
+        A NUMBER (NO SCATTER), ('normal', mean, standard_deviation), ('uniform', low, high),
+        ('triangular', low, mode, high) OR ('lognormal', median, sigma).
+    num_samples : INT
+        NUMBER OF VALUES.
+    rng : np.random.Generator
+        RANDOM NUMBER GENERATOR.
+
+    Returns
+    -------
+    values : ARRAY
+
+    '''
+    if spec is None or np.isscalar(spec):
+        return np.full(num_samples, np.nan if spec is None else float(spec))
+    name, *parameters = spec
+    if name == 'normal':
+        return rng.normal(parameters[0], parameters[1], num_samples)
+    elif name == 'uniform':
+        return rng.uniform(parameters[0], parameters[1], num_samples)
+    elif name == 'triangular':
+        return rng.triangular(parameters[0], parameters[1], parameters[2], num_samples)
+    elif name == 'lognormal':
+        return rng.lognormal(np.log(parameters[0]), parameters[1], num_samples)
+    raise ValueError(f"Unknown distribution: {name}")
+
+
+def nominal_value(spec):
+    '''Value of a distribution spec without scatter: the mean, the middle, the mode or the median.'''
+    if spec is None or np.isscalar(spec):
+        return spec
+    name, *parameters = spec
+    if name == 'uniform':
+        return (parameters[0] + parameters[1]) / 2
+    elif name == 'triangular':
+        return parameters[1]
+    return parameters[0]
+
+
+def sampled_load_terms(loads_moments, samples, overall_length, num_samples):
+    '''
+    P(x) terms of every sampled load case, find_load_coefficients with one row per sample.
+
+    samples holds the sampled (start, end, value) arrays of each load. The terms that
+    find_load_coefficients leaves out for loads ending at the end of the beam get an amplitude
+    of 0 instead, so every sample has the same terms.
+    Returns (sample, term) amplitude and location arrays and the exponent of each term.
+    '''
+    amplitude, location, exponent = [], [], []
+
+    def add(term_amplitude, term_location, n):
+        amplitude.append(term_amplitude)
+        location.append(term_location)
+        exponent.append(n)
+
+    for load, (start, end, value) in zip(loads_moments, samples):
+        if load[0] == "Concentrated Force":
+            add(value, start, -1)
+        elif load[0] == "Concentrated Moment":
+            add(value, start, -2)
+        elif load[0] == "Constant Distributed Load":
+            add(value, start, 0)
+            add(np.where(end < overall_length, -value, 0.0), end, 0)
+        elif load[0] == "Linear Distributed Load":
+            slope = value / (end - start)
+            on_beam = end < overall_length
+            add(slope, start, 1)
+            add(np.where(on_beam, -slope, 0.0), end, 1)
+            add(np.where(on_beam, -value, 0.0), end, 0)
+    if not amplitude:
+        add(np.zeros(num_samples), np.zeros(num_samples), -1)  # unloaded beam, one inactive term
+    return np.stack(amplitude, axis=1), np.stack(location, axis=1), np.array(exponent)
+
+
+def tolerance_responses(fixtures, overall_length, loads_moments, nominal_youngs_modulus, nominal_moment_of_inertia, youngs_modulus, moment_of_inertia, section_y, load_samples, stations, left_limit=None):
+    '''
+    Deflection and bending stress at the stations for a chunk of samples, each (sample, station).
+
+    The supports do not change between samples, so A is factorized once (BeamSupports) at the
+    nominal E * I and every sample is one more right hand side. A prismatic beam's reactions do
+    not depend on E * I, so Theta(x) and u(x) of each sample are the nominal ones scaled by
+    nominal E * I / sample E * I.
+    '''
+    nominal_rigidity = nominal_youngs_modulus * nominal_moment_of_inertia
+    supports = BeamSupports(fixtures, overall_length, nominal_moment_of_inertia, nominal_youngs_modulus)
+    p_amplitude, p_location, p_exponent = sampled_load_terms(loads_moments, load_samples, overall_length, len(youngs_modulus))
+
+    # V(x), M(x), Theta(x) and u(x) of every sample, see diagram_terms
+    steps = np.arange(len(BeamModel.selections))[:, np.newaxis]
+    divisors = np.maximum(p_exponent + steps, 1)
+    divisors[0] = 1
+    scale = 1 / np.cumprod(divisors, axis=0)
+    scale[3:] /= nominal_rigidity
+    amplitude = p_amplitude[:, np.newaxis, :] * scale
+    shape = amplitude.shape
+    load_terms = [amplitude, np.broadcast_to(p_location[:, np.newaxis, :], shape), np.broadcast_to((p_exponent + steps).astype(float), shape)]
+
+    solns = supports.solve_terms(load_terms)
+    # only M(x) and u(x) are needed from here on
+    diagrams = evaluate_term_batch(*(terms[:, 2::2] for terms in load_terms), stations, left_limit)
+    diagrams += np.einsum('ku,uds->kds', solns, supports.unit_diagrams(stations, left_limit)[:, 2::2])
+    bending_stress = diagrams[:, 0] * (section_y / moment_of_inertia)[:, np.newaxis]
+    deflection = diagrams[:, 1] * (nominal_rigidity / (youngs_modulus * moment_of_inertia))[:, np.newaxis]
+    return deflection, bending_stress
+
+
+def tolerance_analysis(loads_moments, fixtures, overall_length, moment_of_inertia, youngs_modulus, section_y, num_samples=10000, num_points=100,
+                       percentiles=(5, 50, 95), seed=None, processes=None, result_length_unit='m', result_force_unit='N'):
+    '''
+    Monte Carlo tolerance analysis of a beam.
+
+    E, I, the distance to the extreme fiber and the position and value of every load can be
+    given as distribution specs (see sample_distribution) instead of numbers. All realizations
+    are sampled up front and solved as one batch with NumPy. With processes, the batch is split
+    across a process pool instead. The supports and the overall length keep their nominal values.
+
+    Parameters
+    ----------
+    loads_moments : LIST
+        LIST OF LOADS LIKE solve_beam, WITH DISTRIBUTION SPECS ALLOWED FOR THE START, END AND VALUE.
+    fixtures : LIST
+        LIST OF FIXTURES AND THEIR LOCATIONS.
+    moment_of_inertia, youngs_modulus, section_y : FLOAT OR TUPLE
+        SECTION AND MATERIAL, DISTRIBUTION SPECS ALLOWED. section_y IS THE DISTANCE FROM THE NEUTRAL AXIS TO THE EXTREME FIBER.
+    num_samples : INT
+        NUMBER OF REALIZATIONS.
+    num_points : INT
+        NUMBER OF INTERVALS BETWEEN THE STATIONS WHERE THE DIAGRAMS ARE SAMPLED.
+    percentiles : TUPLE
+        PERCENTILES TO REPORT.
+    seed : INT
+        SEED OF THE RANDOM NUMBER GENERATOR.
+    processes : INT
+        NUMBER OF WORKER PROCESSES. None SOLVES IN THIS PROCESS.
+
+    Returns
+    -------
+    results : DICT
+        'deflection' AND 'bending_stress' ARE (percentile, station) ENVELOPES.
+        'max_deflection' (THE SIGNED PEAK DEFLECTION OF EACH SAMPLE) AND 'max_bending_stress'
+        (THE LARGEST |STRESS| OF EACH SAMPLE) ARE GIVEN AS PERCENTILES, WITH THE RAW SAMPLES
+        UNDER THE SAME NAMES ENDING IN '_samples'. PEAKS ARE TAKEN AT THE STATIONS.
+
+    '''
+    rng = np.random.default_rng(seed)
+    youngs_modulus_samples = sample_distribution(youngs_modulus, num_samples, rng)
+    moment_of_inertia_samples = sample_distribution(moment_of_inertia, num_samples, rng)
+    section_y_samples = sample_distribution(section_y, num_samples, rng)
+    load_samples = [tuple(sample_distribution(spec, num_samples, rng) for spec in (load[1], load[2], load[3])) for load in loads_moments]
+    nominal = (nominal_value(youngs_modulus), nominal_value(moment_of_inertia))
+    stations, left_limit = beam_sample_points(overall_length, num_points)
+
+    if processes is None or processes <= 1:
+        deflection, bending_stress = tolerance_responses(fixtures, overall_length, loads_moments, *nominal, youngs_modulus_samples,
+                                                         moment_of_inertia_samples, section_y_samples, load_samples, stations, left_limit)
+    else:
+        chunks = np.array_split(np.arange(num_samples), processes)
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [pool.submit(tolerance_responses, fixtures, overall_length, loads_moments, *nominal, youngs_modulus_samples[chunk],
+                                   moment_of_inertia_samples[chunk], section_y_samples[chunk],
+                                   [tuple(values[chunk] for values in load) for load in load_samples], stations, left_limit)
+                       for chunk in chunks]
+            parts = [future.result() for future in futures]
+        deflection = np.concatenate([part[0] for part in parts])
+        bending_stress = np.concatenate([part[1] for part in parts])
+
+    peak = np.argmax(np.abs(deflection), axis=1)
+    max_deflection = deflection[np.arange(num_samples), peak]
+    max_bending_stress = np.max(np.abs(bending_stress), axis=1)
+    return {
+        'fixtures': fixtures,
+        'loads_moments': loads_moments,
+        'num_samples': num_samples,
+        'percentiles': np.asarray(percentiles, dtype=float),
+        'stations': stations,
+        'deflection': np.percentile(deflection, percentiles, axis=0),
+        'bending_stress': np.percentile(bending_stress, percentiles, axis=0),
+        'max_deflection': np.percentile(max_deflection, percentiles),
+        'max_bending_stress': np.percentile(max_bending_stress, percentiles),
+        'max_deflection_samples': max_deflection,
+        'max_bending_stress_samples': max_bending_stress,
+        'length_unit': result_length_unit,
+        'force_unit': result_force_unit,
+    }
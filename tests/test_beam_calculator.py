@@ -0,0 +1,154 @@
+import base64
+import json
+import numpy as np
+from calculators.beam_calculator import (BeamModel, BeamResults, BeamSupports, TERM_KNOWN, TERM_UNKNOWN, beam_plot_update, beam_results, context_trace_count, diagram_terms,
+                                        evaluate_term_arrays, find_load_terms, generate_beam_plot, piecewise_extrema, plot_array, solve_beam, solve_beams, term_dtype)
+
+OVERALL_LENGTH = 5.0
+MOMENT_OF_INERTIA = 8e-6
+YOUNGS_MODULUS = 2e11
+RIGIDITY = YOUNGS_MODULUS * MOMENT_OF_INERTIA
+LOADS_MOMENTS = [["Concentrated Force", 1.5, None, -1000.0], ["Concentrated Moment", 2.5, None, 800.0],
+                 ["Constant Distributed Load", 2.0, 4.5, -400.0], ["Linear Distributed Load", 0.5, 3.0, -200.0]]
+FIXTURES = [["Fixed", 0.0], ["Pinned/Roller", 3.0], ["Pinned/Roller", OVERALL_LENGTH]]
+
+
+def test_cantilever_tip_deflection():
+    load = -1000.0
+    results = solve_beam([["Concentrated Force", OVERALL_LENGTH, None, load]], [["Fixed", 0.0]], OVERALL_LENGTH,
+                         MOMENT_OF_INERTIA, YOUNGS_MODULUS, 101, 'm', 'N')
+    assert np.isclose(results['max_deflection'], load * OVERALL_LENGTH ** 3 / (3 * RIGIDITY))
+    assert results['max_deflection_pos'] == OVERALL_LENGTH
+
+
+def test_extrema_between_samples():
+    # 7 intervals never sample midspan, the exact peaks of a uniformly loaded simple span are still found
+    load = -400.0
+    results = solve_beam([["Constant Distributed Load", 0.0, OVERALL_LENGTH, load]], [["Pinned/Roller", 0.0], ["Pinned/Roller", OVERALL_LENGTH]],
+                         OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 7, 'm', 'N')
+    assert not np.any(np.isclose(results['beam_x_values'], OVERALL_LENGTH / 2))
+    assert np.isclose(results['max_moment'], -load * OVERALL_LENGTH ** 2 / 8)
+    assert np.isclose(results['max_moment_pos'], OVERALL_LENGTH / 2)
+    assert np.isclose(results['max_deflection'], 5 * load * OVERALL_LENGTH ** 4 / (384 * RIGIDITY))
+    assert np.isclose(results['max_deflection_pos'], OVERALL_LENGTH / 2)
+
+
+def test_piecewise_extrema_counts_both_sides_of_a_jump():
+    # x (1 - x) on [0, 1), then a constant -1 on [1, 2]
+    breakpoints = np.array([0.0, 1.0])
+    coeffs = np.array([[[0.0, 1.0, -1.0], [-1.0, 0.0, 0.0]]])
+    max_values, max_positions, min_values, min_positions = piecewise_extrema(breakpoints, coeffs, 2.0)
+    np.testing.assert_allclose([max_values[0], max_positions[0]], [0.25, 0.5])
+    assert min_values[0] == -1.0 and 1.0 <= min_positions[0] <= 2.0
+
+
+def assert_same_results(results, expected):
+    for key in BeamResults.diagram_keys + BeamResults.extremum_keys:
+        np.testing.assert_allclose(results[key], expected[key], rtol=1e-9, atol=1e-9 * np.max(np.abs(expected[key])))
+    reactions = [row[-1] for row in expected['reactions']]
+    np.testing.assert_allclose([row[-1] for row in results['reactions']], reactions, rtol=1e-9, atol=1e-9 * np.max(np.abs(reactions)))
+
+
+def test_batch_matches_solve_beam():
+    # beams with different numbers of unknowns end up in different batches
+    configs = [dict(loads_moments=LOADS_MOMENTS, fixtures=FIXTURES, overall_length=OVERALL_LENGTH, moment_of_inertia=MOMENT_OF_INERTIA, youngs_modulus=YOUNGS_MODULUS),
+               dict(loads_moments=LOADS_MOMENTS[:2], fixtures=FIXTURES[:1], overall_length=4.0, moment_of_inertia=2 * MOMENT_OF_INERTIA, youngs_modulus=YOUNGS_MODULUS),
+               dict(loads_moments=LOADS_MOMENTS[2:], fixtures=FIXTURES[1:], overall_length=OVERALL_LENGTH, moment_of_inertia=MOMENT_OF_INERTIA, youngs_modulus=7e10)]
+    for results, config in zip(solve_beams(configs, 100), configs):
+        assert_same_results(results, solve_beam(**config, num_points=100, result_length_unit='m', result_force_unit='N'))
+
+
+def test_load_cases_share_one_factorization():
+    supports = BeamSupports(FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS)
+    load_cases = [LOADS_MOMENTS, LOADS_MOMENTS[:1], LOADS_MOMENTS[2:]]
+    solns = supports.solve(load_cases)
+    for case, results, loads_moments in zip(solns, supports.solve_load_cases(load_cases, 100), load_cases):
+        expected = solve_beam(loads_moments, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N')
+        np.testing.assert_allclose(case, expected.solns, rtol=1e-9, atol=1e-9 * np.max(np.abs(expected.solns)))
+        assert_same_results(results, expected)
+
+
+def test_load_terms_integrate_through_every_diagram():
+    # a point load and a uniform load from 1 to 3: <x-1>^-1, <x-1>^0 - <x-3>^0, each integration divides by the new exponent
+    terms = diagram_terms(find_load_terms([["Concentrated Force", 1.0, None, -10.0], ["Constant Distributed Load", 1.0, 3.0, -4.0]], OVERALL_LENGTH),
+                          YOUNGS_MODULUS, MOMENT_OF_INERTIA)
+    assert terms.dtype == term_dtype and terms.shape == (5, 3)
+    np.testing.assert_array_equal(terms['exponent'], [[-1, 0, 0], [0, 1, 1], [1, 2, 2], [2, 3, 3], [3, 4, 4]])
+    np.testing.assert_array_equal(terms['location'], np.broadcast_to([1.0, 1.0, 3.0], (5, 3)))
+    np.testing.assert_allclose(terms['amplitude'], [[-10, -4, 4], [-10, -4, 4], [-10, -2, 2],
+                                                    np.array([-5, -2 / 3, 2 / 3]) / RIGIDITY, np.array([-5 / 3, -1 / 6, 1 / 6]) / RIGIDITY])
+
+
+def test_model_terms_mark_the_unknowns():
+    model = BeamModel(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS)
+    unknown = model.terms['kind'] == TERM_UNKNOWN
+    # a1 and a2, then one term per reaction in each diagram it reaches
+    assert set(model.terms['index'][unknown]) == set(range(len(model.unknowns)))
+    assert np.count_nonzero(model.terms['kind'] == TERM_KNOWN) == 5 * len(find_load_terms(LOADS_MOMENTS, OVERALL_LENGTH))
+    results = solve_beam(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N')
+    x_values = results['beam_x_values'][:-1]  # the last sample is a left limit
+    diagrams = evaluate_term_arrays(*model.solved_arrays(results.solns), x_values)
+    for diagram, key in zip(diagrams, BeamResults.diagram_keys):
+        np.testing.assert_allclose(diagram, results[key][:-1], atol=1e-9 * np.max(np.abs(results[key])))
+
+
+def test_results_are_computed_on_first_read():
+    results = solve_beam(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N')
+    computed = lambda key: dict.__contains__(results, key)
+    results['reactions']
+    assert not any(computed(key) for key in ['beam_x_values', 'max_deflection'] + BeamResults.diagram_keys)
+    results['max_deflection']
+    assert computed('max_moment') and not computed('y_moment_plot')
+    assert 'model' not in results and results.model.fixtures is FIXTURES
+    assert list(results) == BeamResults.result_keys and len(dict(results)) == len(results)
+    assert all(computed(key) for key in BeamResults.result_keys)
+
+
+def test_beam_results_from_sampled_diagrams():
+    expected = solve_beam(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N')
+    diagrams = [expected[key] for key in BeamResults.diagram_keys]
+    results = beam_results(expected.model, expected.solns, expected['beam_x_values'], diagrams, 'm', 'N')
+    # without exact extrema the largest samples are used
+    for diagram, name in zip(diagrams[1:], BeamResults.extremum_keys[::2]):
+        peak = np.argmax(np.abs(diagram))
+        assert results[name] == diagram[peak] and results[name + '_pos'] == expected['beam_x_values'][peak]
+    assert [row[-1] for row in results['reactions']] == [row[-1] for row in expected['reactions']]
+
+
+def test_beam_context_is_one_trace_per_marker_type():
+    many_loads = LOADS_MOMENTS + [["Concentrated Force", x, None, -10.0] for x in np.linspace(0.2, 4.8, 20)]
+    figures = [generate_beam_plot(solve_beam(loads_moments, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N'))
+               for loads_moments in (LOADS_MOMENTS, many_loads)]
+    assert len(figures[0].data) == len(figures[1].data) == len(BeamResults.diagram_keys) + 1 + 3 * context_trace_count
+    forces = [trace for trace in figures[1].data if trace.hovertext is not None and trace.hovertext[0].startswith('Force')]
+    assert len(forces) == 3 and all(len(trace.x) == 21 for trace in forces)
+    supports = [trace for trace in figures[0].data[:context_trace_count + 1] if trace.hovertext is not None and 'Support' in trace.hovertext[0]]
+    assert sorted(len(trace.x) for trace in supports) == [1, 2]
+    assert any('Moment =' in text for trace in supports for text in trace.hovertext)
+
+
+def decode(array):
+    return np.frombuffer(base64.b64decode(array['bdata']), dtype='<' + array['dtype'])
+
+
+def test_plot_arrays_are_typed_arrays():
+    values = np.linspace(-1.0, 1.0, 1001) ** 3
+    np.testing.assert_array_equal(decode(plot_array(values)), values)
+    np.testing.assert_allclose(decode(plot_array(values, 'f4')), values, rtol=1e-7, atol=1e-7)
+    assert plot_array(values, None) == values.tolist()
+    results = solve_beam(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 1000, 'm', 'N')
+    sizes = {}
+    for dtype in ('f4', 'f8', None):
+        data, layout = beam_plot_update(results, dtype=dtype)
+        sizes[dtype] = len(json.dumps([data, layout]))
+    assert sizes['f4'] < sizes['f8'] < sizes[None]
+    data, _ = beam_plot_update(results, dtype='f8')
+    np.testing.assert_array_equal(decode(data['y'][0]), results['y_force_plot'])
+    np.testing.assert_array_equal(decode(data['x'][0]), results['beam_x_values'])
+
+
+def test_banded_solver_matches_dense():
+    fixtures = [["Fixed", 0.0]] + [["Pinned/Roller", float(x)] for x in np.linspace(0.5, OVERALL_LENGTH, 10)]
+    dense = solve_beam(LOADS_MOMENTS, fixtures, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N')
+    banded = solve_beam(LOADS_MOMENTS, fixtures, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N', solver='banded')
+    assert_same_results(banded, dense)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from calculators.beam_calculator import solve_beam
+from calculators.beam_inputs import distributed_load_terms, normalize_beam_inputs, unit_scale
+from calculators.unit_conversion import Q
+
+FIXTURE_ROWS = [['Fixed', 0.0, 'ft'], ['Pinned/Roller', 96.0, 'in']]
+POINT_LOAD_ROWS = [['Concentrated Force', 3.0, 'ft', -2.0, 'kip', 'L'], ['Concentrated Moment', 50.0, 'in', 10.0, 'kip*in', 'D'],
+                   ['None', 0.0, 'ft', 0.0, 'lbf', 'D']]
+DISTRIBUTED_LOAD_ROWS = [[1.0, 6.0, 'ft', -100.0, -300.0, 'lbf/ft', 'D']]
+
+
+def normalize(fixture_rows=FIXTURE_ROWS, point_load_rows=POINT_LOAD_ROWS, distributed_load_rows=DISTRIBUTED_LOAD_ROWS, **kwargs):
+    return normalize_beam_inputs(10.0, 'ft', 20.0, 'in⁴', 29000, 'ksi', fixture_rows, point_load_rows, distributed_load_rows, **kwargs)
+
+
+def test_values_match_pint():
+    beam = normalize(section_y=2.0, section_y_unit='in')
+    assert beam['overall_length'] == pytest.approx(Q(10.0, 'ft').to('m').magnitude)
+    assert beam['moment_of_inertia'] == pytest.approx(Q(20.0, 'in**4').to('m**4').magnitude)
+    assert beam['youngs_modulus'] == pytest.approx(Q(29000, 'ksi').to('Pa').magnitude)
+    assert beam['section_y'] == pytest.approx(Q(2.0, 'in').to('m').magnitude)
+    assert beam['fixtures'] == [['Fixed', 0.0], ['Pinned/Roller', pytest.approx(Q(96.0, 'in').to('m').magnitude)]]
+    # distributed loads come first, split into a constant and a linear part, then point loads in order ("None" rows are skipped)
+    assert [load[0] for load in beam['loads_moments']] == ['Constant Distributed Load', 'Linear Distributed Load', 'Concentrated Force', 'Concentrated Moment']
+    assert beam['load_case_of'] == ['D', 'D', 'L', 'D']
+    np.testing.assert_allclose(beam['loads_moments'][1][1:], [Q(1.0, 'ft').to('m').magnitude, Q(6.0, 'ft').to('m').magnitude,
+                                                            Q(-200.0, 'lbf/ft').to('N/m').magnitude])
+    assert beam['loads_moments'][2][1:] == [pytest.approx(Q(3.0, 'ft').to('m').magnitude), None, pytest.approx(Q(-2.0, 'kip').to('N').magnitude)]
+    assert beam['loads_moments'][3][3] == pytest.approx(Q(10.0, 'kip*in').to('N*m').magnitude)
+
+
+def test_unit_scale_is_cached():
+    unit_scale.cache_clear()
+    normalize()
+    misses = unit_scale.cache_info().misses
+    normalize()
+    assert unit_scale.cache_info().misses == misses
+
+
+@pytest.mark.parametrize('start_value, end_value', [(-100.0, -300.0), (-300.0, -100.0), (100.0, 300.0), (300.0, 100.0)])
+def test_distributed_load_terms_carry_the_whole_load(start_value, end_value):
+    loads_moments = distributed_load_terms(1.0, 3.0, start_value, end_value)
+    results = solve_beam(loads_moments, [["Fixed", 0.0]], 4.0, 8e-6, 2e11, 40, 'm', 'N')
+    x = results['beam_x_values']
+    np.testing.assert_allclose(results['y_force_plot'][(x > 1.0) & (x < 3.0)], np.interp(x[(x > 1.0) & (x < 3.0)], [1.0, 3.0], [start_value, end_value]))
+    assert results['reactions'][-1][-1] == pytest.approx(-(start_value + end_value))
+
+
+def test_uniform_distributed_load_is_one_term():
+    assert distributed_load_terms(0.0, 1.0, -5.0, -5.0) == [['Constant Distributed Load', 0.0, 1.0, -5.0]]
+
+
+@pytest.mark.parametrize('kwargs, message', [
+    (dict(fixture_rows=[['Fixed', 11.0, 'ft']]), 'Fixture position not on beam. Did not solve beam.'),
+    (dict(fixture_rows=[['Fixed', None, 'ft']]), 'Error: Check Beam Fixture Data.'),
+    (dict(point_load_rows=[['Concentrated Force', 3.0, 'ft', None, 'kip', 'L']]), 'Error: Check Beam Point Load Data.'),
+    (dict(distributed_load_rows=[[6.0, 1.0, 'ft', -100.0, -300.0, 'lbf/ft', 'D']]), 'Distributed Load start position must come after end position. Did not solve beam.'),
+    (dict(distributed_load_rows=[[1.0, 6.0, 'ft', -100.0, 300.0, 'lbf/ft', 'D']]),
+     'Distributed loads cannot have both positive and negative values. Split it into two loads. Did not solve beam.'),
+    (dict(section_y=None), 'Error: Check Beam Section Data.'),
+    (dict(section_y=1.0, section_y_unit='furlongs per fortnight'), 'Error: Check Beam Section Data.'),
+])
+def test_bad_inputs(kwargs, message):
+    with pytest.raises(ValueError, match=message.replace('.', r'\.')):
+        normalize(**kwargs)
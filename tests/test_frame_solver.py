@@ -0,0 +1,29 @@
+import numpy as np
+from calculators.frame_solver import solve_frame
+
+YOUNGS_MODULUS = 2e11
+MOMENT_OF_INERTIA = 8e-6
+
+
+def test_truss_member_forces():
+    # a 4 m span, 1.5 m high triangle with a load at the apex: the rafters carry P / (2 sin) in
+    # compression and the tie the horizontal part of it in tension
+    load = 12e3
+    nodes = [[0.0, 0.0], [4.0, 0.0], [2.0, 1.5]]
+    members = [['Truss', 0, 1, YOUNGS_MODULUS, 1e-3, 0.0], ['Truss', 0, 2, YOUNGS_MODULUS, 1e-3, 0.0], ['Truss', 1, 2, YOUNGS_MODULUS, 1e-3, 0.0]]
+    results = solve_frame(nodes, members, [['Pinned', 0], ['Roller', 1]], [['Nodal Load', 2, 0.0, -load, 0.0]])
+    rafter = load / (2 * 0.6)
+    np.testing.assert_allclose(results['axial_force'], [rafter * 0.8, -rafter, -rafter])
+    np.testing.assert_allclose(results['reactions'][:2, 1], [load / 2, load / 2])
+
+
+def test_portal_frame_sway():
+    # fixed base portal with stiff axial members against slope deflection
+    height, width, load = 3.0, 4.0, 10e3
+    nodes = [[0, 0], [0, height], [width, height], [width, 0]]
+    members = [['Frame', a, b, YOUNGS_MODULUS, 10.0, MOMENT_OF_INERTIA] for a, b in [(0, 1), (1, 2), (2, 3)]]
+    results = solve_frame(nodes, members, [['Fixed', 0], ['Fixed', 3]], [['Nodal Load', 1, load, 0, 0]])
+    k = height / width
+    exact = load * height**3 / (2 * YOUNGS_MODULUS * MOMENT_OF_INERTIA * (12 - 36 / (4 + 6 * k)))
+    assert np.isclose(results['displacements'][1, 0], exact, rtol=1e-6)
+    assert np.isclose(np.sum(results['reactions'][[0, 3], 0]), -load)
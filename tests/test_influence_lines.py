@@ -0,0 +1,51 @@
+import numpy as np
+from calculators.beam_calculator import BeamSupports, solve_beam
+from calculators.influence_lines import influence_lines, moving_load
+
+OVERALL_LENGTH = 5.0
+MOMENT_OF_INERTIA = 8e-6
+YOUNGS_MODULUS = 2e11
+FIXTURES = [["Pinned/Roller", 0.0], ["Pinned/Roller", 3.0], ["Pinned/Roller", OVERALL_LENGTH]]
+
+
+def solve(loads_moments, fixtures=FIXTURES):
+    return solve_beam(loads_moments, fixtures, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N')
+
+
+def test_influence_line_matches_solve_beam():
+    supports = BeamSupports(FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS)
+    load_positions = [0.7, 2.2, 4.1]
+    station = 1.5
+    lines = influence_lines(supports, load_positions, [station])
+    for i, position in enumerate(load_positions):
+        results = solve([["Concentrated Force", position, None, 1.0]])
+        x = results['beam_x_values']
+        assert np.isclose(lines['moment'][0, i], np.interp(station, x, results['y_moment_plot']))
+        assert np.isclose(lines['deflection'][0, i], np.interp(station, x, results['y_deflection_plot']))
+        for line, reaction in zip(lines['reactions'], results['reactions']):
+            assert np.isclose(line[-1][i], reaction[-1], atol=1e-9)
+
+
+def test_single_axle_moment_envelope():
+    # one axle crossing a simple span peaks at P * L / 4 at midspan when it is over the middle
+    fixtures = [["Pinned/Roller", 0.0], ["Pinned/Roller", OVERALL_LENGTH]]
+    supports = BeamSupports(fixtures, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS)
+    envelope = moving_load(supports, [-1000.0], [0.0], np.linspace(0, OVERALL_LENGTH, 101), stations=[OVERALL_LENGTH / 2])
+    assert np.isclose(envelope['max_moment'][0], 1000.0 * OVERALL_LENGTH / 4)
+    assert np.isclose(envelope['max_moment_lead'][0], OVERALL_LENGTH / 2)
+
+
+def test_axle_train_matches_solve_beam():
+    supports = BeamSupports(FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS)
+    axle_loads, axle_offsets = [-2000.0, -1000.0], [0.0, 1.2]
+    lead_positions = np.linspace(0, OVERALL_LENGTH + 1.2, 13)
+    station = 1.5
+    envelope = moving_load(supports, axle_loads, axle_offsets, lead_positions, stations=[station])
+    moments = []
+    for lead in lead_positions:
+        loads_moments = [["Concentrated Force", lead - offset, None, load] for load, offset in zip(axle_loads, axle_offsets)
+                         if 0 <= lead - offset <= OVERALL_LENGTH]
+        results = solve(loads_moments)
+        moments.append(np.interp(station, results['beam_x_values'], results['y_moment_plot']))
+    assert np.isclose(envelope['max_moment'][0], max(moments))
+    assert np.isclose(envelope['min_moment'][0], min(moments))
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from calculators.beam_calculator import BeamResults, BeamSupports, solve_beam
+from calculators.load_combinations import default_combinations, load_combinations, parse_combination
+
+OVERALL_LENGTH = 6.0
+MOMENT_OF_INERTIA = 8e-6
+YOUNGS_MODULUS = 2e11
+FIXTURES = [["Pinned/Roller", 0.0], ["Pinned/Roller", 4.0]]
+LOAD_CASES = {
+    'D': [["Constant Distributed Load", 0.0, OVERALL_LENGTH, -500.0]],
+    'L': [["Concentrated Force", 2.0, None, -3000.0], ["Concentrated Force", OVERALL_LENGTH, None, -1000.0]],
+    'W': [["Concentrated Moment", 5.0, None, 2500.0]],
+}
+COMBINATIONS = {text: parse_combination(text) for text in ['1.4D', '1.2D + 1.6L', '0.9D - W', '1.2D + W + L']}
+
+
+def test_parse_combination():
+    assert parse_combination('1.2D + 1.6L + 0.5S') == {'D': 1.2, 'L': 1.6, 'S': 0.5}
+    assert parse_combination('1.2*D') == {'D': 1.2}
+    assert parse_combination('0.9D - W') == {'D': 0.9, 'W': -1.0}
+    assert parse_combination('D + 0.5Lr + D') == {'D': 2.0, 'Lr': 0.5}
+    assert all(parse_combination(text) for text in default_combinations)
+    for text in ['', '1.2', '1.2D +', '1.2D & L']:
+        with pytest.raises(ValueError):
+            parse_combination(text)
+
+
+def combination_results(factors):
+    loads_moments = [[load[0], load[1], load[2], load[3] * factor] for case, factor in factors.items() for load in LOAD_CASES[case]]
+    return solve_beam(loads_moments, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 120, 'm', 'N')
+
+
+def test_envelope_bounds_every_combination():
+    supports = BeamSupports(FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS)
+    envelope = load_combinations(supports, LOAD_CASES, COMBINATIONS, num_points=120)
+    names = ['shear', 'moment', 'angle', 'deflection']
+    governing = {name: [] for name in names}
+    solved = {}
+    for combination, factors in COMBINATIONS.items():
+        results = solved[combination] = combination_results(factors)
+        for name, key in zip(names, BeamResults.diagram_keys[1:]):
+            tolerance = 1e-9 * np.max(np.abs(envelope['max_' + name]))
+            assert np.all(results[key] <= envelope['max_' + name] + tolerance)
+            assert np.all(results[key] >= envelope['min_' + name] - tolerance)
+            # every combination's exact peak is inside the exact envelope peaks
+            peak = envelope['peaks'][names.index(name)]
+            assert peak['min'] - tolerance <= results['max_' + name] <= peak['max'] + tolerance
+            governing[name].append(results['max_' + name])
+        for row, reaction in zip(envelope['reactions'], results['reactions']):
+            assert row[5] - 1e-6 <= reaction[-1] <= row[3] + 1e-6
+    for name in names:
+        peak = envelope['peaks'][names.index(name)]
+        assert np.isclose(max(abs(peak['max']), abs(peak['min'])), np.max(np.abs(governing[name])))
+    # the named combination gives the envelope value at each station
+    for bound in ['max_', 'min_']:
+        values = [solved[combination]['y_moment_plot'][i] for i, combination in enumerate(envelope[bound + 'moment_combination'])]
+        np.testing.assert_allclose(values, envelope[bound + 'moment'], atol=1e-9 * np.max(np.abs(envelope['max_moment'])))
+
+
+def test_undefined_case():
+    supports = BeamSupports(FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS)
+    with pytest.raises(ValueError):
+        load_combinations(supports, LOAD_CASES, {'1.2D + 1.6S': parse_combination('1.2D + 1.6S')})
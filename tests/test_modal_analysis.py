@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from calculators.modal_analysis import modal_analysis
+
+OVERALL_LENGTH = 5.0
+MOMENT_OF_INERTIA = 8e-6
+YOUNGS_MODULUS = 2e11
+MASS_PER_LENGTH = 20.0
+
+
+def beam_frequency(beta_length):
+    '''Natural frequency (Hz) of a prismatic beam with the mode's beta * L.'''
+    return beta_length ** 2 / (2 * np.pi * OVERALL_LENGTH ** 2) * np.sqrt(YOUNGS_MODULUS * MOMENT_OF_INERTIA / MASS_PER_LENGTH)
+
+
+@pytest.mark.parametrize('fixtures, beta_lengths', [
+    ([["Pinned/Roller", 0.0], ["Pinned/Roller", OVERALL_LENGTH]], np.pi * np.arange(1, 4)),
+    ([["Fixed", 0.0]], [1.875104, 4.694091, 7.854757]),
+])
+def test_natural_frequencies(fixtures, beta_lengths):
+    results = modal_analysis(fixtures, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, MASS_PER_LENGTH)
+    np.testing.assert_allclose(results['frequencies'], [beam_frequency(b) for b in beta_lengths], rtol=1e-4)
@@ -0,0 +1,32 @@
+import numpy as np
+from calculators.beam_calculator import BeamResults, solve_beam
+from calculators.nonprismatic_beam import solve_nonprismatic_beam
+
+OVERALL_LENGTH = 5.0
+MOMENT_OF_INERTIA = 8e-6
+YOUNGS_MODULUS = 2e11
+LOADS_MOMENTS = [["Concentrated Force", 1.5, None, -1000.0], ["Concentrated Moment", 2.5, None, 800.0],
+                 ["Constant Distributed Load", 2.0, 4.5, -400.0]]
+FIXTURES = [["Fixed", 0.0], ["Pinned/Roller", 3.0], ["Pinned/Roller", OVERALL_LENGTH]]
+
+
+def test_uniform_sections_match_solve_beam():
+    sections = [[1.0, 4.0, MOMENT_OF_INERTIA, MOMENT_OF_INERTIA, YOUNGS_MODULUS]]
+    results = solve_nonprismatic_beam(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, sections, 100, 'm', 'N')
+    expected = solve_beam(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N')
+    for key in BeamResults.diagram_keys:
+        np.testing.assert_allclose(results[key], expected[key], rtol=1e-8, atol=1e-8 * np.max(np.abs(expected[key])))
+    np.testing.assert_allclose([row[-1] for row in results['reactions'][2:]], [row[-1] for row in expected['reactions'][2:]], rtol=1e-8)
+
+
+def test_stepped_cantilever_tip_deflection():
+    # a stiffer root from 0 to a: u(L) = P / 3 * ((L^3 - (L - a)^3) / EI_root + (L - a)^3 / EI)
+    load, step = -1000.0, 2.0
+    root_inertia = 3 * MOMENT_OF_INERTIA
+    sections = [[0.0, step, root_inertia, root_inertia, YOUNGS_MODULUS]]
+    results = solve_nonprismatic_beam([["Concentrated Force", OVERALL_LENGTH, None, load]], [["Fixed", 0.0]], OVERALL_LENGTH,
+                                      MOMENT_OF_INERTIA, YOUNGS_MODULUS, sections, 100, 'm', 'N')
+    outer = (OVERALL_LENGTH - step) ** 3
+    expected = load / 3 * ((OVERALL_LENGTH ** 3 - outer) / (YOUNGS_MODULUS * root_inertia) + outer / (YOUNGS_MODULUS * MOMENT_OF_INERTIA))
+    assert np.isclose(results['max_deflection'], expected, rtol=1e-9)
+    assert results['max_deflection_pos'] == OVERALL_LENGTH
@@ -0,0 +1,45 @@
+import numpy as np
+from calculators.beam_calculator import BeamResults, solve_beam
+from calculators.plot_downsampling import default_plot_buckets, downsample_results, min_max_indices, resample_results
+
+LOADS_MOMENTS = [["Concentrated Force", 1.5, None, -1000.0], ["Concentrated Moment", 4.5, None, 800.0],
+                 ["Constant Distributed Load", 2.0, 7.0, -400.0], ["Linear Distributed Load", 6.0, 9.5, -200.0]]
+FIXTURES = [["Fixed", 0.0], ["Pinned/Roller", 4.0], ["Pinned/Roller", 8.0]]
+
+
+def solve(num_points, adaptive_tolerance=None):
+    return solve_beam(LOADS_MOMENTS, FIXTURES, 10.0, 8e-6, 2e11, num_points, 'm', 'N', adaptive_tolerance=adaptive_tolerance)
+
+
+def test_small_windows_are_kept_whole():
+    x = np.linspace(0, 1, 4 * default_plot_buckets)
+    np.testing.assert_array_equal(min_max_indices(x, np.sin(x)), np.arange(len(x)))
+
+
+def test_large_results_are_decimated_with_their_peaks():
+    results = solve(100000)
+    downsampled = downsample_results(results)
+    num_series = len(BeamResults.diagram_keys)
+    assert len(downsampled['beam_x_values']) <= default_plot_buckets * (2 + 2 * num_series)
+    assert len(downsampled['beam_x_values']) < len(results['beam_x_values']) / 10
+    for key in BeamResults.diagram_keys:
+        assert np.max(downsampled[key]) == np.max(results[key])
+        assert np.min(downsampled[key]) == np.min(results[key])
+
+
+def test_zoom_resamples_the_window():
+    results = solve(250, adaptive_tolerance=1e-3)
+    x_range = (4.2, 4.8)
+    full = downsample_results(results)
+    zoomed = downsample_results(resample_results(results, x_range), x_range=x_range)
+    inside = lambda x: np.count_nonzero((x >= x_range[0]) & (x <= x_range[1]))
+    assert inside(zoomed['beam_x_values']) > 10 * inside(full['beam_x_values'])
+    assert zoomed['beam_x_values'][0] == x_range[0] and zoomed['beam_x_values'][-1] == x_range[1]
+    # the window still goes through the exact moment jump of the couple at 4.5
+    moment = zoomed['y_moment_plot'][zoomed['beam_x_values'] == 4.5]
+    assert len(moment) >= 2 and np.isclose(abs(moment[-1] - moment[0]), 800.0)
+
+
+def test_zoom_off_the_beam_keeps_the_results():
+    results = solve(250, adaptive_tolerance=1e-3)
+    assert resample_results(results, (11.0, 12.0)) is results
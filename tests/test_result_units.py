@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from pint import DimensionalityError, UndefinedUnitError
+from calculators.beam_calculator import BeamSupports, solve_beam
+from calculators.load_combinations import load_combinations, parse_combination
+from calculators.result_units import ResultView
+from calculators.unit_conversion import Q
+
+LOADS_MOMENTS = [["Concentrated Force", 1.5, None, -1000.0], ["Concentrated Moment", 2.5, None, 800.0],
+                 ["Constant Distributed Load", 2.0, 4.5, -400.0]]
+FIXTURES = [["Fixed", 0.0], ["Pinned/Roller", 3.0]]
+
+
+def solve():
+    return solve_beam(LOADS_MOMENTS, FIXTURES, 5.0, 8e-6, 2e11, 100, 'm', 'N')
+
+
+def scale(si_unit, unit):
+    return Q(1.0, si_unit).to(unit).magnitude
+
+
+def test_view_converts_on_read():
+    results = solve()
+    view = ResultView(results, 'mm', 'kN')
+    np.testing.assert_allclose(view['beam_x_values'], results['beam_x_values'] * 1e3)
+    np.testing.assert_allclose(view['y_force_plot'], results['y_force_plot'] * scale('N/m', 'kN/mm'))
+    np.testing.assert_allclose(view['y_moment_plot'], results['y_moment_plot'] * scale('N*m', 'kN*mm'))
+    np.testing.assert_allclose(view['y_angle_plot'], results['y_angle_plot'])
+    assert view['max_deflection'] == pytest.approx(results['max_deflection'] * 1e3)
+    assert view['length_unit'] == 'mm' and view['force_unit'] == 'kN'
+    assert view['loads_moments'][1] == ['Concentrated Moment', pytest.approx(2500.0), None, pytest.approx(800.0 * scale('N*m', 'kN*mm'))]
+    assert view['fixtures'][1] == ['Pinned/Roller', pytest.approx(3000.0)]
+    for row, si_row in zip(view['reactions'], results['reactions']):
+        if si_row[0] <= 2:
+            assert row == si_row  # integration constants stay SI
+        else:
+            assert row[3] == pytest.approx(si_row[3] * (scale('N*m', 'kN*mm') if row[1] == 'Moment' else 1e-3))
+
+
+def test_results_are_never_changed():
+    results = solve()
+    x_values = results['beam_x_values']
+    for length_unit, force_unit in [('in', 'lbf'), ('ft', 'kip'), ('mm', 'kN')] * 3:
+        ResultView(results, length_unit, force_unit)['beam_x_values']
+    assert results['beam_x_values'] is x_values
+    # SI views hand the stored arrays through
+    assert ResultView(results)['y_shear_plot'] is results['y_shear_plot']
+    assert set(ResultView(results)) == set(results) and len(ResultView(results)) == len(results)
+
+
+def test_envelope_view():
+    supports = BeamSupports(FIXTURES, 5.0, 8e-6, 2e11)
+    envelope = load_combinations(supports, {'D': LOADS_MOMENTS[:1], 'L': LOADS_MOMENTS[1:]}, {'1.2D + 1.6L': parse_combination('1.2D + 1.6L')})
+    view = ResultView(envelope, 'in', 'lbf')
+    np.testing.assert_allclose(view['stations'], envelope['stations'] * scale('m', 'in'))
+    np.testing.assert_allclose(view['min_moment'], envelope['min_moment'] * scale('N*m', 'lbf*in'))
+    assert view['reactions'][-1][4] == '1.2D + 1.6L'
+    assert view['reactions'][-1][3] == pytest.approx(envelope['reactions'][-1][3] * scale('N', 'lbf'))
+    peak = view['peaks'][1]
+    assert peak['max'] == pytest.approx(envelope['peaks'][1]['max'] * scale('N*m', 'lbf*in'))
+    assert peak['max_pos'] == pytest.approx(envelope['peaks'][1]['max_pos'] * scale('m', 'in'))
+
+
+@pytest.mark.parametrize('length_unit, force_unit', [('kg', 'N'), ('m', 'not_a_unit')])
+def test_bad_unit_raises_up_front(length_unit, force_unit):
+    with pytest.raises((DimensionalityError, UndefinedUnitError)):
+        ResultView(solve(), length_unit, force_unit)
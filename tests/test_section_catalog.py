@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from calculators.beam_calculator import materials, solve_beam
+from calculators.section_catalog import (INCH, STANDARD_GRAVITY, TUBE_DESIGN_WALL, lightest_sections, rectangular_tube_properties,
+                                         rounded_rectangle_properties, section_catalog)
+from calculators.section_properties import section_properties
+
+OVERALL_LENGTH = 3.0
+LOADS_MOMENTS = [["Concentrated Force", 1.0, None, -2000.0], ["Constant Distributed Load", 0.0, 2.0, -500.0]]
+FIXTURES = [["Pinned/Roller", 0.0], ["Pinned/Roller", OVERALL_LENGTH]]
+
+
+def self_weight_solve(row):
+    youngs_modulus = materials[row['material']].modulus.to('Pa').magnitude
+    loads_moments = LOADS_MOMENTS + [["Constant Distributed Load", 0.0, OVERALL_LENGTH, -row['weight_per_length']]]
+    return solve_beam(loads_moments, FIXTURES, OVERALL_LENGTH, row['moment_of_inertia'], youngs_modulus, 100, 'm', 'N')
+
+
+def rounded_rectangle(depth, width, radius, num_arc=400):
+    corners = [(width / 2 - radius, depth / 2 - radius), (-width / 2 + radius, depth / 2 - radius),
+               (-width / 2 + radius, -depth / 2 + radius), (width / 2 - radius, -depth / 2 + radius)]
+    angles = np.linspace(0, np.pi / 2, num_arc)
+    return np.concatenate([np.column_stack([x + radius * np.cos(angles + k * np.pi / 2), y + radius * np.sin(angles + k * np.pi / 2)])
+                           for k, (x, y) in enumerate(corners)])
+
+
+def test_lightest_sections_match_solve_beam_with_self_weight():
+    rows = lightest_sections(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, deflection_ratio=360, families=['Rectangular Tube', 'Wide Flange'], num_results=5)
+    assert len(rows) == 5
+    assert [row['weight_per_length'] for row in rows] == sorted(row['weight_per_length'] for row in rows)
+    for row in rows:
+        results = self_weight_solve(row)
+        assert np.isclose(row['max_deflection'], results['max_deflection'])
+        assert np.isclose(row['max_deflection_pos'], results['max_deflection_pos'])
+        assert np.isclose(row['max_bending_stress'], abs(results['max_moment']) * row['section_y'] / row['moment_of_inertia'])
+        assert abs(row['max_deflection']) <= OVERALL_LENGTH / 360 and row['safety_factor'] >= 1.0
+
+
+def test_nothing_lighter_is_feasible():
+    material_options = {name: materials[name] for name in ['Aluminum 6061-T6', 'AISI 1020 Steel', 'Polycarbonate']}
+    rows = lightest_sections(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, max_deflection=0.01, min_safety_factor=2.0,
+                             material_options=material_options, families=['Flat Bar'], num_results=1)
+    catalog = {key: values[section_catalog['family'] == 'Flat Bar'] for key, values in section_catalog.items()}
+    checked = 0
+    for i, name in enumerate(catalog['name']):
+        for material_name, material in material_options.items():
+            weight = catalog['area'][i] * material.density.to('kg/m**3').magnitude * STANDARD_GRAVITY
+            if weight >= rows[0]['weight_per_length']:
+                continue
+            results = self_weight_solve({'material': material_name, 'weight_per_length': weight, 'moment_of_inertia': catalog['moment_of_inertia'][i]})
+            stress = abs(results['max_moment']) * catalog['section_y'][i] / catalog['moment_of_inertia'][i]
+            assert abs(results['max_deflection']) > 0.01 or material.yield_strength.to('Pa').magnitude / stress < 2.0, (name, material_name)
+            checked += 1
+    assert checked > 10
+
+
+def test_wide_flanges_use_the_tabulated_properties():
+    i = list(section_catalog['name']).index('W8x18')
+    assert np.isclose(section_catalog['area'][i], 5.26 * INCH**2)
+    assert np.isclose(section_catalog['moment_of_inertia'][i], 61.9 * INCH**4)
+    assert np.isclose(section_catalog['moment_of_inertia'][i] / section_catalog['section_y'][i], 15.2 * INCH**3)
+
+
+def test_rectangular_tubes_weigh_the_nominal_wall_and_bend_on_the_design_wall():
+    i = list(section_catalog['name']).index('Rect Tube 4 x 2 x 0.250')
+    area, moment_of_inertia, _ = rectangular_tube_properties(4.0, 2.0, 0.25)
+    assert np.isclose(section_catalog['area'][i], area * INCH**2)
+    # the design wall with an outer corner radius of twice the wall, integrated as a polygon
+    wall = TUBE_DESIGN_WALL * 0.25
+    polygon = section_properties([{'outer': rounded_rectangle(4.0, 2.0, 2 * wall), 'holes': [rounded_rectangle(4.0 - 2 * wall, 2.0 - 2 * wall, wall)]}])
+    assert section_catalog['moment_of_inertia'][i] / INCH**4 == pytest.approx(polygon['ixx'], rel=1e-5)
+    assert section_catalog['moment_of_inertia'][i] < moment_of_inertia * INCH**4
+
+
+def test_rounded_rectangle_matches_the_polygon():
+    area, moment_of_inertia = rounded_rectangle_properties(4.0, 2.0, 0.5)
+    polygon = section_properties([rounded_rectangle(4.0, 2.0, 0.5)])
+    assert area == pytest.approx(polygon['area'], rel=1e-5)
+    assert moment_of_inertia == pytest.approx(polygon['ixx'], rel=1e-5)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from calculators.section_properties import circle, property_cache, rectangle, section_properties
+
+
+def test_rectangle():
+    width, height = 0.05, 0.12
+    results = section_properties([rectangle(width, height, x=0.3, y=-0.2)])
+    assert np.isclose(results['area'], width * height)
+    assert np.isclose(results['centroid_x'], 0.3) and np.isclose(results['centroid_y'], -0.2)
+    assert np.isclose(results['ixx'], width * height**3 / 12) and np.isclose(results['iyy'], height * width**3 / 12)
+    assert np.isclose(results['ixy'], 0.0, atol=1e-15)
+    assert np.isclose(results['section_y'], height / 2)
+    assert np.isclose(results['section_modulus_top'], width * height**2 / 6)
+
+
+def test_hollow_rectangle_either_orientation():
+    outer, inner = rectangle(0.1, 0.2), rectangle(0.08, 0.17)
+    results = section_properties([{'outer': outer, 'holes': [inner[::-1]]}])
+    assert np.isclose(results['area'], 0.1 * 0.2 - 0.08 * 0.17)
+    assert np.isclose(results['ixx'], (0.1 * 0.2**3 - 0.08 * 0.17**3) / 12)
+    assert section_properties([{'outer': outer[::-1], 'holes': [inner]}]) == results
+
+
+def test_round_tube():
+    outer, inner = 0.1, 0.08
+    results = section_properties([{'outer': circle(outer), 'holes': [circle(inner)]}])
+    # the 256 sided polygons are low by about 3e-4
+    assert results['area'] == pytest.approx(np.pi / 4 * (outer**2 - inner**2), rel=1e-3)
+    assert results['ixx'] == pytest.approx(np.pi / 64 * (outer**4 - inner**4), rel=1e-3)
+    assert results['ixx'] == pytest.approx(results['iyy'])
+
+
+def test_offset_tee_parallel_axis():
+    # a 100 x 10 flange on a 10 x 90 web
+    flange, web = rectangle(0.1, 0.01, y=0.095), rectangle(0.01, 0.09, y=0.045)
+    results = section_properties([flange, web])
+    areas, centroids = np.array([0.001, 0.0009]), np.array([0.095, 0.045])
+    centroid = areas @ centroids / areas.sum()
+    ixx = 0.1 * 0.01**3 / 12 + 0.01 * 0.09**3 / 12 + areas @ (centroids - centroid) ** 2
+    assert np.isclose(results['centroid_y'], centroid) and np.isclose(results['ixx'], ixx)
+    assert np.isclose(results['section_y'], centroid)  # the bottom of the web is further than the top of the flange
+    assert np.isclose(results['principal_angle'], 0.0, atol=1e-12)
+
+
+def test_results_are_cached_by_geometry():
+    property_cache.clear()
+    results = section_properties([rectangle(1.0, 2.0)])
+    results['area'] = -1.0  # callers get a copy
+    assert section_properties([rectangle(1.0, 2.0).tolist()])['area'] == 2.0
+    assert len(property_cache) == 1
+
+
+def test_bad_geometry():
+    with pytest.raises(ValueError):
+        section_properties([[[0, 0], [1, 0]]])
+    with pytest.raises(ValueError):
+        section_properties([])
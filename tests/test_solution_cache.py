@@ -0,0 +1,71 @@
+import numpy as np
+from calculators.beam_calculator import solve_beam
+from calculators.beam_inputs import unit_scale
+from calculators.solution_cache import SolutionCache, cached_solve_beam, canonical_beam_key
+
+OVERALL_LENGTH = 5.0
+MOMENT_OF_INERTIA = 8e-6
+YOUNGS_MODULUS = 2e11
+LOADS_MOMENTS = [["Concentrated Force", 1.5, None, -1000.0], ["Constant Distributed Load", 2.0, 4.0, -400.0]]
+FIXTURES = [["Fixed", 0.0], ["Pinned/Roller", 3.0]]
+
+
+def cached_solve(cache, loads_moments=LOADS_MOMENTS, fixtures=FIXTURES, moment_of_inertia=MOMENT_OF_INERTIA, youngs_modulus=YOUNGS_MODULUS):
+    return cached_solve_beam(loads_moments, fixtures, OVERALL_LENGTH, moment_of_inertia, youngs_modulus, 100, 'm', 'N', cache=cache)
+
+
+def point_load(position):
+    return [["Concentrated Force", position, None, -1000.0]]
+
+
+def test_reordered_and_unit_equivalent_inputs_share_a_key():
+    key = canonical_beam_key(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, 100, 'm', 'N')
+    assert canonical_beam_key(LOADS_MOMENTS[::-1], FIXTURES[::-1], OVERALL_LENGTH, 100, 'm', 'N') == key
+    # 10 ft and 120 in only differ by float noise once converted to m
+    feet, inches = 10 * unit_scale('ft', 'm'), 120 * unit_scale('in', 'm')
+    assert feet != inches
+    assert (canonical_beam_key(point_load(feet / 2), [["Fixed", 0.0]], feet, 100, 'm', 'N')
+            == canonical_beam_key(point_load(inches / 2), [["Fixed", -0.0]], inches, 100, 'm', 'N'))
+    # "None" rows and the unused end position of point loads do not change the key
+    loads_moments = [["Concentrated Force", 1.5, 1.0, -1000.0], ["None", 0.0, 0.0, 0.0]] + LOADS_MOMENTS[1:]
+    assert canonical_beam_key(loads_moments, FIXTURES, OVERALL_LENGTH, 100, 'm', 'N') == key
+    assert canonical_beam_key(point_load(1.5), FIXTURES, OVERALL_LENGTH, 100, 'm', 'N') != key
+
+
+def test_lru_eviction_and_counters():
+    cache = SolutionCache(max_entries=2)
+    first, second, third = point_load(1.0), point_load(2.0), point_load(3.0)
+    results = cached_solve(cache, first)
+    cached_solve(cache, second)
+    assert cached_solve(cache, first) is results  # first is now the most recently used
+    cached_solve(cache, third)  # evicts second
+    assert cache.info()['entries'] == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+    cached_solve(cache, first)
+    cached_solve(cache, second)
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert cache.info()['hit_rate'] == 2 / 6
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / 'solutions.db')
+    results = cached_solve(SolutionCache(path=path))
+    cache = SolutionCache(path=path)
+    reloaded = cached_solve(cache)
+    assert (cache.hits, cache.disk_hits, cache.misses) == (0, 1, 0)
+    assert [row[-1] for row in reloaded['reactions']] == [row[-1] for row in results['reactions']]
+    for key in ['y_moment_plot', 'y_deflection_plot', 'max_deflection']:
+        np.testing.assert_array_equal(reloaded[key], results[key])
+    cached_solve(cache)
+    assert cache.hits == 1
+
+
+def test_cache_rescales_on_a_rigidity_change():
+    cache = SolutionCache()
+    cached_solve(cache)
+    rescaled = cached_solve(cache, moment_of_inertia=2 * MOMENT_OF_INERTIA, youngs_modulus=0.5 * YOUNGS_MODULUS / 3)
+    assert cache.misses == 1
+    fresh = solve_beam(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, 2 * MOMENT_OF_INERTIA, 0.5 * YOUNGS_MODULUS / 3, 100, 'm', 'N')
+    for key in ['y_moment_plot', 'y_angle_plot', 'y_deflection_plot']:
+        np.testing.assert_allclose(rescaled[key], fresh[key], rtol=1e-9, atol=1e-12)
+    assert np.isclose(rescaled['max_deflection'], fresh['max_deflection'])
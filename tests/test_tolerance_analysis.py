@@ -0,0 +1,45 @@
+import numpy as np
+from calculators.beam_calculator import solve_beam
+from calculators.tolerance_analysis import tolerance_analysis
+
+OVERALL_LENGTH = 5.0
+MOMENT_OF_INERTIA = 8e-6
+YOUNGS_MODULUS = 2e11
+SECTION_Y = 0.05
+LOADS_MOMENTS = [["Concentrated Force", 1.5, None, -1000.0], ["Constant Distributed Load", 2.0, 4.5, -400.0]]
+FIXTURES = [["Fixed", 0.0], ["Pinned/Roller", 3.0], ["Pinned/Roller", OVERALL_LENGTH]]
+
+
+def nominal():
+    return solve_beam(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, 100, 'm', 'N')
+
+
+def test_no_scatter_matches_solve_beam():
+    results = tolerance_analysis(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, YOUNGS_MODULUS, SECTION_Y, num_samples=10)
+    expected = nominal()
+    peak = np.argmax(np.abs(expected['y_deflection_plot']))
+    np.testing.assert_allclose(results['max_deflection_samples'], expected['y_deflection_plot'][peak])
+    np.testing.assert_allclose(results['max_bending_stress_samples'], np.max(np.abs(expected['y_moment_plot'])) * SECTION_Y / MOMENT_OF_INERTIA)
+    for envelope in results['deflection']:
+        np.testing.assert_allclose(envelope, expected['y_deflection_plot'], atol=1e-12)
+
+
+def test_modulus_scatter_scales_the_deflection():
+    low, high = 0.9 * YOUNGS_MODULUS, 1.1 * YOUNGS_MODULUS
+    results = tolerance_analysis(LOADS_MOMENTS, FIXTURES, OVERALL_LENGTH, MOMENT_OF_INERTIA, ('uniform', low, high), SECTION_Y, num_samples=2000, seed=1)
+    expected = np.max(np.abs(nominal()['y_deflection_plot']))
+    deflection = np.abs(results['max_deflection_samples'])
+    assert np.all((deflection >= expected * YOUNGS_MODULUS / high * (1 - 1e-9)) & (deflection <= expected * YOUNGS_MODULUS / low * (1 + 1e-9)))
+    assert np.ptp(deflection) > 0.1 * expected
+    # the stress does not depend on E
+    np.testing.assert_allclose(results['max_bending_stress_samples'], results['max_bending_stress_samples'][0])
+    assert list(results['percentiles']) == [5, 50, 95] and np.all(np.diff(results['max_bending_stress']) >= 0)
+
+
+def test_process_pool_matches_one_process():
+    spec = dict(num_samples=200, seed=3)
+    loads_moments = [["Concentrated Force", ('normal', 1.5, 0.05), None, ('triangular', -1100.0, -1000.0, -950.0)]] + LOADS_MOMENTS[1:]
+    single = tolerance_analysis(loads_moments, FIXTURES, OVERALL_LENGTH, ('lognormal', MOMENT_OF_INERTIA, 0.02), YOUNGS_MODULUS, SECTION_Y, **spec)
+    pooled = tolerance_analysis(loads_moments, FIXTURES, OVERALL_LENGTH, ('lognormal', MOMENT_OF_INERTIA, 0.02), YOUNGS_MODULUS, SECTION_Y, processes=2, **spec)
+    np.testing.assert_allclose(pooled['max_deflection_samples'], single['max_deflection_samples'])
+    np.testing.assert_allclose(pooled['max_bending_stress_samples'], single['max_bending_stress_samples'])
@@ -1,11 +1,20 @@
 from nicegui import ui
 from calculators.beam_calculator import *
+from calculators.solution_cache import cached_solve_beam
+from calculators.beam_inputs import normalize_beam_inputs, to_si, unit_scale
+from calculators.load_combinations import load_case_names, default_combinations, parse_combination, load_combinations, generate_envelope_plot
+from calculators.plot_downsampling import downsample_results, resample_results, relayout_x_range
+from calculators.result_units import ResultView
+from calculators.section_catalog import section_catalog, section_names, lightest_sections, catalog_basis
+from calculators.section_properties import section_properties
+from calculators.modal_analysis import modal_analysis, generate_mode_plot
 from calculators.unit_conversion import * #second_moment_of_area_units, density_units, stress_units, length_units, force_units, distributed_force_units, torque_units, area_units, u, Q
 
 
 class BeamCalculatorPage:
     def __init__(self):
         self.is_updating = False
+        self.is_updating_section = False
         self.results = {
         'fixtures': [],
         'loads_moments': [],
@@ -18,13 +27,24 @@ class BeamCalculatorPage:
         'y_moment_plot': None,
         'y_angle_plot': None,
         'y_deflection_plot': None,
+        'max_shear': 0.0,
+        'max_shear_pos': 0.0,
+        'max_moment': 0.0,
+        'max_moment_pos': 0.0,
+        'max_angle': 0.0,
+        'max_angle_pos': 0.0,
         'max_deflection': 0.0,
         'max_deflection_pos': 0.0,
         'length_unit': 'm',
         'force_unit': 'N'
         }
         self.fixtures = []
+        self.loads_moments = []
+        self.load_cases = {}
+        self.beam_length_m = None
         self.distr_load_rows = []
+        self.section_rows = []
+        self.envelope = None
         self.build_ui()
 
 
@@ -34,18 +54,23 @@ class BeamCalculatorPage:
         ui.label('Inputs and Beam Setup').classes("h1")
         with ui.card().classes('w-80'):
             ui.label('Beam Inputs').classes("h2")
+            self.section_quickselect = ui.select(label='Standard Section', options=section_names + ['Custom'], value='Custom', with_input=True, on_change=self.section_change).classes('w-64')
             with ui.row():
                 self.beam_length = ui.number(label='Beam Length', value=48, min=0.0)
                 self.beam_length_unit = ui.select(options=length_units, value='in')
             with ui.row():
-                self.second_moment_area = ui.number(label='Second Moment of Area', value=0.55176, min=0.0)
-                self.second_moment_area_unit = ui.select(options=second_moment_of_area_units, value='in⁴')
+                self.second_moment_area = ui.number(label='Second Moment of Area', value=0.55176, min=0.0, on_change=self.section_prop_change)
+                self.second_moment_area_unit = ui.select(options=second_moment_of_area_units, value='in⁴', on_change=self.section_prop_change)
             with ui.row():
-                self.cross_section_area = ui.number(label="(Optional) Cross Sectional Area", value=0.9375, min=0.0)
-                self.cross_section_area_unit = ui.select(options=area_units, value="in²")
+                self.cross_section_area = ui.number(label="(Optional) Cross Sectional Area", value=0.9375, min=0.0, on_change=self.section_prop_change)
+                self.cross_section_area_unit = ui.select(options=area_units, value="in²", on_change=self.section_prop_change)
             with ui.row():
-                self.section_y = ui.number(label="(Optional) Distance from Neutral Axis", value=1.0, min=0.0)
-                self.section_y_unit = ui.select(options=length_units, value="in")
+                self.section_y = ui.number(label="(Optional) Distance from Neutral Axis", value=1.0, min=0.0, on_change=self.section_prop_change)
+                self.section_y_unit = ui.select(options=length_units, value="in", on_change=self.section_prop_change)
+            with ui.expansion(text='Section From Vertices'):
+                self.section_vertices = ui.textarea(label='x, y per line', placeholder='blank line between shapes, "hole" before each hole',
+                                                    on_change=self.section_vertices_change).classes('w-64')
+                self.section_vertices_unit = ui.select(options=length_units, value='in', on_change=self.section_vertices_change)
         with ui.card().classes('w-80'):
             ui.label('Material Inputs').classes('text-md').classes("h2")
             self.material_quickselect = ui.select(label='Material Selection', options=materials_list, value='Custom', on_change=self.material_change).classes('w-64')
@@ -92,6 +117,7 @@ class BeamCalculatorPage:
                     ui.label('Position Unit').style('width: 120px')
                     ui.label('Load Value').style('width: 120px')
                     ui.label('Load Unit').style('width: 120px')
+                    ui.label('Case').style('width: 70px')
                     ui.label('').style('width: 40px')
                 
                 # Container for data rows
@@ -115,6 +141,7 @@ class BeamCalculatorPage:
                     ui.label('Load Start Value').style('width: 130px')
                     ui.label('Load End Value').style('width: 130px')
                     ui.label('Load Unit').style('width: 120px')
+                    ui.label('Case').style('width: 70px')
                     ui.label('').style('width: 40px')
                 
                 # Container for data rows
@@ -170,7 +197,76 @@ class BeamCalculatorPage:
                                         columns=reactions_table_columns,
                                         column_defaults={'align': 'left','headerClasses': 'table-header',}) #uppercase text-secondary
         
-        self.beam_plot = ui.plotly(generate_beam_plot(self.results)).classes('w-full')
+        # the figure is built once, later results only patch its data, ranges and titles.
+        # ui.plotly only forwards plotly_* events once it has drawn a figure with a config, so it gets one
+        self.beam_plot = ui.plotly({**beam_plot_figure(self.results), 'config': {'responsive': True}}).classes('w-full')
+        self.beam_plot.on('plotly_relayout', self.beam_plot_zoomed)
+
+        with ui.expansion(text="Material Comparison"):
+            material_table_columns = [
+                {'name': 'Material', 'label': 'Material', 'field': 'Material'},
+                {'name': 'Max Deflection', 'label': 'Max Deflection (mm)', 'field': 'Max Deflection'},
+                {'name': 'Max Bending Stress', 'label': 'Max Bending Stress (MPa)', 'field': 'Max Bending Stress'},
+                {'name': 'FoS', 'label': 'FoS', 'field': 'FoS'},
+            ]
+            self.material_table = ui.table(rows=[],
+                                           columns=material_table_columns,
+                                           column_defaults={'align': 'left','headerClasses': 'table-header',})
+
+        with ui.expansion(text="Lightest Section Search"):
+            ui.label('Screens every standard section in every material for the last solved beam.')
+            ui.label(catalog_basis).classes('text-xs text-gray-500')
+            with ui.row().classes('items-center gap-2'):
+                self.deflection_ratio = ui.number(label='Deflection Limit (L / ...)', value=360, min=1.0)
+                self.min_safety_factor = ui.number(label='Minimum FoS', value=2.0, min=0.0)
+                self.include_self_weight = ui.checkbox('Include Weight of Beam', value=True)
+                ui.button('Find Lightest Sections', on_click=self.find_lightest_sections)
+            section_table_columns = [
+                {'name': 'Section', 'label': 'Section', 'field': 'Section'},
+                {'name': 'Material', 'label': 'Material', 'field': 'Material'},
+                {'name': 'Weight', 'label': 'Weight (N/m)', 'field': 'Weight'},
+                {'name': 'Max Deflection', 'label': 'Max Deflection (mm)', 'field': 'Max Deflection'},
+                {'name': 'Max Bending Stress', 'label': 'Max Bending Stress (MPa)', 'field': 'Max Bending Stress'},
+                {'name': 'FoS', 'label': 'FoS', 'field': 'FoS'},
+            ]
+            self.section_table = ui.table(rows=[],
+                                          columns=section_table_columns,
+                                          column_defaults={'align': 'left','headerClasses': 'table-header',})
+
+        with ui.expansion(text="Natural Frequencies"):
+            ui.label('Modes of the last solved beam, with the mass from the density and cross sectional area.')
+            with ui.row().classes('items-center gap-2'):
+                self.num_modes = ui.number(label='Number of Modes', value=3, min=1, precision=0)
+                self.added_mass = ui.number(label='(Optional) Carried Mass per Length', value=0.0, min=0.0)
+                self.added_mass_unit = ui.select(options=['kg/m', 'lb/ft', 'lb/in'], value='kg/m')
+                ui.button('Find Natural Frequencies', on_click=self.find_natural_frequencies)
+            modes_table_columns = [
+                {'name': 'Mode', 'label': 'Mode', 'field': 'Mode'},
+                {'name': 'Frequency', 'label': 'Frequency (Hz)', 'field': 'Frequency'},
+            ]
+            self.modes_table = ui.table(rows=[],
+                                        columns=modes_table_columns,
+                                        column_defaults={'align': 'left','headerClasses': 'table-header',})
+            self.mode_plot = ui.plotly(generate_mode_plot({'fixtures': [], 'frequencies': [], 'mode_x_values': [], 'mode_shapes': []})).classes('w-full')
+
+        with ui.expansion(text="Load Combinations"):
+            ui.label('Envelopes of factored combinations of the load cases (the Case column of each load) for the last solved beam.')
+            with ui.row().classes('items-center gap-2'):
+                self.combinations_input = ui.textarea(label='Combinations (one per line)', value='\n'.join(default_combinations)).classes('w-80')
+                ui.button('Find Envelopes', on_click=self.find_load_combination_envelopes)
+            envelope_table_columns = [
+                {'name': 'Result', 'label': 'Result', 'field': 'Result'},
+                {'name': 'Max', 'label': 'Max', 'field': 'Max'},
+                {'name': 'Max Location', 'label': 'Location (m)', 'field': 'Max Location'},
+                {'name': 'Max Combination', 'label': 'Combination', 'field': 'Max Combination'},
+                {'name': 'Min', 'label': 'Min', 'field': 'Min'},
+                {'name': 'Min Location', 'label': 'Location (m)', 'field': 'Min Location'},
+                {'name': 'Min Combination', 'label': 'Combination', 'field': 'Min Combination'},
+            ]
+            self.envelope_table = ui.table(rows=[],
+                                           columns=envelope_table_columns,
+                                           column_defaults={'align': 'left','headerClasses': 'table-header',})
+            self.envelope_plot = ui.plotly({}).classes('w-full')
 
         with ui.expansion(text="Calculator Information"):
             ui.restructured_text('''
@@ -195,8 +291,9 @@ class BeamCalculatorPage:
             
     def fill_reactions_table(self):
         reactions_table = []
-        moment_units = f"{self.results['force_unit']} * {self.results['length_unit']}"
-        for reaction in self.results['reactions']:
+        results = self.display_results()
+        moment_units = f"{results['force_unit']} * {results['length_unit']}"
+        for reaction in results['reactions']:
             if reaction[0] > 2: # skip integration constants
                 if reaction[1] == 'Moment':
                     reactions_table.append({'Reaction': reaction[1],
@@ -207,84 +304,63 @@ class BeamCalculatorPage:
                     reactions_table.append({'Reaction': reaction[1],
                                             'Location': f"{reaction[2]:.4f}",
                                             'Value': f"{reaction[3]:.4f}",
-                                            'Units': self.results['force_unit']})
+                                            'Units': results['force_unit']})
         return reactions_table
 
-    def convert_plot_units(self, new_length_unit:str, new_force_unit:str):
-        converted_results = self.results
-        old_length_unit = self.results['length_unit']
-        old_force_unit = self.results['force_unit']
+    def fill_material_table(self, moment_of_inertia, section_y):
+        # every material from the one solve, see compare_materials
+        material_table = []
+        for row in compare_materials(self.results, moment_of_inertia, section_y):
+            material_table.append({'Material': row['material'],
+                                   'Max Deflection': f"{row['max_deflection'] * 1000:.4f}",
+                                   'Max Bending Stress': f"{row['max_bending_stress'] / 1e6:.4f}",
+                                   'FoS': f"{row['safety_factor']:0.1f}" if row['safety_factor'] is not None else ''})
+        return material_table
+
+    def display_results(self, results=None):
+        # self.results stays in SI, the plot units are applied as scale factors when values are read
+        return ResultView(self.results if results is None else results, self.plot_length_unit.value, self.plot_force_unit.value)
+
+    def plot_unit_change(self):
+        # refresh plots and the reactions table in the new units
         try:
-            length_conversion = 1*u(old_length_unit).to(new_length_unit).magnitude
-            old_force_per_length_unit = f"{old_force_unit} / {old_length_unit}"
-            new_force_per_length_unit = f"{new_force_unit} / {new_length_unit}"
-            force_per_length_conversion = 1*u(old_force_per_length_unit).to(new_force_per_length_unit).magnitude
-            force_conversion = 1*u(old_force_unit).to(new_force_unit).magnitude
-            old_torque_unit = f"{old_force_unit} * {old_length_unit}"
-            new_torque_unit = f"{new_force_unit} * {new_length_unit}"
-            moment_conversion = 1*u(old_torque_unit).to(new_torque_unit).magnitude
+            self.display_results()
         except:
             ui.notify("Could not convert plot units.")
-            return self.results, 'm', 'N'
-
-        converted_results['beam_x_values'] = [x * length_conversion for x in converted_results['beam_x_values']]
-        converted_results['y_force_plot'] = [f * force_per_length_conversion for f in converted_results['y_force_plot']]
-        converted_results['y_shear_plot'] = [s * force_conversion for s in converted_results['y_shear_plot']]
-        converted_results['y_moment_plot'] = [m * moment_conversion for m in converted_results['y_moment_plot']]
-        converted_results['y_deflection_plot'] = [d * length_conversion for d in converted_results['y_deflection_plot']]
-        converted_results['max_deflection'] = converted_results['max_deflection'] * length_conversion
-        converted_results['max_deflection_pos'] = converted_results['max_deflection_pos'] * length_conversion
-        #for fixture in converted_results['fixtures']:
-        #    fixture[1] = fixture[1] * length_conversion
-        for load in converted_results['loads_moments']:
-            load[1] = load[1] * length_conversion
-            if load[0] == 'Constant Distributed Load' or load[0] == 'Linear Distributed Load':
-                load[2] = load[2] * length_conversion
-            load[3] = load[3] * force_conversion
-        for reaction in converted_results['reactions']:
-            if reaction[0] > 2:
-                reaction[2] = reaction[2] * length_conversion
-                if reaction[1] == 'Moment':
-                    reaction[3] = reaction[3] * moment_conversion
-                elif reaction[1] == 'Force y':
-                    reaction[3] = reaction[3] * force_conversion
-            elif (reaction[0] == 1):
-                reaction[3] = reaction[3] * length_conversion # the second integration constant has length units
-        for loc in converted_results['important_locations']:
-            loc[1] = loc[1] * length_conversion
-        self.results['length_unit'] = new_length_unit
-        self.results['force_unit'] = new_force_unit
-        return converted_results, new_length_unit, new_force_unit
-    
-    def plot_unit_change(self):
-        # convert results values to new units
-        # refresh plots
-        converted_results, out_length_unit, out_force_unit= self.convert_plot_units(self.plot_length_unit.value, self.plot_force_unit.value)
-        self.results = converted_results
-        self.beam_plot.figure = generate_beam_plot(converted_results, out_length_unit, out_force_unit)
-        self.beam_plot.update()
+            return
+        self.refresh_beam_plot()
         reactions_table_content = self.fill_reactions_table()
         self.reactions_table.rows = reactions_table_content
+        self.fill_section_table()
+        self.fill_envelope_table()
         ui.notify("Beam Results Updated.")
         return
     
+    def refresh_beam_plot(self, x_range=None):
+        # only a fixed number of points per diagram goes to the browser. The whole beam uses the solve's
+        # adaptive samples, a zoomed window is sampled again from the exact pieces and cut down to the budget
+        results = self.display_results()
+        si_range = None if x_range is None else [x / results.length_scale for x in x_range]
+        results = self.display_results(downsample_results(resample_results(self.results, si_range), x_range=si_range))
+        data, layout = beam_plot_update(results, results.length_unit, results.force_unit, x_range, dtype='f4')
+        # patch the server copy in place (what a reconnecting client gets) and send only the patch to the browser,
+        # ui.plotly's component keeps its plotly.js module as plot.Plotly and the plot div as plot.$el
+        apply_plot_update(self.beam_plot.figure, data, layout)
+        self.beam_plot.run_method('(plot, data, layout) => plot.Plotly?.update(plot.$el, data, layout)', data, layout)
+
+    def beam_plot_zoomed(self, e):
+        # resample the zoomed window from the solved pieces
+        x_range = relayout_x_range(e.args)
+        if x_range is False or self.results['beam_x_values'] is None:
+            return
+        self.refresh_beam_plot(x_range)
+
     def add_fixture_row(self):
         row = BeamFixtureRow(self.fixture_rows_container, page=self)
         self.fixture_rows.append(row)
     
     def get_fixture_data(self):
-        data = []
-        for row in self.fixture_rows:
-            try:
-                data.append({
-                    'type': row.type_select.value,
-                    'qty': Q(row.position_input.value, row.unit_select.value)
-                })
-            except:
-                ui.notify('Error: Check Beam Fixture Data.')
-                return
-
-        return data
+        return [[row.type_select.value, row.position_input.value, row.unit_select.value] for row in self.fixture_rows]
     
     def add_load_row(self, load_type):
         if load_type == 'Distributed':
@@ -301,167 +377,237 @@ class BeamCalculatorPage:
         row = DistributedLoadRow(self.distr_loads_rows_container,
                                  start_pos=0, end_pos=self.beam_length.value, pos_unit=self.beam_length_unit.value,
                                  start_val=round(gravity_load.magnitude,4), end_val=round(gravity_load.magnitude,4), load_unit='N/m',
-                                 page=self)
+                                 case='D', page=self)
         self.distr_load_rows.append(row)
 
     def get_distr_load_data(self):
-        data = []
-        for row in self.distr_load_rows:
-            try:
-                data.append({
-                    'type': 'Distributed Load',
-                    'start_position_qty': Q(row.start_position.value, row.position_unit.value),
-                    'end_position_qty': Q(row.end_position.value, row.position_unit.value),
-                    'load_start_qty': Q(row.load_start_value.value, row.load_unit.value),
-                    'load_end_qty': Q(row.load_end_value.value, row.load_unit.value)
-                })
-                
-            except:
-                ui.notify('Error: Check Beam Distributed Load Data.')
-                return
-        return data
+        return [[row.start_position.value, row.end_position.value, row.position_unit.value,
+                 row.load_start_value.value, row.load_end_value.value, row.load_unit.value, row.case_select.value]
+                for row in self.distr_load_rows]
     
     def get_point_load_data(self):
-        data = []
-        for row in self.load_rows:
-            try:
-                data.append({
-                    'type': row.type_select.value,
-                    'start_position_qty': Q(row.position.value, row.position_unit.value),
-                    'end_position_qty': None,
-                    'load_start_qty': Q(row.load_value.value, row.load_unit.value),
-                    'load_end_qty': None
-                })
-            except:
-                ui.notify('Error: Check Beam Point Load Data.')
-                return
-        return data
+        return [[row.type_select.value, row.position.value, row.position_unit.value,
+                 row.load_value.value, row.load_unit.value, row.case_select.value]
+                for row in self.load_rows]
          
     def material_change(self):
-        self.is_updating = True
         if self.material_quickselect.value == 'Custom':
             return
         selected_material = materials.get(self.material_quickselect.value)
-        self.modulus.value = selected_material.modulus.magnitude
-        self.modulus_unit.value = f"{selected_material.modulus.units:~P}"
-        self.density.value = selected_material.density.magnitude
-        self.density_unit.value = f"{selected_material.density.units:~P}"
-        self.yield_strength.value = selected_material.yield_strength.magnitude
-        self.yield_strength_unit.value = f"{selected_material.yield_strength.units:~P}"
-        self.is_updating = False
-    
+        self.is_updating = True
+        try:
+            self.modulus.value = selected_material.modulus.magnitude
+            self.modulus_unit.value = f"{selected_material.modulus.units:~P}"
+            self.density.value = selected_material.density.magnitude
+            self.density_unit.value = f"{selected_material.density.units:~P}"
+            self.yield_strength.value = selected_material.yield_strength.magnitude
+            self.yield_strength_unit.value = f"{selected_material.yield_strength.units:~P}"
+        finally:
+            self.is_updating = False
+
     def material_prop_change(self):
         if not self.is_updating:
             self.material_quickselect.value = 'Custom'
-    
-    def solve_beam_button(self):
-        # get all the values
+
+    def section_change(self):
+        if self.section_quickselect.value == 'Custom':
+            return
+        i = section_names.index(self.section_quickselect.value)
+        self.is_updating_section = True
         try:
-            beam_length_qty = Q(self.beam_length.value, self.beam_length_unit.value)
-            beam_length_qty = beam_length_qty.to('m')
-            second_moment_area_qty = Q(self.second_moment_area.value, self.second_moment_area_unit.value)
-            second_moment_area_qty = second_moment_area_qty.to('m**4')
-            modulus_elasticity_qty = Q(self.modulus.value, self.modulus_unit.value)
-            modulus_elasticity_qty = modulus_elasticity_qty.to('Pa')
+            self.second_moment_area.value = round(Q(section_catalog['moment_of_inertia'][i], 'm**4').to('in**4').magnitude, 5)
+            self.second_moment_area_unit.value = 'in⁴'
+            self.cross_section_area.value = round(Q(section_catalog['area'][i], 'm**2').to('in**2').magnitude, 5)
+            self.cross_section_area_unit.value = 'in²'
+            self.section_y.value = round(Q(section_catalog['section_y'][i], 'm').to('in').magnitude, 5)
+            self.section_y_unit.value = 'in'
+        finally:
+            self.is_updating_section = False
+
+    def section_prop_change(self):
+        if not self.is_updating_section:
+            self.section_quickselect.value = 'Custom'
+
+    def get_section_shapes(self):
+        # rings are separated by blank lines, a "hole" line starts a hole in the shape above it
+        shapes = []
+        ring = None
+        for line in self.section_vertices.value.splitlines():
+            line = line.strip()
+            if line == '':
+                ring = None
+            elif line.lower() == 'hole':
+                if not shapes:
+                    raise ValueError("A hole needs a shape around it.")
+                ring = []
+                shapes[-1]['holes'].append(ring)
+            else:
+                if ring is None:
+                    ring = []
+                    shapes.append({'outer': ring, 'holes': []})
+                ring.append([float(value) for value in line.replace(',', ' ').split()])
+        return shapes
+
+    def section_vertices_change(self):
+        # properties are memoized by geometry, so this can run on every keystroke
+        try:
+            properties = section_properties(self.get_section_shapes())
+        except (ValueError, IndexError):
+            return  # still typing
+        length_unit = self.section_vertices_unit.value
+        self.section_quickselect.value = 'Custom'
+        self.second_moment_area.value = round(Q(properties['moment_of_inertia'], f"{length_unit}**4").to('in**4').magnitude, 5)
+        self.second_moment_area_unit.value = 'in⁴'
+        self.cross_section_area.value = round(Q(properties['area'], f"{length_unit}**2").to('in**2').magnitude, 5)
+        self.cross_section_area_unit.value = 'in²'
+        self.section_y.value = round(Q(properties['section_y'], length_unit).to('in').magnitude, 5)
+        self.section_y_unit.value = 'in'
+
+    def find_natural_frequencies(self):
+        if not self.fixtures:
+            ui.notify('Solve the beam first.')
+            return
+        try:
+            second_moment_area_qty = Q(self.second_moment_area.value, self.second_moment_area_unit.value).to('m**4')
+            modulus_elasticity_qty = Q(self.modulus.value, self.modulus_unit.value).to('Pa')
+            mass_per_length_qty = Q(self.density.value, self.density_unit.value) * Q(self.cross_section_area.value, self.cross_section_area_unit.value)
+            mass_per_length_qty = mass_per_length_qty.to('kg/m') + Q(self.added_mass.value, self.added_mass_unit.value).to('kg/m')
         except:
             ui.notify('Error: Check Beam Setup Data.')
             return
-        # Check if inputs are correct (fixture position inside bounds)
-        fixture_dict_list = self.get_fixture_data()
-        self.fixtures = []
-        for fixture in fixture_dict_list:
-            fixture_pos_m = fixture['qty'].to('m')
-            if fixture['qty'] > beam_length_qty:
-                ui.notify('Fixture position not on beam. Did not solve beam.')
-                return
-            self.fixtures.append([fixture['type'], fixture_pos_m.magnitude])
-        
-        loads_moments = []
-        distr_loads = self.get_distr_load_data()
-        if distr_loads != None:
-            for load in distr_loads:
-                load_start_pos = load['start_position_qty'].to('m')
-                load_end_pos = load['end_position_qty'].to('m')
-                load_start = load['load_start_qty'].to('N/m')
-                load_end = load['load_end_qty'].to('N/m')
-                if load_start_pos > beam_length_qty:
-                    ui.notify('Start position not on beam. Did not solve beam.')
-                    return
-                if load_end_pos > beam_length_qty:
-                    ui.notify('End position not on beam. Did not solve beam.')
-                    return
-                if load_start_pos > load_end_pos:
-                    ui.notify('Distributed Load start position must come after end position. Did not solve beam.')
-                    return
-                if ((load_start < 0 and load_end > 0) or (load_end < 0 and load_start > 0)):
-                    ui.notify('Distributed loads cannot have both positive and negative values. Split it into two loads. Did not solve beam.')
-                    return
-                if (load_start == load_end):
-                    loads_moments.append(['Constant Distributed Load', load_start_pos.magnitude, load_end_pos.magnitude, load_start.magnitude])
-                elif ((load_start > load_end) and (load_start.magnitude < 0) and (load_end.magnitude < 0)):
-                    # common way to treat all other linear loads (constant distr + linear distr starting from 0)
-                    # load ramps downward and is negative. This one requires the max to get the signs right
-                    const_load = max(load_start, load_end)
-                    lin_load = load_end - load_start
-                    loads_moments.append(['Constant Distributed Load', load_start_pos.magnitude, load_end_pos.magnitude, const_load.magnitude])
-                    loads_moments.append(['Linear Distributed Load', load_start_pos.magnitude, load_end_pos.magnitude, lin_load.magnitude])
-                else: 
-                    # common way to treat all other linear loads (constant distr + linear distr starting from 0)
-                    const_load = min(load_start, load_end)
-                    lin_load = load_end - load_start
-                    loads_moments.append(['Constant Distributed Load', load_start_pos.magnitude, load_end_pos.magnitude, const_load.magnitude])
-                    loads_moments.append(['Linear Distributed Load', load_start_pos.magnitude, load_end_pos.magnitude, lin_load.magnitude])
-                
-        point_loads = self.get_point_load_data()
-        if point_loads != None:
-            for load in point_loads:
-                if load['type'] == 'Concentrated Force':
-                    load_val = load['load_start_qty'].to('N')
-                    load_pos = load['start_position_qty'].to('m')
-                    if load_pos > beam_length_qty:
-                        ui.notify('Point load position not on beam. Did not solve beam.')
-                        return
-                    loads_moments.append([load['type'], load_pos.magnitude, None, load_val.magnitude])
-                if load['type'] == 'Concentrated Moment':
-                    load_val = load['load_start_qty'].to('N*m')
-                    load_pos = load['start_position_qty'].to('m')
-                    if load_pos > beam_length_qty:
-                        ui.notify('Point load position not on beam. Did not solve beam.')
-                        return
-                    loads_moments.append([load['type'], load_pos.magnitude, None, load_val.magnitude])
+        if self.num_modes.value is None or self.num_modes.value < 1:
+            ui.notify('Error: Check Number of Modes.')
+            return
+        try:
+            modes = modal_analysis(self.fixtures, self.beam_length_m, second_moment_area_qty.magnitude, modulus_elasticity_qty.magnitude,
+                                   mass_per_length_qty.magnitude, num_modes=int(self.num_modes.value))
+        except (ValueError, np.linalg.LinAlgError) as e:
+            ui.notify(f"Could not find natural frequencies. {e}")
+            return
+        self.modes_table.rows = [{'Mode': mode, 'Frequency': f"{frequency:.3f}"} for mode, frequency in enumerate(modes['frequencies'], start=1)]
+        self.mode_plot.figure = generate_mode_plot(modes)
+        self.mode_plot.update()
+
+    def find_load_combination_envelopes(self):
+        if not self.fixtures:
+            ui.notify('Solve the beam first.')
+            return
+        try:
+            second_moment_area_qty = Q(self.second_moment_area.value, self.second_moment_area_unit.value).to('m**4')
+            modulus_elasticity_qty = Q(self.modulus.value, self.modulus_unit.value).to('Pa')
+        except:
+            ui.notify('Error: Check Beam Setup Data.')
+            return
+        try:
+            lines = [line.strip() for line in self.combinations_input.value.splitlines() if line.strip()]
+            combinations = {line: parse_combination(line) for line in lines}
+            supports = BeamSupports(self.fixtures, self.beam_length_m, second_moment_area_qty.magnitude, modulus_elasticity_qty.magnitude)
+            envelope = load_combinations(supports, self.load_cases, combinations, num_points=250)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            ui.notify(f"Could not find envelopes. {e}")
+            return
+        self.envelope = envelope
+        self.fill_envelope_table()
+
+    def fill_envelope_table(self):
+        # the envelope stays in SI like self.results and is shown in the plot units
+        if self.envelope is None:
+            return
+        envelope = self.display_results(self.envelope)
+        units = {'shear': envelope['force_unit'], 'moment': f"{envelope['force_unit']} * {envelope['length_unit']}",
+                 'angle': 'rad', 'deflection': envelope['length_unit']}
+        for column in self.envelope_table.columns:
+            if column['name'] in ('Max Location', 'Min Location'):
+                column['label'] = f"Location ({envelope['length_unit']})"
+        envelope_table = []
+        for peak in envelope['peaks']:
+            envelope_table.append({'Result': f"{peak['diagram'].capitalize()} ({units[peak['diagram']]})",
+                                   'Max': f"{peak['max']:.4g}",
+                                   'Max Location': f"{peak['max_pos']:.4f}",
+                                   'Max Combination': peak['max_combination'],
+                                   'Min': f"{peak['min']:.4g}",
+                                   'Min Location': f"{peak['min_pos']:.4f}",
+                                   'Min Combination': peak['min_combination']})
+        self.envelope_table.rows = envelope_table
+        self.envelope_table.update()
+        self.envelope_plot.figure = generate_envelope_plot(envelope)
+        self.envelope_plot.update()
+
+    def find_lightest_sections(self):
+        if not self.fixtures:
+            ui.notify('Solve the beam first.')
+            return
+        rows = lightest_sections(self.loads_moments, self.fixtures, self.beam_length_m, deflection_ratio=self.deflection_ratio.value,
+                                 min_safety_factor=self.min_safety_factor.value, include_self_weight=self.include_self_weight.value)
+        self.section_rows = rows
+        self.fill_section_table()
+        if not rows:
+            ui.notify('No standard section meets the limits.')
+    
+    def fill_section_table(self):
+        # the weight per length follows the plot force and length units
+        results = self.display_results()
+        weight_unit = f"{results.force_unit}/{results.length_unit}"
+        weight_scale = results.scale('N/m')
+        for column in self.section_table.columns:
+            if column['name'] == 'Weight':
+                column['label'] = f"Weight ({weight_unit})"
+        section_table = []
+        for row in self.section_rows:
+            section_table.append({'Section': row['section'],
+                                  'Material': row['material'],
+                                  'Weight': f"{row['weight_per_length'] * weight_scale:.4g}",
+                                  'Max Deflection': f"{row['max_deflection'] * 1000:.4f}",
+                                  'Max Bending Stress': f"{row['max_bending_stress'] / 1e6:.4f}",
+                                  'FoS': f"{row['safety_factor']:0.1f}"})
+        self.section_table.rows = section_table
+        self.section_table.update()
+
+    def solve_beam_button(self):
+        # convert and check all the inputs
+        try:
+            beam = normalize_beam_inputs(self.beam_length.value, self.beam_length_unit.value,
+                                         self.second_moment_area.value, self.second_moment_area_unit.value,
+                                         self.modulus.value, self.modulus_unit.value,
+                                         self.get_fixture_data(), self.get_point_load_data(), self.get_distr_load_data(),
+                                         self.section_y.value, self.section_y_unit.value)
+            yield_strength = to_si(self.yield_strength.value, self.yield_strength_unit.value, 'Pa', 'Error: Check Material Data.')
+        except ValueError as e:
+            ui.notify(str(e))
+            return
+        self.fixtures = beam['fixtures']
+        loads_moments = beam['loads_moments']
         
         # now solve the beam (eventually put this in a try except)
+        self.loads_moments = loads_moments
+        self.load_cases = {name: [list(load) for load, case in zip(loads_moments, beam['load_case_of']) if case == name] for name in load_case_names}
+        self.beam_length_m = beam['overall_length']
         try:
-            self.results = solve_beam(loads_moments, self.fixtures, beam_length_qty.magnitude, second_moment_area_qty.magnitude, modulus_elasticity_qty.magnitude, 250, 'm', 'N')
+            self.results = cached_solve_beam(loads_moments, self.fixtures, beam['overall_length'], beam['moment_of_inertia'], beam['youngs_modulus'], 250, 'm', 'N', adaptive_tolerance=1e-3)
         except:
             ui.notify("Error in solving beam.")
             return
         self.max_deflection_qty = Q(self.results['max_deflection'], 'm')
         self.max_deflection_qty = self.max_deflection_qty.to('mm')
         self.max_deflection_pos_qty = Q(self.results['max_deflection_pos'], 'm')
-        max_moment_qty = Q(np.max(np.abs(self.results['y_moment_plot'])), 'N * m')
-        second_moment_qty = Q(self.second_moment_area.value, self.second_moment_area_unit.value)
-        section_y_qty = Q(self.section_y.value, self.section_y_unit.value)
-        yield_strength_qty = Q(self.yield_strength.value, self.yield_strength_unit.value)
-        self.max_bending_stress_qty = max_moment_qty * section_y_qty / second_moment_qty
-        self.max_bending_stress_qty = self.max_bending_stress_qty.to('MPa')
+        section_y_m = beam['section_y']
+        max_bending_stress = abs(self.results['max_moment']) * section_y_m / beam['moment_of_inertia']
+        self.max_bending_stress_qty = Q(max_bending_stress * unit_scale('Pa', 'MPa'), 'MPa')
         self.max_deflection_label.text = f"{self.max_deflection_qty.magnitude:.4f}"
         self.max_deflection_pos_label.text = f"{self.max_deflection_pos_qty.magnitude:.6f}"
         self.max_deflection_unit.value = f"{self.max_deflection_qty.units:~P}"
         self.max_deflection_pos_unit.value = f"{self.max_deflection_pos_qty.units:~P}"
         self.max_bending_stress_label.text = f"{self.max_bending_stress_qty.magnitude:.4f}"
         self.max_bending_stress_unit.value = f"{self.max_bending_stress_qty.units:~P}"
-        fos = yield_strength_qty / self.max_bending_stress_qty
-        self.safety_factor.text = f"{fos.magnitude:0.1f}" + ")"
+        fos = yield_strength / max_bending_stress if max_bending_stress > 0 else float('inf')
+        self.safety_factor.text = f"{fos:0.1f}" + ")"
 
         reactions_table_content = self.fill_reactions_table()
         self.reactions_table.rows = reactions_table_content
+        self.material_table.rows = self.fill_material_table(beam['moment_of_inertia'], section_y_m)
 
-        # Update each plotly component by assigning a new figure
-        self.plot_length_unit.value = 'm'
-        self.plot_force_unit.value = 'N'
-        self.beam_plot.figure = generate_beam_plot(self.results)
-        self.beam_plot.update()
+        # the plot keeps the selected plot units
+        self.refresh_beam_plot()
         ui.notify("Beam Results Updated.")
         
     def deflection_unit_changed(self):
@@ -500,7 +646,7 @@ class BeamFixtureRow:
 class DistributedLoadRow:
     def __init__(self, table_container,
                  type_val=None, start_pos=None, end_pos=None, pos_unit=None,
-                 start_val=None, end_val=None, load_unit=None, page=None):
+                 start_val=None, end_val=None, load_unit=None, case='D', page=None):
         self.table_container = table_container
         self.page = page
         with table_container:
@@ -513,6 +659,7 @@ class DistributedLoadRow:
                 self.load_start_value = ui.number(value=start_val).style('width: 130px')
                 self.load_end_value = ui.number(value=end_val).style('width: 130px')
                 self.load_unit = ui.select(options=distributed_force_units).style('width: 120px')
+                self.case_select = ui.select(options=load_case_names, value=case).style('width: 70px')
                 
                 ui.button(icon='close', on_click=self.delete).props('flat dense')
         
@@ -528,7 +675,7 @@ class DistributedLoadRow:
 class PointLoadRow:
     def __init__(self, table_container,
                  type_val=None, pos=None, pos_unit=None,
-                 load=None, load_units=None, page=None):
+                 load=None, load_units=None, case='D', page=None):
         self.table_container = table_container
         self.page = page
         with table_container:
@@ -544,6 +691,7 @@ class PointLoadRow:
                 self.position_unit = ui.select(options=length_units, value=pos_unit).style('width: 120px')
                 self.load_value = ui.number(value=load).style('width: 120px')
                 self.load_unit = ui.select(options=[]).style('width: 120px')
+                self.case_select = ui.select(options=load_case_names, value=case).style('width: 70px')
                 
                 ui.button(icon='close', on_click=self.delete).props('flat dense')
         